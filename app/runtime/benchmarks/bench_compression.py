@@ -0,0 +1,109 @@
+# /app/runtime/benchmarks/bench_compression.py
+"""
+Mide el costo y el ahorro de comprimir los blobs del almacén de versiones con zstd.
+
+Uso (desde app/runtime, con zstandard instalado):
+    python -m benchmarks.bench_compression ruta/a/carpeta [--limit 200] [--levels 1,3,9,19]
+
+Para cada nivel, aplica a los archivos de la carpeta (recursivamente) la misma política
+que store_blob:
+  - omitidos:    archivos que no se comprimen (pequeños, o cuya muestra no baja de
+                 COMPRESSION_MAX_RATIO), con el costo de esa comprobación
+  - comprimidos: archivos guardados como .zst, con su proporción de tamaño y el costo en
+                 milisegundos por MB del original al comprimir y al descomprimir en flujo
+  - total:       espacio ocupado por el almacén respecto de guardar todo sin comprimir
+
+Los archivos se leen una vez antes de medir, por lo que se mide el costo de CPU con los
+archivos en la caché del sistema operativo.
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from core.data.services import blob_compression
+from benchmarks.bench_hashing import find_files
+
+MB = 1024 * 1024
+
+def decompress_file(path):
+    with blob_compression.open_decompressed(path) as src:
+        while src.read(blob_compression.STREAM_BLOCK_SIZE):
+            pass
+
+def bench_level(zstd, level, files, sizes, scratch):
+    skipped = compressed = 0
+    skipped_bytes = original_bytes = stored_bytes = 0
+    check_seconds = compress_seconds = decompress_seconds = 0.0
+
+    for file_path in files:
+        size = sizes[file_path]
+        start = time.perf_counter()
+        worth = blob_compression.should_compress(file_path, size, zstd, level)
+        check_seconds += time.perf_counter() - start
+        if worth:
+            target = os.path.join(scratch, "blob" + blob_compression.ZSTD_SUFFIX)
+            start = time.perf_counter()
+            compressed_size = blob_compression.compress_file(file_path, target, zstd, level)
+            compress_seconds += time.perf_counter() - start
+            worth = compressed_size <= size * blob_compression.COMPRESSION_MAX_RATIO
+        if not worth:
+            skipped += 1
+            skipped_bytes += size
+            continue
+
+        start = time.perf_counter()
+        decompress_file(target)
+        decompress_seconds += time.perf_counter() - start
+        compressed += 1
+        original_bytes += size
+        stored_bytes += compressed_size
+
+    total_bytes = sum(sizes.values())
+    check_ms_per_mb = check_seconds * 1000 / (total_bytes / MB) if total_bytes else 0.0
+    print(f"nivel {level:>2}  omitidos: {skipped:5} ({skipped_bytes / MB:8.1f} MB, comprobación "
+          f"{check_ms_per_mb:6.2f} ms/MB)")
+    if compressed:
+        original_mb = original_bytes / MB
+        print(f"          comprimidos: {compressed:5} ({original_mb:8.1f} MB -> {stored_bytes / MB:8.1f} MB, "
+              f"{stored_bytes / original_bytes:5.2f})  compresión: {compress_seconds * 1000 / original_mb:7.2f} ms/MB  "
+              f"descompresión: {decompress_seconds * 1000 / original_mb:7.2f} ms/MB")
+    stored_total = stored_bytes + skipped_bytes
+    print(f"          total: {total_bytes / MB:8.1f} MB -> {stored_total / MB:8.1f} MB "
+          f"({stored_total / total_bytes if total_bytes else 1.0:5.2f})\n")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("folder", help="Carpeta con archivos de muestra")
+    parser.add_argument("--limit", type=int, default=None, help="Máximo de archivos a leer")
+    parser.add_argument("--levels", default="1,3,9,19", help="Niveles de zstd a probar, separados por comas")
+    args = parser.parse_args()
+
+    try:
+        import zstandard
+    except ImportError:
+        print("zstandard no disponible (instala zstandard)")
+        return
+
+    files = [file_path for file_path in find_files(args.folder, args.limit) if os.path.isfile(file_path)]
+    if not files:
+        print(f"No se encontraron archivos en {args.folder}")
+        return
+    sizes = {file_path: os.path.getsize(file_path) for file_path in files}
+    print(f"{len(files)} archivos, {sum(sizes.values()) / MB:.1f} MB en {args.folder}\n")
+
+    # Calentamiento: los archivos quedan en la caché del sistema
+    for file_path in files:
+        with open(file_path, "rb") as f:
+            while f.read(MB):
+                pass
+
+    scratch = tempfile.mkdtemp(prefix="bench_compression_")
+    try:
+        for level in [int(value) for value in args.levels.split(",") if value.strip()]:
+            bench_level(zstandard, level, files, sizes, scratch)
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
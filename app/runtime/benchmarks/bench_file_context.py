@@ -0,0 +1,125 @@
+# /app/runtime/benchmarks/bench_file_context.py
+"""
+Compara la preparación de un documento antes y después de FileContext.
+
+Uso (desde app/runtime):
+    python -m benchmarks.bench_file_context ruta/al/archivo.pdf [--repeat 5]
+
+Cuenta cuántas veces se analizan los metadatos y cuántos bytes del archivo se leen
+realmente para calcular los hashes en cada camino (incluida la pasada de la huella
+rápida de calculate_content_hash). Antes de cada repetición se descarta la huella
+guardada del archivo, como si fuera nuevo o modificado; con --cached se conserva y se
+mide un archivo solo tocado.
+"""
+import argparse
+import os
+import time
+from core.data.services import file_context, hash_service, metadata_extractor
+from core.data.services.cache_service import clear_content_fingerprint
+from core.data.services.extractor_registry import require_extractor
+from core.data.services.file_context import FileContext
+
+class CountingFile:
+    """Envuelve un archivo abierto y suma a 'counter' los bytes que se leen con readinto."""
+
+    def __init__(self, f, counter):
+        self.f = f
+        self.counter = counter
+
+    def readinto(self, buffer):
+        read = self.f.readinto(buffer)
+        self.counter.bytes_read += read or 0
+        return read
+
+class ReadCounter:
+    """Envuelve las funciones de lectura para contar análisis de metadatos y bytes leídos."""
+
+    def __init__(self, file_path):
+        # Se envuelve el backend del formato del archivo (pdf_extractor, docx_extractor...)
+        self.backend = require_extractor(file_path).backend
+        self.metadata_parses = 0
+        self.hash_reads = 0
+        self.bytes_read = 0
+        self._originals = []
+
+    def _patch(self, module, name, wrapper):
+        self._originals.append((module, name, getattr(module, name)))
+        setattr(module, name, wrapper)
+
+    def __enter__(self):
+        original_hash = hash_service.calculate_content_hash
+
+        original_stream = hash_service._hash_stream
+
+        def counted_hash(file_path):
+            self.hash_reads += 1
+            return original_hash(file_path)
+
+        def counted_stream(f, *hashers):
+            return original_stream(CountingFile(f, self), *hashers)
+
+        original_metadata = getattr(self.backend, "extract_metadata", None)
+        if original_metadata:
+            def counted_metadata(*args, **kwargs):
+                self.metadata_parses += 1
+                return original_metadata(*args, **kwargs)
+
+            self._patch(self.backend, "extract_metadata", counted_metadata)
+
+        self._patch(hash_service, "calculate_content_hash", counted_hash)
+        self._patch(hash_service, "_hash_stream", counted_stream)
+        self._patch(file_context, "calculate_content_hash", counted_hash)
+        return self
+
+    def __exit__(self, *exc):
+        for module, name, original in reversed(self._originals):
+            setattr(module, name, original)
+
+def legacy_prepare(file_path, main_path):
+    """Camino anterior: metadatos y hashes se calculan cada uno por su cuenta."""
+    metadata_extractor.extract_metadata(file_path)
+    hash_service.calculate_unique_hash(file_path, main_path)
+    hash_service.calculate_version_hash(file_path)
+
+def context_prepare(file_path, main_path):
+    """Camino actual: todo se obtiene de un único FileContext."""
+    context = FileContext(file_path)
+    context.metadata
+    context.unique_hash(main_path)
+    context.version_hash()
+
+def run(label, func, file_path, main_path, repeat, cached):
+    with ReadCounter(file_path) as counter:
+        elapsed = 0.0
+        for _ in range(repeat):
+            if not cached:
+                clear_content_fingerprint(str(file_path))
+            start = time.perf_counter()
+            func(file_path, main_path)
+            elapsed += time.perf_counter() - start
+        elapsed /= repeat
+
+    print(
+        f"{label:<12} metadatos/archivo: {counter.metadata_parses / repeat:.0f}  "
+        f"hashes/archivo: {counter.hash_reads / repeat:.0f}  "
+        f"bytes/archivo: {counter.bytes_read // repeat}  "
+        f"tiempo: {elapsed * 1000:.1f} ms"
+    )
+
+def main():
+    # Se mide el trabajo en este proceso: los metadatos no se leen en el proceso aislado
+    os.environ["EXTRACTION_SANDBOX"] = "false"
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("file_path", help="Documento a medir (cualquier formato soportado)")
+    parser.add_argument("--repeat", type=int, default=5, help="Repeticiones por camino")
+    parser.add_argument("--cached", action="store_true",
+                        help="Conserva la huella guardada entre repeticiones (archivo solo tocado)")
+    args = parser.parse_args()
+
+    main_path = os.path.dirname(os.path.abspath(args.file_path))
+    print(f"Archivo: {args.file_path} ({os.path.getsize(args.file_path)} bytes)")
+    run("anterior", legacy_prepare, args.file_path, main_path, args.repeat, args.cached)
+    run("FileContext", context_prepare, args.file_path, main_path, args.repeat, args.cached)
+
+if __name__ == "__main__":
+    main()
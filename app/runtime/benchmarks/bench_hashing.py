@@ -0,0 +1,113 @@
+# /app/runtime/benchmarks/bench_hashing.py
+"""
+Compara el cálculo del hash del contenido antes y después del motor de hash_service.
+
+Uso (desde app/runtime):
+    python -m benchmarks.bench_hashing ruta/a/carpeta [--limit 200] [--repeat 3]
+                                       [--workers 1,4,8]
+
+Hashea los archivos de la carpeta (recursivamente) con:
+  - anterior:  SHA-256 en bloques de 4 KB con iter(lambda ...)
+  - bloques:   SHA-256 en bloques de HASH_BLOCK_SIZE sobre un búfer reutilizado
+  - mmap:      SHA-256 del archivo mapeado en memoria (solo como referencia; no se usa
+               porque un archivo truncado mientras está mapeado termina el proceso)
+  - xxh3:      la huella rápida de HASH_FINGERPRINT (si xxhash está instalado)
+  - hilos=N:   hash_files con N hilos, un archivo por hilo
+
+Cada variante se ejecuta 'repeat' veces tras una lectura previa de calentamiento, por lo
+que mide el costo de CPU con los archivos ya en la caché del sistema operativo. Para
+medir la lectura desde disco hay que vaciar esa caché antes de cada ejecución.
+"""
+import argparse
+import hashlib
+import mmap
+import os
+import time
+from core.data.services import hash_service
+
+def find_files(folder, limit=None):
+    files = []
+    for root, dirs, names in os.walk(folder):
+        for name in sorted(names):
+            files.append(os.path.join(root, name))
+    files.sort()
+    return files[:limit] if limit else files
+
+def legacy_file_hash(file_path):
+    """Implementación anterior de calculate_file_hash."""
+    sha256 = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(4096), b""):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+def mmap_file_hash(file_path):
+    """SHA-256 del archivo mapeado en memoria (los archivos vacíos no se pueden mapear)."""
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return hashlib.sha256().hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return hashlib.sha256(mapped).hexdigest()
+
+def fingerprint_file(file_path, factory):
+    with open(file_path, 'rb', buffering=0) as f:
+        fingerprint, = hash_service._hash_stream(f, factory())
+    return fingerprint.hexdigest()
+
+def measure(label, func, files, total_bytes, repeat, reference=None):
+    """Ejecuta 'func(files)' 'repeat' veces y muestra el mejor tiempo y el caudal."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        hashes = func(files)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    mismatches = ""
+    if reference is not None:
+        different = sum(1 for file_path in files if hashes.get(file_path) != reference[file_path])
+        mismatches = f"  distintos: {different}"
+    throughput = total_bytes / (1024 * 1024) / best if best else 0.0
+    print(f"{label:<10} tiempo: {best:8.3f} s  MB/s: {throughput:9.1f}{mismatches}")
+    return hashes
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("folder", help="Carpeta con archivos de muestra")
+    parser.add_argument("--limit", type=int, default=None, help="Máximo de archivos a leer")
+    parser.add_argument("--repeat", type=int, default=3, help="Ejecuciones por variante (se toma la mejor)")
+    parser.add_argument("--workers", default="1,4,8", help="Hilos a probar con hash_files, separados por comas")
+    args = parser.parse_args()
+
+    files = [file_path for file_path in find_files(args.folder, args.limit) if os.path.isfile(file_path)]
+    if not files:
+        print(f"No se encontraron archivos en {args.folder}")
+        return
+    total_bytes = sum(os.path.getsize(file_path) for file_path in files)
+    print(f"{len(files)} archivos, {total_bytes / (1024 * 1024):.1f} MB en {args.folder}\n")
+    repeat = max(1, args.repeat)
+
+    # Calentamiento: todas las variantes leen los archivos desde la caché del sistema
+    reference = {file_path: legacy_file_hash(file_path) for file_path in files}
+
+    measure("anterior", lambda paths: {p: legacy_file_hash(p) for p in paths}, files, total_bytes, repeat, reference)
+    measure("bloques", lambda paths: {p: hash_service.calculate_file_hash(p) for p in paths},
+            files, total_bytes, repeat, reference)
+    measure("mmap", lambda paths: {p: mmap_file_hash(p) for p in paths}, files, total_bytes, repeat, reference)
+
+    try:
+        import xxhash
+    except ImportError:
+        print("xxh3       no disponible (instala xxhash)")
+    else:
+        measure("xxh3", lambda paths: {p: fingerprint_file(p, xxhash.xxh3_128) for p in paths},
+                files, total_bytes, repeat)
+
+    # Solo SHA-256: la huella rápida se mide por separado
+    os.environ["HASH_FINGERPRINT"] = "off"
+    for workers in [int(value) for value in args.workers.split(",") if value.strip()]:
+        measure(f"hilos={workers}", lambda paths: hash_service.hash_files(paths, workers),
+                files, total_bytes, repeat, reference)
+
+if __name__ == "__main__":
+    main()
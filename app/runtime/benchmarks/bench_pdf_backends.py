@@ -0,0 +1,126 @@
+# /app/runtime/benchmarks/bench_pdf_backends.py
+"""
+Compara los backends de lectura de la capa de texto de los PDF (PDF_TEXT_BACKEND).
+
+Uso (desde app/runtime):
+    python -m benchmarks.bench_pdf_backends ruta/a/carpeta [--backends pdfminer,pypdfium2]
+                                            [--repeat 1] [--limit 50] [--show 10]
+
+Lee todos los PDF de la carpeta (recursivamente) con cada backend y muestra las páginas
+por segundo y cuánto se parece su texto al del primer backend de la lista: similitud
+media por página y páginas en las que solo uno de los dos detecta que hace falta OCR.
+Solo se mide la lectura de la capa de texto; no se aplica OCR.
+"""
+import argparse
+import os
+import time
+from difflib import SequenceMatcher
+from core.data.services.extractors.pdf_text_backends import BACKENDS, create_pdf_text_backend
+from core.data.services.extractors.pdf_extractor import classify_page
+
+def find_pdfs(folder, limit=None):
+    pdfs = []
+    for root, dirs, files in os.walk(folder):
+        for file in sorted(files):
+            if file.lower().endswith(".pdf"):
+                pdfs.append(os.path.join(root, file))
+    pdfs.sort()
+    return pdfs[:limit] if limit else pdfs
+
+def similarity(text_a, text_b) -> float:
+    """Similitud (0-1) entre dos textos comparando sus palabras, sin tener en cuenta espacios."""
+    words_a = (text_a or "").split()
+    words_b = (text_b or "").split()
+    if not words_a and not words_b:
+        return 1.0
+    return SequenceMatcher(None, words_a, words_b).ratio()
+
+def run_backend(backend, pdfs, repeat):
+    """Lee cada PDF 'repeat' veces y retorna (resultados por archivo, segundos, páginas, errores)."""
+    results = {}
+    seconds = 0.0
+    pages = 0
+    errors = 0
+    for file_path in pdfs:
+        try:
+            start = time.perf_counter()
+            for _ in range(repeat):
+                file_pages = backend.read_pages(file_path)
+            seconds += (time.perf_counter() - start) / repeat
+        except Exception as e:
+            errors += 1
+            results[file_path] = e
+            continue
+        pages += len(file_pages)
+        results[file_path] = [classify_page(page) for page in file_pages]
+    return results, seconds, pages, errors
+
+def compare(reference, results):
+    """Similitud media por página y páginas con distinta decisión de OCR frente a la referencia."""
+    ratios = []
+    ocr_mismatches = 0
+    per_file = []
+    for file_path, reference_pages in reference.items():
+        pages = results.get(file_path)
+        if isinstance(reference_pages, Exception) or isinstance(pages, Exception) or pages is None:
+            continue
+        if len(pages) != len(reference_pages):
+            per_file.append((0.0, file_path, f"{len(pages)} páginas frente a {len(reference_pages)}"))
+            continue
+        file_ratios = []
+        for reference_text, text in zip(reference_pages, pages):
+            if (reference_text is None) != (text is None):
+                ocr_mismatches += 1
+            file_ratios.append(similarity(reference_text, text))
+        ratios.extend(file_ratios)
+        if file_ratios:
+            per_file.append((sum(file_ratios) / len(file_ratios), file_path, ""))
+    average = sum(ratios) / len(ratios) if ratios else None
+    return average, ocr_mismatches, sorted(per_file)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("folder", help="Carpeta con PDF de muestra")
+    parser.add_argument("--backends", default=",".join(BACKENDS),
+                        help="Backends separados por comas; el primero es la referencia")
+    parser.add_argument("--repeat", type=int, default=1, help="Lecturas de cada PDF por backend")
+    parser.add_argument("--limit", type=int, default=None, help="Máximo de PDF a leer")
+    parser.add_argument("--show", type=int, default=10, help="Archivos menos parecidos a mostrar")
+    args = parser.parse_args()
+
+    pdfs = find_pdfs(args.folder, args.limit)
+    if not pdfs:
+        print(f"No se encontraron PDF en {args.folder}")
+        return
+    print(f"{len(pdfs)} PDF en {args.folder}\n")
+
+    measured = []
+    for name in [name.strip() for name in args.backends.split(",") if name.strip()]:
+        try:
+            backend = create_pdf_text_backend(name)
+        except ImportError as e:
+            print(f"{name:<10} no disponible: {e}")
+            continue
+        results, seconds, pages, errors = run_backend(backend, pdfs, max(1, args.repeat))
+        measured.append((name, results))
+        pages_per_second = pages / seconds if seconds else 0.0
+        print(
+            f"{name:<10} páginas: {pages:<6} tiempo: {seconds:8.2f} s  "
+            f"páginas/s: {pages_per_second:8.1f}  errores: {errors}"
+        )
+
+    if len(measured) < 2:
+        return
+    reference_name, reference = measured[0]
+    for name, results in measured[1:]:
+        average, ocr_mismatches, per_file = compare(reference, results)
+        print(f"\n{name} frente a {reference_name}:")
+        if average is not None:
+            print(f"  similitud media por página: {average * 100:.1f} %")
+        print(f"  páginas con distinta decisión de OCR: {ocr_mismatches}")
+        for ratio, file_path, note in per_file[:args.show]:
+            if ratio < 1.0:
+                print(f"  {ratio * 100:5.1f} %  {file_path}  {note}".rstrip())
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,30 @@
 # /app/runtime/bridge/event_handler.py
+import sys
 import time
 import json
+import threading
 from datetime import datetime
 from di.dependencies import (login_use_case, set_main_path_use_case, 
                              get_main_path, sync_documents_use_case,
-                             get_documents_use_case)
+                             get_documents_use_case, sync_paths_use_case,
+                             sync_extensions, plan_sync_use_case,
+                             ocr_stats_use_case, restore_version_use_case,
+                             verify_storage_use_case, gc_storage_use_case)
+from core.data.services.file_watcher import DocumentWatcher
+from bridge.job_manager import JobManager, current_job, current_cancel_event
+
+# Varios hilos (p. ej. el modo vigilancia) pueden enviar respuestas a la vez
+_output_lock = threading.Lock()
+
+# Canal exclusivo de las respuestas a Electron. python_adapter lo separa de sys.stdout,
+# que pasa a stderr, para que ningún print se mezcle con una línea JSON.
+_protocol_stream = sys.stdout
+
+# Ejecuta los comandos largos fuera del bucle de stdin
+_job_manager = JobManager()
+
+# Vigilante activo del modo de sincronización continua (None si está detenido)
+_document_watcher = None
 
 class JSONEncoder(json.JSONEncoder):
     """Encoder personalizado para manejar fechas y otros tipos especiales"""
@@ -13,6 +33,16 @@ class JSONEncoder(json.JSONEncoder):
             return obj.isoformat()
         return super().default(obj)
 
+def set_protocol_stream(stream):
+    """Define el flujo por el que se envían las respuestas (ver python_adapter.open_protocol_stream)."""
+    global _protocol_stream
+    _protocol_stream = stream
+
+def _write_line(json_str: str):
+    with _output_lock:
+        _protocol_stream.write(json_str + "\n")
+        _protocol_stream.flush()
+
 def send_response(response):
     """
     Serializa y envía la respuesta de manera segura
@@ -20,8 +50,9 @@ def send_response(response):
     try:
         # Serializar con el encoder personalizado
         json_str = json.dumps(response, cls=JSONEncoder)
-        # Se imprime el JSON seguido de un salto de línea y haciendo flush para enviar un mensaje completo.
-        print(json_str, flush=True)
+        # Se escribe el JSON y el salto de línea en una sola escritura, con flush, para enviar
+        # un mensaje completo sin mezclarse con los de otros hilos.
+        _write_line(json_str)
         return True
     except Exception as e:
         error_response = {
@@ -31,7 +62,7 @@ def send_response(response):
                 "original_event": response.get("event", "unknown")
             }
         }
-        print(json.dumps(error_response), flush=True)
+        _write_line(json.dumps(error_response))
         return False
 
 
@@ -45,7 +76,7 @@ def handle_event(message):
         return {"event": "pong", "data": {"message": "Backend activo", "timestamp": time.time()}}
 
     elif command == "syncDocuments":
-        return handle_sync_documents(message)
+        return submit_job(command, handle_sync_documents, message)
         #return {"event": "syncDocuments", "data": {"message": "Backend activo", "timestamp": time.time()}}
 
     elif command == "login":
@@ -57,6 +88,33 @@ def handle_event(message):
     elif command == "getDocuments":
         return handle_get_documents(message)
 
+    elif command == "planSync":
+        return submit_job(command, handle_plan_sync, message)
+
+    elif command == "jobStatus":
+        return handle_job_status(message)
+
+    elif command == "cancelJob":
+        return handle_cancel_job(message)
+
+    elif command == "startWatch":
+        return handle_start_watch(message)
+
+    elif command == "stopWatch":
+        return handle_stop_watch(message)
+
+    elif command == "getOcrStats":
+        return handle_get_ocr_stats(message)
+
+    elif command == "restoreVersion":
+        return submit_job(command, handle_restore_version, message)
+
+    elif command == "verifyStorage":
+        return submit_job(command, handle_verify_storage, message)
+
+    elif command == "gcStorage":
+        return submit_job(command, handle_gc_storage, message)
+
     else:
         return {"event": "error", "data": {"message": f"Comando desconocido: {command}"}}
 
@@ -96,6 +154,79 @@ def handle_set_main_path(message):
     else:
         return {"event": "setMainPathFailure", "data": result}
     
+def submit_job(command, handler, message):
+    """
+    Ejecuta 'handler' como trabajo en segundo plano y responde de inmediato con
+    'jobAccepted' y el id del trabajo. Al terminar se envía la respuesta habitual del
+    comando (con 'jobId') seguida de un evento 'jobFinished'.
+    """
+    job = _job_manager.submit(command, handler, message, on_done=send_job_result)
+    return {"event": "jobAccepted", "data": {"success": True, "jobId": job.id, "command": command}}
+
+def send_job_result(job, response):
+    """Envía la respuesta de un trabajo terminado y su estado final."""
+    if isinstance(response, dict):
+        data = response.get("data")
+        if isinstance(data, dict):
+            response = {**response, "data": {**data, "jobId": job.id}}
+        send_response(response)
+    send_response({"event": "jobFinished", "data": job.to_dict()})
+
+def handle_job_status(message):
+    """
+    Devuelve el estado de un trabajo ('data.jobId') o, sin id, el de todos los trabajos.
+    """
+    job_id = message.get("data", {}).get("jobId")
+    if not job_id:
+        jobs = [job.to_dict() for job in _job_manager.list()]
+        return {"event": "jobStatusSuccess", "data": {"success": True, "jobs": jobs}}
+
+    job = _job_manager.get(job_id)
+    if job is None:
+        return {"event": "jobStatusFailure", "data": {"success": False, "error": f"Trabajo no encontrado: {job_id}"}}
+    return {"event": "jobStatusSuccess", "data": {"success": True, "job": job.to_dict()}}
+
+def handle_cancel_job(message):
+    """
+    Solicita la cancelación de un trabajo. La sincronización se detiene entre archivos y
+    lo pendiente se retoma en la próxima ejecución.
+    """
+    job_id = message.get("data", {}).get("jobId")
+    if not job_id:
+        return {"event": "cancelJobFailure", "data": {"success": False, "error": "Falta el id del trabajo"}}
+
+    job = _job_manager.cancel(job_id)
+    if job is None:
+        return {"event": "cancelJobFailure", "data": {"success": False, "error": f"Trabajo no encontrado: {job_id}"}}
+    return {"event": "cancelJobSuccess", "data": {"success": True, "job": job.to_dict()}}
+
+def send_sync_progress(progress):
+    """
+    Envía al frontend un evento 'syncProgress' (SyncProgress ya limita su frecuencia).
+    Dentro de un trabajo, el avance también queda en su estado y se indica su 'jobId'.
+    """
+    job = current_job()
+    if job is not None:
+        job.progress = progress
+        progress = {**progress, "jobId": job.id}
+    send_response({"event": "syncProgress", "data": progress})
+
+def send_sync_background_complete(result):
+    """
+    Envía al frontend un evento 'syncBackgroundComplete' cuando termina el procesamiento
+    en segundo plano de los documentos con OCR.
+    """
+    send_response({
+        "event": "syncBackgroundComplete",
+        "data": {
+            "success": result.get("success", False),
+            "message": result.get("message", ""),
+            "processed": result.get("processed", 0),
+            "failed": result.get("failed", 0),
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
+        }
+    })
+
 def handle_sync_documents(message):
     """
     Maneja la sincronización de documentos.
@@ -114,8 +245,15 @@ def handle_sync_documents(message):
                 }
             }
 
-        # Ejecutar la sincronización
-        result = sync_documents_use_case(main_path)
+        # Ejecutar la sincronización, enviando el avance como eventos 'syncProgress'.
+        # Los documentos con OCR continúan en segundo plano tras responder.
+        result = sync_documents_use_case(
+            main_path,
+            on_progress=send_sync_progress,
+            on_deferred_progress=send_sync_progress,
+            on_deferred_done=send_sync_background_complete,
+            cancel_event=current_cancel_event()
+        )
 
         if result.get("success"):
             return {
@@ -123,6 +261,7 @@ def handle_sync_documents(message):
                 "data": {
                     "success": True,
                     "message": result.get("message", "Sincronización completada"),
+                    "deferred": result.get("deferred", 0),
                     "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
                 }
             }
@@ -131,6 +270,7 @@ def handle_sync_documents(message):
                 "event": "syncFailure",
                 "data": {
                     "success": False,
+                    "cancelled": result.get("cancelled", False),
                     "error": result.get("message", "Error durante la sincronización")
                 }
             }
@@ -143,6 +283,134 @@ def handle_sync_documents(message):
             }
         }
     
+def handle_plan_sync(message):
+    """
+    Calcula el plan de sincronización (dry-run): archivos nuevos, modificados, sin cambios,
+    movidos y eliminados, con el tiempo estimado por etapa. No modifica nada.
+    """
+    try:
+        data = message.get("data", {})
+        main_path = data.get("path")
+        if not main_path:
+            settings = get_main_path()
+            main_path = settings.main_path if settings else None
+
+        if not main_path:
+            return {
+                "event": "planSyncFailure",
+                "data": {"success": False, "error": "No se ha configurado una ruta principal"}
+            }
+
+        result = plan_sync_use_case(main_path, cancel_event=current_cancel_event())
+
+        if result.get("success"):
+            return {"event": "planSyncSuccess", "data": result}
+        else:
+            return {
+                "event": "planSyncFailure",
+                "data": {
+                    "success": False,
+                    "cancelled": result.get("cancelled", False),
+                    "error": result.get("message", "Error al planificar la sincronización")
+                }
+            }
+    except Exception as e:
+        return {
+            "event": "planSyncFailure",
+            "data": {"success": False, "error": f"Error al planificar la sincronización: {str(e)}"}
+        }
+
+def handle_get_ocr_stats(message):
+    """
+    Devuelve los contadores acumulados del OCR de PDF por resolución y el tiempo estimado
+    que ahorra el OCR adaptativo. Con 'data.reset' los contadores se reinician.
+    """
+    try:
+        reset = bool(message.get("data", {}).get("reset", False))
+        stats = ocr_stats_use_case(reset=reset)
+        return {"event": "getOcrStatsSuccess", "data": {"success": True, "stats": stats}}
+    except Exception as e:
+        return {
+            "event": "getOcrStatsFailure",
+            "data": {"success": False, "error": f"Error al obtener las estadísticas de OCR: {str(e)}"}
+        }
+
+def handle_restore_version(message):
+    """
+    Devuelve la ruta del archivo de una versión ('data.versionId'), reconstruyéndolo si
+    se guardó como delta. Con 'data.destination' el archivo se copia a esa ruta.
+    """
+    data = message.get("data", {})
+    version_id = data.get("versionId")
+    if not version_id:
+        return {"event": "restoreVersionFailure", "data": {"success": False, "error": "Falta el id de la versión"}}
+
+    result = restore_version_use_case.execute(version_id, data.get("destination"))
+    if result.get("success"):
+        return {"event": "restoreVersionSuccess", "data": result}
+    return {"event": "restoreVersionFailure", "data": result}
+
+def send_storage_progress(progress):
+    """Envía al frontend un evento 'storageProgress' con el avance de la verificación del almacén."""
+    job = current_job()
+    if job is not None:
+        job.progress = progress
+        progress = {**progress, "jobId": job.id}
+    send_response({"event": "storageProgress", "data": progress})
+
+def handle_verify_storage(message):
+    """
+    Verifica que el archivo de cada versión exista y que su contenido coincida con su hash.
+    Si una verificación anterior se interrumpió, continúa desde donde quedó (salvo con
+    'data.resume' en false). Informa las versiones con archivos faltantes o dañados.
+    """
+    try:
+        resume = bool(message.get("data", {}).get("resume", True))
+        result = verify_storage_use_case(
+            resume=resume,
+            cancel_event=current_cancel_event(),
+            on_progress=send_storage_progress
+        )
+        if result.get("success"):
+            return {"event": "verifyStorageSuccess", "data": result}
+        return {
+            "event": "verifyStorageFailure",
+            "data": {
+                "success": False,
+                "cancelled": result.get("cancelled", False),
+                "error": result.get("message", "Error al verificar el almacén")
+            }
+        }
+    except Exception as e:
+        return {
+            "event": "verifyStorageFailure",
+            "data": {"success": False, "error": f"Error al verificar el almacén: {str(e)}"}
+        }
+
+def handle_gc_storage(message):
+    """
+    Borra del almacén los blobs y archivos que ninguna versión referencia. Con
+    'data.dryRun' solo informa lo que borraría.
+    """
+    try:
+        dry_run = bool(message.get("data", {}).get("dryRun", False))
+        result = gc_storage_use_case(dry_run=dry_run, cancel_event=current_cancel_event())
+        if result.get("success"):
+            return {"event": "gcStorageSuccess", "data": result}
+        return {
+            "event": "gcStorageFailure",
+            "data": {
+                "success": False,
+                "cancelled": result.get("cancelled", False),
+                "error": result.get("message", "Error al limpiar el almacén")
+            }
+        }
+    except Exception as e:
+        return {
+            "event": "gcStorageFailure",
+            "data": {"success": False, "error": f"Error al limpiar el almacén: {str(e)}"}
+        }
+
 def handle_get_documents(message):
     """
     Maneja la obtención de documentos (uno específico o todos).
@@ -180,4 +448,69 @@ def handle_get_documents(message):
                 "error": f"Error al obtener documentos: {str(e)}"
             }
         }
-        return send_response(error_response)
\ No newline at end of file
+        return send_response(error_response)
+
+def handle_start_watch(message):
+    """
+    Inicia el modo vigilancia sobre la ruta principal configurada.
+    Cada lote de cambios detectado se sincroniza y se notifica con un evento 'watchSync'.
+    """
+    global _document_watcher
+    try:
+        if _document_watcher and _document_watcher.is_running:
+            return {
+                "event": "startWatchSuccess",
+                "data": {"success": True, "path": _document_watcher.main_path, "message": "La vigilancia ya estaba activa"}
+            }
+
+        settings = get_main_path()
+        main_path = settings.main_path if settings else None
+        if not main_path:
+            return {
+                "event": "startWatchFailure",
+                "data": {"success": False, "error": "No se ha configurado una ruta principal"}
+            }
+
+        def on_changes(paths):
+            result = sync_paths_use_case(
+                main_path,
+                paths,
+                on_progress=send_sync_progress,
+                on_deferred_progress=send_sync_progress,
+                on_deferred_done=send_sync_background_complete
+            )
+            send_response({
+                "event": "watchSync",
+                "data": {
+                    "success": result.get("success", False),
+                    "message": result.get("message", ""),
+                    "paths": len(paths),
+                    "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
+                }
+            })
+
+        watcher = DocumentWatcher(main_path, on_changes, extensions=sync_extensions)
+        watcher.start()
+        _document_watcher = watcher
+
+        return {"event": "startWatchSuccess", "data": {"success": True, "path": main_path}}
+    except ImportError:
+        return {
+            "event": "startWatchFailure",
+            "data": {"success": False, "error": "El modo vigilancia requiere el paquete 'watchdog'"}
+        }
+    except Exception as e:
+        return {
+            "event": "startWatchFailure",
+            "data": {"success": False, "error": f"Error al iniciar la vigilancia: {str(e)}"}
+        }
+
+def handle_stop_watch(message):
+    """
+    Detiene el modo vigilancia si está activo.
+    """
+    global _document_watcher
+    if _document_watcher:
+        _document_watcher.stop()
+        _document_watcher = None
+    return {"event": "stopWatchSuccess", "data": {"success": True}}
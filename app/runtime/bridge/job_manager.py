@@ -0,0 +1,159 @@
+# /app/runtime/bridge/job_manager.py
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from config.config import get_bridge_job_workers
+
+# Estados de un trabajo
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+# Trabajos terminados que se conservan para consultar su estado
+MAX_FINISHED_JOBS = 100
+
+# Trabajo que se ejecuta en el hilo actual (lo usan los manejadores para cancelación y progreso)
+_current = threading.local()
+
+class Job:
+    """Un comando de larga duración ejecutado fuera del bucle principal del bridge."""
+
+    def __init__(self, command: str):
+        self.id = uuid.uuid4().hex
+        self.command = command
+        self.status = JOB_QUEUED
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.progress = None
+        self.result = None
+        self.error = None
+        self.cancel_event = threading.Event()
+        self.future = None
+        self.on_done = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED)
+
+    def to_dict(self) -> dict:
+        return {
+            "jobId": self.id,
+            "command": self.command,
+            "status": self.status,
+            "createdAt": self.created_at,
+            "startedAt": self.started_at,
+            "finishedAt": self.finished_at,
+            "cancelRequested": self.cancel_event.is_set(),
+            "progress": self.progress,
+            "error": self.error
+        }
+
+class JobManager:
+    """
+    Ejecuta comandos largos (p. ej. syncDocuments) en hilos de trabajo y devuelve un id
+    de inmediato, de modo que el bucle de stdin sigue atendiendo ping, getDocuments, etc.
+
+    La cancelación es cooperativa: cancel() marca el evento del trabajo y el caso de uso
+    lo consulta entre archivos (ver current_cancel_event). Un trabajo en cola se
+    cancela sin llegar a ejecutarse.
+    """
+
+    def __init__(self, max_workers: int = None):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or get_bridge_job_workers(), thread_name_prefix="bridge-job"
+        )
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, command: str, handler, message: dict, on_done) -> Job:
+        """
+        Encola 'handler(message)'. Al terminar, 'on_done(job, response)' recibe la respuesta
+        del manejador (o None si el trabajo se canceló antes de empezar o falló).
+        """
+        job = Job(command)
+        job.on_done = on_done
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        job.future = self._executor.submit(self._run, job, handler, message)
+        return job
+
+    def get(self, job_id: str):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self):
+        with self._lock:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id: str):
+        """Solicita la cancelación de un trabajo. Retorna el trabajo o None si no existe."""
+        job = self.get(job_id)
+        if job is None or job.is_finished:
+            return job
+        job.cancel_event.set()
+        if job.future is not None and job.future.cancel():
+            # Aún estaba en cola: no llegará a ejecutarse
+            job.status = JOB_CANCELLED
+            job.finished_at = time.time()
+            self._notify(job, None)
+        return job
+
+    def _run(self, job: Job, handler, message: dict):
+        if job.cancel_event.is_set():
+            job.status = JOB_CANCELLED
+            job.finished_at = time.time()
+            self._notify(job, None)
+            return
+
+        job.status = JOB_RUNNING
+        job.started_at = time.time()
+        _current.job = job
+        response = None
+        try:
+            response = handler(message)
+            job.result = response
+            data = response.get("data", {}) if isinstance(response, dict) else {}
+            if isinstance(data, dict) and data.get("cancelled"):
+                job.status = JOB_CANCELLED
+            elif isinstance(data, dict) and data.get("success") is False:
+                job.status = JOB_FAILED
+                job.error = data.get("error")
+            else:
+                job.status = JOB_COMPLETED
+        except Exception as e:
+            job.status = JOB_FAILED
+            job.error = str(e)
+        finally:
+            _current.job = None
+            job.finished_at = time.time()
+
+        self._notify(job, response)
+
+    def _notify(self, job: Job, response):
+        try:
+            job.on_done(job, response)
+        except Exception as e:
+            print(f"⚠️ Error notificando fin del trabajo {job.id}: {e}")
+
+    def _prune(self):
+        """Descarta los trabajos terminados más antiguos por encima de MAX_FINISHED_JOBS."""
+        finished = sorted(
+            (job for job in self._jobs.values() if job.is_finished),
+            key=lambda job: job.finished_at
+        )
+        for job in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job.id]
+
+def current_job():
+    """Trabajo que se ejecuta en el hilo actual (None fuera de un trabajo)."""
+    return getattr(_current, "job", None)
+
+def current_cancel_event():
+    """Evento de cancelación del trabajo actual (None fuera de un trabajo)."""
+    job = current_job()
+    return job.cancel_event if job else None
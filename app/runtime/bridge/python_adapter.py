@@ -1,18 +1,33 @@
 # /app/runtime/bridge/python_adapter.py
+import os
 import sys
 import json
-from bridge.event_handler import handle_event
+from bridge.event_handler import handle_event, send_response, set_protocol_stream
+from core.data.services.extraction_sandbox import redirect_stdout_to_stderr
 
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def open_protocol_stream():
+    """
+    Reserva el stdout original para las respuestas a Electron y envía a stderr todo lo
+    demás: los print de los hilos (trabajos, vigilancia, cola diferida) y, a través del
+    descriptor 1 que heredan, los de los procesos hijos y sus subprocesos. Así una línea
+    de diagnóstico nunca corta una respuesta JSON.
+    """
+    sys.stdout.flush()
+    protocol = os.fdopen(os.dup(sys.stdout.fileno()), "w", encoding="utf-8", newline="\n")
+    redirect_stdout_to_stderr()
+    return protocol
+
 def run_adapter():
     """
     Escucha los mensajes entrantes desde Electron, los procesa y responde.
     """
 
+    set_protocol_stream(open_protocol_stream())
     logging.info("Levantando manejador de eventos...")
 
     while True:
@@ -22,10 +37,9 @@ def run_adapter():
         try:
             message = json.loads(line)
             response = handle_event(message)  # Delegar la ejecución al manejador de eventos
-            sys.stdout.write(json.dumps(response) + "\n")
-            sys.stdout.flush()
+            if isinstance(response, dict):
+                send_response(response)  # Algunos manejadores ya envían su propia respuesta
         except Exception as e:
             # Manejo de errores global para evitar que se rompa el proceso
             error_response = {"event": "error", "data": {"message": str(e)}}
-            sys.stdout.write(json.dumps(error_response) + "\n")
-            sys.stdout.flush()
\ No newline at end of file
+            send_response(error_response)
\ No newline at end of file
@@ -6,6 +6,32 @@ def get_env():
     """Devuelve el entorno actual de la aplicación (DEV o PROD)."""
     return os.getenv("APP_ENV", "DEV").upper()
 
+def _get_int_env(name, default, minimum=0):
+    """Lee una variable de entorno entera, usando el valor por defecto si no es válida."""
+    try:
+        return max(minimum, int(os.getenv(name, default)))
+    except (TypeError, ValueError):
+        return default
+
+def _get_float_env(name, default, minimum=0.0):
+    """Lee una variable de entorno decimal, usando el valor por defecto si no es válida."""
+    try:
+        return max(minimum, float(os.getenv(name, default)))
+    except (TypeError, ValueError):
+        return default
+
+def _get_bool_env(name, default):
+    """Lee una variable de entorno booleana (1/0, true/false, yes/no, on/off)."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    value = value.strip().lower()
+    if value in ("1", "true", "yes", "on"):
+        return True
+    if value in ("0", "false", "no", "off"):
+        return False
+    return default
+
 def get_base_directory():
     """
     Devuelve la ruta base donde se almacenan los datos de la aplicación.
@@ -43,3 +69,223 @@ def get_template_db_path():
 def get_init_sql_path():
     """Devuelve la ruta del archivo init.sql."""
     return Path(__file__).resolve().parent / "resources" / "init.sql"
+
+def get_sync_workers():
+    """
+    Devuelve el número de procesos para las etapas pesadas de la sincronización
+    (extracción/OCR, ortografía y NER). Se configura con SYNC_WORKERS.
+    Con 1 (valor por defecto) todo se ejecuta en el proceso principal.
+    """
+    return _get_int_env("SYNC_WORKERS", 1, minimum=1)
+
+def get_watch_debounce_seconds():
+    """
+    Devuelve los segundos de inactividad que el modo vigilancia espera antes de
+    sincronizar un lote de cambios. Se configura con WATCH_DEBOUNCE_SECONDS.
+    """
+    return _get_float_env("WATCH_DEBOUNCE_SECONDS", 2.0, minimum=0.1)
+
+def get_sync_batch_size():
+    """
+    Devuelve cuántos documentos se escriben en la BD por transacción durante la
+    sincronización. Se configura con SYNC_BATCH_SIZE; 1 confirma documento a documento.
+    """
+    return _get_int_env("SYNC_BATCH_SIZE", 10, minimum=1)
+
+def get_sync_progress_interval():
+    """
+    Devuelve el intervalo mínimo en segundos entre eventos 'syncProgress'.
+    Se configura con SYNC_PROGRESS_INTERVAL.
+    """
+    return _get_float_env("SYNC_PROGRESS_INTERVAL", 0.5, minimum=0.05)
+
+def get_sync_defer_ocr():
+    """
+    Indica si los documentos que requieren OCR se procesan en segundo plano después
+    de responder a la sincronización. Se configura con SYNC_DEFER_OCR (activo por defecto).
+    """
+    return _get_bool_env("SYNC_DEFER_OCR", True)
+
+def get_sync_background_workers():
+    """
+    Devuelve el número de procesos (con prioridad reducida) para la cola de documentos
+    diferidos. Se configura con SYNC_BACKGROUND_WORKERS.
+    """
+    return _get_int_env("SYNC_BACKGROUND_WORKERS", 1, minimum=1)
+
+def get_bridge_job_workers():
+    """
+    Devuelve cuántos comandos largos (syncDocuments, planSync) puede ejecutar el bridge
+    a la vez en segundo plano. Se configura con BRIDGE_JOB_WORKERS.
+    """
+    return _get_int_env("BRIDGE_JOB_WORKERS", 2, minimum=1)
+
+def get_ocr_workers():
+    """
+    Devuelve el número de procesos para el OCR por páginas de un documento escaneado.
+    Se configura con OCR_WORKERS, de forma independiente a SYNC_WORKERS; por defecto se
+    reparten los núcleos disponibles entre los procesos de sincronización.
+    """
+    default = max(1, (os.cpu_count() or 1) // get_sync_workers())
+    return _get_int_env("OCR_WORKERS", default, minimum=1)
+
+def get_ocr_page_window():
+    """
+    Devuelve cuántas páginas de un PDF escaneado se rasterizan a la vez antes de aplicarles
+    OCR. Limita la memoria usada sin importar el número de páginas. Se configura con
+    OCR_PAGE_WINDOW.
+    """
+    return _get_int_env("OCR_PAGE_WINDOW", 4, minimum=1)
+
+def get_ocr_cache_size_mb():
+    """
+    Devuelve el tamaño máximo en MB de la caché de resultados de OCR (en cache/ocr).
+    Se configura con OCR_CACHE_SIZE_MB; al superarlo se descartan las entradas menos usadas.
+    """
+    return _get_int_env("OCR_CACHE_SIZE_MB", 512, minimum=1)
+
+def get_ocr_engine_name():
+    """
+    Devuelve el motor de OCR: 'tesserocr' (API de Tesseract en proceso), 'pytesseract'
+    (un proceso 'tesseract' por imagen) o 'auto' (tesserocr si está instalado).
+    Se configura con OCR_ENGINE.
+    """
+    return os.getenv("OCR_ENGINE", "auto").strip().lower() or "auto"
+
+def get_pdf_text_backend_name():
+    """
+    Devuelve la biblioteca con la que se lee la capa de texto de los PDF: 'pypdfium2'
+    (PDFium, mucho más rápida), 'pdfminer' o 'auto' (pypdfium2 si está instalado).
+    Se configura con PDF_TEXT_BACKEND.
+    """
+    return os.getenv("PDF_TEXT_BACKEND", "auto").strip().lower() or "auto"
+
+def get_extraction_sandbox_enabled():
+    """
+    Indica si la extracción de texto y metadatos se ejecuta en procesos aislados con
+    límites de tiempo y memoria. Se configura con EXTRACTION_SANDBOX (activo por defecto).
+    """
+    return _get_bool_env("EXTRACTION_SANDBOX", True)
+
+def get_extraction_timeout_seconds():
+    """
+    Devuelve los segundos máximos para extraer el texto de un archivo (OCR incluido).
+    Al superarlos se detiene el proceso y el archivo se omite. Se configura con
+    EXTRACTION_TIMEOUT_SECONDS; 0 desactiva el límite.
+    """
+    return _get_float_env("EXTRACTION_TIMEOUT_SECONDS", 600.0)
+
+def get_metadata_timeout_seconds():
+    """
+    Devuelve los segundos máximos para leer los metadatos de un archivo. Se configura
+    con METADATA_TIMEOUT_SECONDS; 0 desactiva el límite.
+    """
+    return _get_float_env("METADATA_TIMEOUT_SECONDS", 60.0)
+
+def get_extraction_max_rss_mb():
+    """
+    Devuelve la memoria residente máxima (en MB) de un proceso de extracción, incluidos
+    sus procesos hijos (pdftoppm, tesseract...). Se configura con EXTRACTION_MAX_RSS_MB;
+    0 desactiva el límite.
+    """
+    return _get_int_env("EXTRACTION_MAX_RSS_MB", 2048)
+
+def get_ocr_adaptive_dpi():
+    """
+    Indica si el OCR de los PDF escaneados es adaptativo: primero se rasteriza a baja
+    resolución (OCR_LOW_DPI) y solo las páginas con confianza menor que OCR_MIN_CONFIDENCE
+    se repiten a alta resolución (OCR_HIGH_DPI). Se configura con OCR_ADAPTIVE_DPI
+    (desactivado por defecto: se usa una resolución fija).
+    """
+    return _get_bool_env("OCR_ADAPTIVE_DPI", False)
+
+def get_ocr_low_dpi():
+    """Devuelve la resolución de la primera pasada del OCR adaptativo (OCR_LOW_DPI)."""
+    return _get_int_env("OCR_LOW_DPI", 150, minimum=50)
+
+def get_ocr_high_dpi():
+    """
+    Devuelve la resolución con la que el OCR adaptativo repite las páginas de baja
+    confianza (OCR_HIGH_DPI). Nunca es menor que OCR_LOW_DPI.
+    """
+    return max(get_ocr_low_dpi(), _get_int_env("OCR_HIGH_DPI", 300, minimum=50))
+
+def get_ocr_min_confidence():
+    """
+    Devuelve la confianza media de Tesseract (0-100) por debajo de la cual una página
+    se repite a alta resolución. Se configura con OCR_MIN_CONFIDENCE.
+    """
+    return min(100.0, _get_float_env("OCR_MIN_CONFIDENCE", 70.0))
+
+def get_hash_workers():
+    """
+    Devuelve cuántos archivos se leen y se hashean a la vez (en hilos: hashlib libera el
+    GIL mientras calcula). Se configura con HASH_WORKERS; por defecto, los núcleos
+    disponibles hasta un máximo de 8.
+    """
+    return _get_int_env("HASH_WORKERS", min(8, os.cpu_count() or 1), minimum=1)
+
+def get_hash_fingerprint_name():
+    """
+    Devuelve la huella rápida (no criptográfica) con la que se detecta que un archivo
+    modificado en disco conserva el mismo contenido, sin recalcular su SHA-256:
+    'xxhash', 'off' o 'auto' (xxhash si está instalado). Se configura con HASH_FINGERPRINT.
+    """
+    return os.getenv("HASH_FINGERPRINT", "auto").strip().lower() or "auto"
+
+def get_version_store_link_mode():
+    """
+    Devuelve cómo se guarda en el almacén de blobs el archivo de una versión nueva:
+    'auto' (clon copy-on-write/reflink si el sistema de archivos lo admite y, si no, copia),
+    'hardlink' (enlace duro al archivo original; solo es seguro si los originales nunca se
+    modifican en su sitio) o 'copy'. Se configura con VERSION_STORE_LINK.
+    """
+    return os.getenv("VERSION_STORE_LINK", "auto").strip().lower() or "auto"
+
+def get_version_store_delta():
+    """
+    Indica si las versiones anteriores de un documento se guardan como delta binario
+    respecto de la siguiente (la última versión siempre se conserva completa).
+    Se configura con VERSION_STORE_DELTA (desactivado por defecto).
+    """
+    return _get_bool_env("VERSION_STORE_DELTA", False)
+
+def get_version_store_delta_max_chain():
+    """
+    Devuelve cuántas versiones seguidas de un documento pueden guardarse como delta antes
+    de conservar una completa. Limita los deltas que hay que aplicar para reconstruir la
+    versión más antigua. Se configura con VERSION_STORE_DELTA_MAX_CHAIN.
+    """
+    return _get_int_env("VERSION_STORE_DELTA_MAX_CHAIN", 10, minimum=1)
+
+def get_version_store_compression():
+    """
+    Devuelve la compresión de los blobs del almacén de versiones: 'zstd', 'off' o 'auto'
+    (zstd si zstandard está instalado). Los archivos que no se comprimen lo suficiente se
+    guardan sin comprimir. Se configura con VERSION_STORE_COMPRESSION (desactivada por defecto).
+    """
+    return os.getenv("VERSION_STORE_COMPRESSION", "off").strip().lower() or "off"
+
+def get_version_store_compression_level():
+    """
+    Devuelve el nivel de zstd de los blobs comprimidos (1 a 22; más alto comprime más pero
+    es más lento al guardar, la descompresión apenas cambia). Se configura con
+    VERSION_STORE_COMPRESSION_LEVEL.
+    """
+    return min(22, _get_int_env("VERSION_STORE_COMPRESSION_LEVEL", 3, minimum=1))
+
+def get_storage_verify_workers():
+    """
+    Devuelve cuántos blobs se leen a la vez al verificar el almacén de versiones. Limita la
+    concurrencia de E/S (en discos mecánicos conviene un valor bajo). Se configura con
+    STORAGE_VERIFY_WORKERS.
+    """
+    return _get_int_env("STORAGE_VERIFY_WORKERS", 4, minimum=1)
+
+def get_storage_gc_grace_minutes():
+    """
+    Devuelve la antigüedad mínima, en minutos, de un archivo sin referencias para que la
+    limpieza del almacén lo borre: protege los blobs de una sincronización de otro proceso
+    que aún no registró su versión. Se configura con STORAGE_GC_GRACE_MINUTES.
+    """
+    return _get_int_env("STORAGE_GC_GRACE_MINUTES", 60)
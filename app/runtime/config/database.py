@@ -4,6 +4,7 @@ from sqlalchemy.orm import sessionmaker
 import shutil
 from config.config import get_db_path, get_template_db_path
 from core.data.models.orm_models import Base
+from config.migrations import run_migrations
 from pathlib import Path
 
 def get_database_url():
@@ -37,6 +38,7 @@ def initialize_database():
         print("La base de datos ya existe. Se procederá a actualizar el esquema si es necesario.")
     
     Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
     print("Inicialización de la base de datos completada.")
 
 def get_db_session():
@@ -15,6 +15,18 @@ def get_documents_directory():
     os.makedirs(documents_dir, exist_ok=True)
     return documents_dir
 
+def get_blobs_directory():
+    """Retorna la ruta del almacén de blobs (archivos de las versiones, por hash de contenido)."""
+    blobs_dir = get_documents_directory() / "blobs"
+    os.makedirs(blobs_dir, exist_ok=True)
+    return blobs_dir
+
+def get_restored_directory():
+    """Retorna la ruta donde se reconstruyen las versiones guardadas como delta o comprimidas."""
+    restored_dir = get_data_directory() / "restored"
+    os.makedirs(restored_dir, exist_ok=True)
+    return restored_dir
+
 def get_logs_directory():
     """Retorna la ruta donde se almacenarán los logs de la aplicación."""
     logs_dir = get_data_directory() / "logs"
@@ -37,16 +37,20 @@ CREATE TABLE "versions" (
 	"document_id"	INTEGER NOT NULL,
 	"version_tag"	VARCHAR(255) NOT NULL,
 	"file_path"	VARCHAR(500) NOT NULL,
-	"file_hash"	VARCHAR(255) NOT NULL UNIQUE,
+	"file_hash"	VARCHAR(255) NOT NULL,
 	"author_id"	INTEGER NOT NULL,
 	"comment"	VARCHAR(500),
 	"updated_at"	DATETIME DEFAULT CURRENT_TIMESTAMP,
 	"size_mb"	NUMERIC,
+	"blob_hash"	VARCHAR(64),
 	PRIMARY KEY("id" AUTOINCREMENT),
 	FOREIGN KEY("author_id") REFERENCES "authors"("id"),
 	FOREIGN KEY("document_id") REFERENCES "documents"("id") ON DELETE CASCADE
 );
 
+CREATE INDEX ix_versions_file_hash ON versions (file_hash);
+CREATE INDEX ix_versions_blob_hash ON versions (blob_hash);
+
 CREATE TABLE analyzed_content (
     version_id INTEGER PRIMARY KEY,
     text TEXT NOT NULL,
@@ -74,4 +78,32 @@ CREATE TABLE "spell_errors" (
 	"version_id"	INTEGER,
 	PRIMARY KEY("id" AUTOINCREMENT)
 	FOREIGN KEY (version_id) REFERENCES versions(id) ON DELETE CASCADE
+);
+
+CREATE TABLE sync_manifest (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode VARCHAR(40) NOT NULL,
+    unique_hash VARCHAR(255) NOT NULL,
+    version_hash VARCHAR(255) NOT NULL,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE sync_journal (
+    path TEXT PRIMARY KEY,
+    version_hash VARCHAR(255) NOT NULL,
+    stage VARCHAR(16) NOT NULL,
+    payload JSON,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE sync_stage_timings (
+    stage VARCHAR(16) NOT NULL,
+    kind VARCHAR(16) NOT NULL,
+    samples INTEGER NOT NULL DEFAULT 0,
+    total_seconds REAL NOT NULL DEFAULT 0,
+    total_bytes INTEGER NOT NULL DEFAULT 0,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (stage, kind)
 );
\ No newline at end of file
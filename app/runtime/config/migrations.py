@@ -0,0 +1,71 @@
+# /app/runtime/config/migrations.py
+from sqlalchemy import text
+
+# create_all() solo crea tablas nuevas: los cambios en tablas existentes se aplican aquí.
+# Cada migración comprueba si ya se aplicó, por lo que se pueden ejecutar en cada arranque.
+
+VERSIONS_COLUMNS = "id, document_id, version_tag, file_path, file_hash, author_id, comment, updated_at, size_mb"
+
+def _columns(connection, table: str) -> set:
+    return {row[1] for row in connection.execute(text(f"PRAGMA table_info({table})"))}
+
+def _has_unique_index(connection, table: str, column: str) -> bool:
+    """Indica si 'column' tiene una restricción UNIQUE propia (que SQLite no permite quitar con ALTER)."""
+    for _, name, unique, origin, *_ in connection.execute(text(f"PRAGMA index_list({table})")):
+        if not unique or origin != "u":
+            continue
+        columns = [row[2] for row in connection.execute(text(f"PRAGMA index_info('{name}')"))]
+        if columns == [column]:
+            return True
+    return False
+
+def migrate_versions_blob_store(connection):
+    """
+    versions.file_hash deja de ser único (el mismo contenido puede pertenecer a dos
+    documentos) y se añade versions.blob_hash, la clave del archivo en el almacén de blobs.
+    """
+    columns = _columns(connection, "versions")
+    if not columns:
+        return
+
+    if _has_unique_index(connection, "versions", "file_hash"):
+        print("🛠️ Migrando la tabla versions al almacén de blobs...")
+        # SQLite no permite quitar una restricción: se reconstruye la tabla conservando los
+        # id (las demás tablas los referencian) y se reemplaza la anterior
+        connection.execute(text('''
+            CREATE TABLE versions_new (
+                id INTEGER,
+                document_id INTEGER NOT NULL,
+                version_tag VARCHAR(255) NOT NULL,
+                file_path VARCHAR(500) NOT NULL,
+                file_hash VARCHAR(255) NOT NULL,
+                author_id INTEGER NOT NULL,
+                comment VARCHAR(500),
+                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                size_mb NUMERIC,
+                blob_hash VARCHAR(64),
+                PRIMARY KEY(id AUTOINCREMENT),
+                FOREIGN KEY(author_id) REFERENCES authors(id),
+                FOREIGN KEY(document_id) REFERENCES documents(id) ON DELETE CASCADE
+            )
+        '''))
+        connection.execute(text(
+            f"INSERT INTO versions_new ({VERSIONS_COLUMNS}) SELECT {VERSIONS_COLUMNS} FROM versions"
+        ))
+        connection.execute(text("DROP TABLE versions"))
+        connection.execute(text("ALTER TABLE versions_new RENAME TO versions"))
+    elif "blob_hash" not in columns:
+        connection.execute(text("ALTER TABLE versions ADD COLUMN blob_hash VARCHAR(64)"))
+
+    connection.execute(text("CREATE INDEX IF NOT EXISTS ix_versions_file_hash ON versions (file_hash)"))
+    connection.execute(text("CREATE INDEX IF NOT EXISTS ix_versions_blob_hash ON versions (blob_hash)"))
+
+MIGRATIONS = [
+    migrate_versions_blob_store,
+]
+
+def run_migrations(engine):
+    """Aplica en una sola transacción las migraciones pendientes."""
+    with engine.begin() as connection:
+        for migration in MIGRATIONS:
+            migration(connection)
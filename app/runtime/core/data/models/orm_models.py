@@ -1,6 +1,6 @@
 # /app/runtime/data/models/orm_models.py
 import datetime
-from sqlalchemy import JSON, Column, String, Integer, DateTime, ForeignKey, Text, Numeric, Date, Time
+from sqlalchemy import JSON, Column, String, Integer, Float, DateTime, ForeignKey, Text, Numeric, Date, Time, Index
 from sqlalchemy.orm import relationship, declarative_base
 from core.domain.models.user import UserDomain
 from core.domain.models.document import DocumentDomain
@@ -79,12 +79,22 @@ class Version(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     document_id = Column(Integer, ForeignKey('documents.id'), nullable=False)
     version_tag = Column(String(255), nullable=False)
+    # Ruta del archivo al guardarse la versión. Con blob_hash puede dejar de existir (el blob
+    # se comprime o se guarda como delta): se lee con blob_store.materialize_version_file
     file_path = Column(String(500), nullable=False)
-    file_hash = Column(String(255), unique=True, nullable=False)
+    # No es único: dos documentos (p. ej. copias en rutas distintas) pueden tener el mismo contenido
+    file_hash = Column(String(255), nullable=False)
     author_id = Column(Integer, ForeignKey('authors.id'), nullable=False)
     comment = Column(String(500))
     updated_at = Column(DateTime, default=datetime.datetime.utcnow)
     size_mb = Column(Numeric)
+    # SHA-256 del contenido: clave del archivo en el almacén de blobs (None en versiones antiguas)
+    blob_hash = Column(String(64))
+
+    __table_args__ = (
+        Index("ix_versions_file_hash", "file_hash"),
+        Index("ix_versions_blob_hash", "blob_hash"),
+    )
    
     document = relationship("Document", back_populates="versions")
     analyzed_content = relationship("AnalyzedContent", uselist=False, back_populates="version")
@@ -102,7 +112,8 @@ class Version(Base):
             author_id=self.author_id,
             comment=self.comment,
             updated_at=self.updated_at,
-            size_mb=float(self.size_mb) if self.size_mb is not None else 0.0
+            size_mb=float(self.size_mb) if self.size_mb is not None else 0.0,
+            blob_hash=self.blob_hash
         )
     
 class SpellErrors(Base):
@@ -165,4 +176,50 @@ class LegalCalendar(Base):
             event=self.event,
             date=self.date,
             time=self.time
-        )
\ No newline at end of file
+        )
+
+class SyncManifest(Base):
+    """
+    Modelo ORM para la tabla sync_manifest.
+    Guarda la firma de cada archivo sincronizado (tamaño, mtime e inodo) junto a sus hashes,
+    para poder omitir los archivos sin cambios con un solo stat().
+    """
+    __tablename__ = "sync_manifest"
+
+    path = Column(Text, primary_key=True)
+    size = Column(Integer, nullable=False)
+    mtime_ns = Column(Integer, nullable=False)
+    inode = Column(String(40), nullable=False)  # Texto: en Windows/ReFS puede exceder 64 bits.
+    unique_hash = Column(String(255), nullable=False)
+    version_hash = Column(String(255), nullable=False)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow)
+
+class SyncJournal(Base):
+    """
+    Modelo ORM para la tabla sync_journal.
+    Registra los archivos persistidos en una sincronización en curso y los que superaron
+    los límites de extracción ('failed', con el error en 'payload'). Las etapas
+    intermedias se retoman desde la caché de etapas (ver cache_service.stage_cache).
+    """
+    __tablename__ = "sync_journal"
+
+    path = Column(Text, primary_key=True)
+    version_hash = Column(String(255), nullable=False)
+    stage = Column(String(16), nullable=False)
+    payload = Column(JSON, nullable=True)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow)
+
+class SyncStageTiming(Base):
+    """
+    Modelo ORM para la tabla sync_stage_timings.
+    Acumula los tiempos medidos de cada etapa de la sincronización por tipo de archivo
+    (p. ej. extracted/pdf-ocr), para estimar la duración de sincronizaciones futuras.
+    """
+    __tablename__ = "sync_stage_timings"
+
+    stage = Column(String(16), primary_key=True)
+    kind = Column(String(16), primary_key=True)
+    samples = Column(Integer, nullable=False, default=0)
+    total_seconds = Column(Float, nullable=False, default=0.0)
+    total_bytes = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow)
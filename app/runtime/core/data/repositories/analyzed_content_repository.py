@@ -1,15 +1,11 @@
-from sqlalchemy.orm import Session
 from core.data.models.orm_models import AnalyzedContent
-from config.database import get_db_session
+from core.data.repositories.base_repository import SessionRepository
 from core.data.services.cache_service import (
     get_cached_analyzed_content_by_version_id,
     cache_analyzed_content
 )
 
-class AnalyzedContentRepository:
-    def __init__(self):
-        self.session: Session = get_db_session()
-
+class AnalyzedContentRepository(SessionRepository):
     def create_or_update(self, version_id: int, text: str, entities: dict):
         """
         Crea o actualiza el contenido analizado de una versión de documento.
@@ -24,9 +20,7 @@ class AnalyzedContentRepository:
             content = AnalyzedContent(version_id=version_id, text=text, entities=entities)
             self.session.add(content)
 
-        self.session.commit()
-        self.session.refresh(content)
-        cache_analyzed_content(content)  # Cachear el contenido
+        self._commit(on_commit=lambda: cache_analyzed_content(content))  # Cachear el contenido
         return content
 
     def get_by_version_id(self, version_id: int):
@@ -0,0 +1,27 @@
+from sqlalchemy.orm import Session
+from config.database import get_db_session
+
+class SessionRepository:
+    """
+    Base para repositorios que escriben en la BD.
+
+    Por defecto cada repositorio usa su propia sesión y confirma cada escritura.
+    Si se crea dentro de una UnitOfWork comparte su sesión: las escrituras solo se
+    envían con flush() y la confirmación (y lo que dependa de ella, como la caché)
+    queda a cargo de la UnitOfWork.
+    """
+
+    def __init__(self, unit_of_work=None):
+        self.unit_of_work = unit_of_work
+        self.session: Session = unit_of_work.session if unit_of_work else get_db_session()
+
+    def _commit(self, on_commit=None):
+        """Confirma la escritura, o la difiere hasta que la UnitOfWork haga commit."""
+        if self.unit_of_work:
+            self.session.flush()
+            if on_commit:
+                self.unit_of_work.after_commit(on_commit)
+        else:
+            self.session.commit()
+            if on_commit:
+                on_commit()
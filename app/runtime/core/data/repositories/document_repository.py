@@ -84,6 +84,13 @@ class DocumentRepository:
             cache_document(doc)  # Cachear para futuras consultas
         return doc
 
+    def get_path_index(self):
+        """
+        Devuelve (id, unique_hash, main_path) de todos los documentos, directamente de la BD
+        y sin cargar los objetos completos (usado para planificar una sincronización).
+        """
+        return self.session.query(Document.id, Document.unique_hash, Document.main_path).all()
+
     def create_document(self, title, description, doc_type, unique_hash, main_path):
         """Crea un nuevo documento en la BD."""
         new_document = Document(
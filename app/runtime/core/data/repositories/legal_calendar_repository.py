@@ -1,16 +1,13 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import insert
 from core.data.models.orm_models import LegalCalendar
-from config.database import get_db_session
+from core.data.repositories.base_repository import SessionRepository
 from datetime import datetime
 
-class LegalCalendarRepository:
+class LegalCalendarRepository(SessionRepository):
     """
     Repositorio para manejar eventos legales en la BD.
     """
 
-    def __init__(self):
-        self.session: Session = get_db_session()
-
     def create_event(self, document_id: int, event: str, date: str, time: str = None):
         """
         Crea un evento en el calendario legal asociado a un documento.
@@ -26,7 +23,25 @@ class LegalCalendarRepository:
         )
 
         self.session.add(new_event)
-        self.session.commit()
+        self._commit()
+
+    def create_events(self, document_id: int, events: list):
+        """
+        Crea varios eventos de un documento con una sola inserción masiva.
+        Cada evento es un diccionario con "event", "date" ("%Y-%m-%d") y opcionalmente "time" ("%H:%M").
+        """
+        rows = [
+            {
+                "document_id": document_id,
+                "event": item["event"],
+                "date": datetime.strptime(item["date"], "%Y-%m-%d").date(),
+                "time": datetime.strptime(item["time"], "%H:%M").time() if item.get("time") else None
+            }
+            for item in events
+        ]
+        if rows:
+            self.session.execute(insert(LegalCalendar), rows)
+            self._commit()
 
     def get_events_by_document(self, document_id: int):
         """
@@ -1,24 +1,20 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import insert
 from core.data.models.orm_models import SpellErrors
 from core.domain.models.spelling_error import SpellingErrorDomain
 from core.data.services.spellcheck_service import get_suggestions
-from config.database import get_db_session
+from core.data.repositories.base_repository import SessionRepository
 from core.data.services.cache_service import (
     get_cached_spelling_errors_by_version_id,
     cache_spelling_errors,
     get_cached_word_suggestions
 )
 
-class SpellingErrorRepository:
-    def __init__(self):
-        self.session: Session = get_db_session()
-
+class SpellingErrorRepository(SessionRepository):
     def create_error(self, error_word: str, version_id: int):
         """Registra un error ortográfico en la base de datos."""
         new_error = SpellErrors(word=error_word, version_id=version_id)
         self.session.add(new_error)
-        self.session.commit()
-        self.session.refresh(new_error)
+        self._commit()
         
         error_data = {
             'id': new_error.id,
@@ -38,6 +34,17 @@ class SpellingErrorRepository:
             version_id=new_error.version_id
         )
 
+    def create_errors(self, words: list, version_id: int):
+        """
+        Registra todos los errores ortográficos de una versión con una sola inserción masiva.
+        No calcula sugerencias: se obtienen (y cachean) al consultar los errores.
+        """
+        rows = [{"word": word, "version_id": version_id} for word in words if word]
+        if rows:
+            self.session.execute(insert(SpellErrors), rows)
+            self._commit()
+        return len(rows)
+
     def get_errors_by_version(self, version_id: int):
         """
         Obtiene los errores ortográficos de una versión específica.
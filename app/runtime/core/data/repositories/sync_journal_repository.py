@@ -0,0 +1,63 @@
+import datetime
+from sqlalchemy.dialects.sqlite import insert
+from core.data.models.orm_models import SyncJournal
+from core.data.repositories.base_repository import SessionRepository
+
+# Etapas registradas en el diario, en orden
+STAGE_EXTRACTED = "extracted"
+STAGE_ANALYZED = "analyzed"
+STAGE_PERSISTED = "persisted"
+# Archivo que superó los límites de extracción; se omite mientras no cambie
+STAGE_FAILED = "failed"
+
+class SyncJournalRepository(SessionRepository):
+    """
+    Repositorio del diario de sincronización: archivos persistidos y archivos que
+    superaron los límites de extracción. Dentro de una UnitOfWork, marcar 'persisted'
+    queda en la misma transacción que las filas de la versión. Los resultados de las
+    etapas intermedias (extracted, analyzed) no se guardan aquí sino en la caché de
+    etapas (ver cache_service.cache_stage_result).
+    """
+
+    def get_states(self) -> dict:
+        """Devuelve path -> (version_hash, stage) de todas las entradas del diario."""
+        rows = self.session.query(SyncJournal.path, SyncJournal.version_hash, SyncJournal.stage).all()
+        return {row[0]: (row[1], row[2]) for row in rows}
+
+    def mark(self, path: str, version_hash: str, stage: str, payload: dict = None):
+        """Registra que 'path' (con 'version_hash') completó 'stage'."""
+        statement = insert(SyncJournal).values(
+            path=path,
+            version_hash=version_hash,
+            stage=stage,
+            payload=payload,
+            updated_at=datetime.datetime.utcnow()
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[SyncJournal.path],
+            set_={
+                "version_hash": statement.excluded.version_hash,
+                "stage": statement.excluded.stage,
+                "payload": statement.excluded.payload,
+                "updated_at": statement.excluded.updated_at
+            }
+        )
+        self.session.execute(statement)
+        self._commit()
+
+    def delete_stages(self, stages):
+        """Elimina las entradas que están en alguna de 'stages' (p. ej. las ya persistidas)."""
+        self.session.query(SyncJournal).filter(
+            SyncJournal.stage.in_(list(stages))
+        ).delete(synchronize_session=False)
+        self._commit()
+
+    def delete_paths(self, paths):
+        """Elimina las entradas de las rutas indicadas."""
+        paths = list(paths)
+        for i in range(0, len(paths), 500):
+            self.session.query(SyncJournal).filter(
+                SyncJournal.path.in_(paths[i:i + 500])
+            ).delete(synchronize_session=False)
+        if paths:
+            self._commit()
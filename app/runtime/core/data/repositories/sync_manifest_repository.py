@@ -0,0 +1,83 @@
+import datetime
+from sqlalchemy.dialects.sqlite import insert
+from core.data.models.orm_models import SyncManifest
+from core.data.repositories.base_repository import SessionRepository
+
+# Entradas acumuladas antes de escribirlas en una sola transacción
+# (7 columnas por fila; se mantiene bajo el límite de 999 parámetros de SQLite antiguo)
+MANIFEST_FLUSH_SIZE = 100
+
+class SyncManifestRepository(SessionRepository):
+    """
+    Repositorio del manifiesto incremental de sincronización.
+    Las entradas nuevas se acumulan en memoria y se escriben por lotes con flush().
+    """
+
+    def __init__(self, unit_of_work=None):
+        super().__init__(unit_of_work)
+        self._pending = {}
+
+    def get_all(self) -> dict:
+        """
+        Carga el manifiesto completo en un diccionario:
+        path -> (size, mtime_ns, inode, unique_hash, version_hash)
+        """
+        rows = self.session.query(
+            SyncManifest.path,
+            SyncManifest.size,
+            SyncManifest.mtime_ns,
+            SyncManifest.inode,
+            SyncManifest.unique_hash,
+            SyncManifest.version_hash
+        ).all()
+        return {row[0]: tuple(row[1:]) for row in rows}
+
+    def record(self, path: str, stat_result, unique_hash: str, version_hash: str):
+        """Registra (de forma diferida) la firma y los hashes de un archivo sincronizado."""
+        self._pending[path] = {
+            "path": path,
+            "size": stat_result.st_size,
+            "mtime_ns": stat_result.st_mtime_ns,
+            "inode": str(stat_result.st_ino),
+            "unique_hash": unique_hash,
+            "version_hash": version_hash,
+            "updated_at": datetime.datetime.utcnow()
+        }
+        if len(self._pending) >= MANIFEST_FLUSH_SIZE:
+            self.flush()
+
+    def flush(self):
+        """Escribe las entradas pendientes con un único upsert por lote."""
+        if not self._pending:
+            return
+        statement = insert(SyncManifest).values(list(self._pending.values()))
+        statement = statement.on_conflict_do_update(
+            index_elements=[SyncManifest.path],
+            set_={
+                "size": statement.excluded.size,
+                "mtime_ns": statement.excluded.mtime_ns,
+                "inode": statement.excluded.inode,
+                "unique_hash": statement.excluded.unique_hash,
+                "version_hash": statement.excluded.version_hash,
+                "updated_at": statement.excluded.updated_at
+            }
+        )
+        try:
+            self.session.execute(statement)
+            self._commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        finally:
+            self._pending.clear()
+
+    def delete_paths(self, paths):
+        """Elimina del manifiesto las rutas indicadas (archivos que ya no existen)."""
+        paths = list(paths)
+        if not paths:
+            return
+        for i in range(0, len(paths), 500):
+            self.session.query(SyncManifest).filter(
+                SyncManifest.path.in_(paths[i:i + 500])
+            ).delete(synchronize_session=False)
+        self._commit()
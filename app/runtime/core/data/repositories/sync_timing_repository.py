@@ -0,0 +1,67 @@
+import datetime
+from sqlalchemy.dialects.sqlite import insert
+from core.data.models.orm_models import SyncStageTiming
+from core.data.repositories.base_repository import SessionRepository
+
+class SyncTimingRepository(SessionRepository):
+    """
+    Repositorio del historial de tiempos por etapa de la sincronización.
+    Las mediciones se acumulan en memoria y se suman a la tabla con flush().
+    """
+
+    def __init__(self, unit_of_work=None):
+        super().__init__(unit_of_work)
+        self._pending = {}
+
+    def record(self, stage: str, kind: str, seconds: float, size_bytes: int):
+        """Registra (de forma diferida) el tiempo de una etapa para un archivo."""
+        samples, total_seconds, total_bytes = self._pending.get((stage, kind), (0, 0.0, 0))
+        self._pending[(stage, kind)] = (samples + 1, total_seconds + seconds, total_bytes + size_bytes)
+
+    def flush(self):
+        """Suma las mediciones pendientes a los acumulados de la tabla."""
+        if not self._pending:
+            return
+        now = datetime.datetime.utcnow()
+        statement = insert(SyncStageTiming).values([
+            {
+                "stage": stage,
+                "kind": kind,
+                "samples": samples,
+                "total_seconds": total_seconds,
+                "total_bytes": total_bytes,
+                "updated_at": now
+            }
+            for (stage, kind), (samples, total_seconds, total_bytes) in self._pending.items()
+        ])
+        statement = statement.on_conflict_do_update(
+            index_elements=[SyncStageTiming.stage, SyncStageTiming.kind],
+            set_={
+                "samples": SyncStageTiming.samples + statement.excluded.samples,
+                "total_seconds": SyncStageTiming.total_seconds + statement.excluded.total_seconds,
+                "total_bytes": SyncStageTiming.total_bytes + statement.excluded.total_bytes,
+                "updated_at": statement.excluded.updated_at
+            }
+        )
+        try:
+            self.session.execute(statement)
+            self._commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        finally:
+            self._pending.clear()
+
+    def get_averages(self) -> dict:
+        """
+        Devuelve (stage, kind) -> (segundos por archivo, segundos por MB) según el historial.
+        """
+        averages = {}
+        for timing in self.session.query(SyncStageTiming).all():
+            if not timing.samples:
+                continue
+            per_file = timing.total_seconds / timing.samples
+            size_mb = timing.total_bytes / (1024 * 1024)
+            per_mb = timing.total_seconds / size_mb if size_mb else None
+            averages[(timing.stage, timing.kind)] = (per_file, per_mb)
+        return averages
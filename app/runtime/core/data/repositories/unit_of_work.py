@@ -0,0 +1,58 @@
+from config.database import get_db_session
+from core.data.repositories.version_repository import VersionRepository
+from core.data.repositories.analyzed_content_repository import AnalyzedContentRepository
+from core.data.repositories.legal_calendar_repository import LegalCalendarRepository
+from core.data.repositories.spelling_error_repository import SpellingErrorRepository
+from core.data.repositories.sync_journal_repository import SyncJournalRepository
+
+class UnitOfWork:
+    """
+    Agrupa las escrituras de uno o varios documentos en una sola transacción.
+
+    Uso:
+        with UnitOfWork() as uow:
+            version = uow.versions.add_version(...)
+            uow.spelling.create_errors(words, version.id)
+
+    Al salir sin errores se hace un único commit (un solo fsync en SQLite);
+    si ocurre una excepción se revierte todo.
+    """
+
+    def __init__(self):
+        self.session = get_db_session()
+        self._after_commit = []
+
+        self.versions = VersionRepository(unit_of_work=self)
+        self.analyzed = AnalyzedContentRepository(unit_of_work=self)
+        self.calendar = LegalCalendarRepository(unit_of_work=self)
+        self.spelling = SpellingErrorRepository(unit_of_work=self)
+        self.journal = SyncJournalRepository(unit_of_work=self)
+
+    def after_commit(self, callback):
+        """Registra una acción (p. ej. cachear) que se ejecutará tras el commit."""
+        self._after_commit.append(callback)
+
+    def commit(self):
+        self.session.commit()
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            callback()
+
+    def rollback(self):
+        self.session.rollback()
+        self._after_commit.clear()
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None:
+                self.commit()
+            else:
+                self.rollback()
+        finally:
+            self.close()
@@ -1,6 +1,5 @@
-from sqlalchemy.orm import Session
 from core.data.models.orm_models import Version
-from config.database import get_db_session
+from core.data.repositories.base_repository import SessionRepository
 from core.data.services.cache_service import (
     get_cached_version_by_id,
     get_cached_versions_by_document_id,
@@ -8,10 +7,7 @@ from core.data.services.cache_service import (
     cache_version
 )
 
-class VersionRepository:
-    def __init__(self):
-        self.session: Session = get_db_session()
-
+class VersionRepository(SessionRepository):
     def get_version_by_hash(self, file_hash: str):
         """Busca una versión de documento por su hash de archivo."""
         # Este método va directo a la BD por ser una búsqueda menos común
@@ -20,6 +16,25 @@ class VersionRepository:
             cache_version(version)  # Cachear para futuras consultas
         return version
 
+    def get_version_by_id(self, version_id: int):
+        """Obtiene una versión por su ID."""
+        cached_version = get_cached_version_by_id(version_id)
+        if cached_version:
+            return Version(**cached_version)
+
+        # No se cachea aquí: cache_version también la añadiría a la lista del documento
+        return self.session.get(Version, version_id)
+
+    def get_document_ids_by_blob(self, blob_hash: str) -> list:
+        """IDs de los documentos con alguna versión guardada en el blob 'blob_hash'."""
+        rows = (
+            self.session.query(Version.document_id)
+            .filter(Version.blob_hash == blob_hash)
+            .distinct()
+            .all()
+        )
+        return [document_id for document_id, in rows]
+
     def get_latest_version_by_document_id(self, document_id: int):
         """Obtiene la versión más reciente de un documento dado."""
         # Intentar obtener de la caché primero
@@ -57,8 +72,27 @@ class VersionRepository:
             cache_version(version)
         return versions
 
-    def add_version(self, document_id, version_tag, file_path, file_hash, author_id, comment, size_mb):
-        """Crea una nueva versión del documento."""
+    def get_latest_hashes(self) -> dict:
+        """Devuelve document_id -> file_hash de la versión más reciente de cada documento."""
+        rows = (
+            self.session.query(Version.document_id, Version.file_hash)
+            .order_by(Version.updated_at.asc(), Version.id.asc())
+            .all()
+        )
+        # Al recorrer en orden ascendente, la última versión de cada documento prevalece
+        return {document_id: file_hash for document_id, file_hash in rows}
+
+    def get_storage_references(self) -> list:
+        """(id, document_id, file_path, blob_hash) de todas las versiones, para revisar el almacén."""
+        return (
+            self.session.query(Version.id, Version.document_id, Version.file_path, Version.blob_hash)
+            .order_by(Version.id.asc())
+            .all()
+        )
+
+    def add_version(self, document_id, version_tag, file_path, file_hash, author_id, comment, size_mb,
+                    blob_hash=None):
+        """Crea una nueva versión del documento ('blob_hash': su archivo en el almacén de blobs)."""
         new_version = Version(
             document_id=document_id,
             version_tag=version_tag,
@@ -66,10 +100,9 @@ class VersionRepository:
             file_hash=file_hash,
             author_id=author_id,
             comment=comment,
-            size_mb=size_mb
+            size_mb=size_mb,
+            blob_hash=blob_hash
         )
         self.session.add(new_version)
-        self.session.commit()
-        self.session.refresh(new_version)
-        cache_version(new_version)  # Cachear la nueva versión
+        self._commit(on_commit=lambda: cache_version(new_version))  # Cachear la nueva versión
         return new_version
\ No newline at end of file
@@ -0,0 +1,90 @@
+# /app/runtime/core/data/services/blob_compression.py
+from config.config import get_version_store_compression, get_version_store_compression_level
+
+# Compresiones disponibles para los blobs del almacén de versiones
+COMPRESSION_AUTO = "auto"
+COMPRESSION_ZSTD = "zstd"
+COMPRESSION_OFF = "off"
+
+# Sufijo de los blobs comprimidos con zstd
+ZSTD_SUFFIX = ".zst"
+
+# Los archivos más pequeños no se comprimen: el ahorro no compensa
+COMPRESSION_MIN_SIZE = 64 * 1024
+
+# Bytes del inicio del archivo que se comprimen de prueba para decidir si vale la pena.
+# Los DOCX (ya son ZIP) y las imágenes JPEG no se comprimen: se descartan leyendo solo esto.
+COMPRESSION_SAMPLE_SIZE = 256 * 1024
+
+# Un archivo se guarda comprimido solo si ocupa como máximo esta fracción del original
+COMPRESSION_MAX_RATIO = 0.9
+
+# Tamaño de cada lectura y escritura al comprimir y descomprimir en flujo
+STREAM_BLOCK_SIZE = 1024 * 1024
+
+_compression_warned = False
+
+def get_zstd():
+    """
+    Devuelve el módulo zstandard si la compresión configurada en VERSION_STORE_COMPRESSION
+    lo usa, o None si está desactivada. Con 'auto' se usa zstd si está instalado.
+    """
+    global _compression_warned
+    name = get_version_store_compression()
+    if name == COMPRESSION_OFF:
+        return None
+    if name not in (COMPRESSION_AUTO, COMPRESSION_ZSTD):
+        raise ValueError(
+            f"❌ Compresión desconocida: {name} "
+            f"(opciones: {COMPRESSION_AUTO}, {COMPRESSION_ZSTD}, {COMPRESSION_OFF})"
+        )
+    try:
+        import zstandard
+    except ImportError as e:
+        if name == COMPRESSION_ZSTD:
+            raise
+        if not _compression_warned:
+            print(f"⚠️ zstandard no disponible ({e}); las versiones se guardan sin comprimir")
+            _compression_warned = True
+        return None
+    return zstandard
+
+def should_compress(file_path, size: int, zstd, level: int = None) -> bool:
+    """
+    Indica si vale la pena comprimir el archivo: no es demasiado pequeño y una muestra de
+    su inicio se reduce al menos hasta COMPRESSION_MAX_RATIO.
+    """
+    if size < COMPRESSION_MIN_SIZE:
+        return False
+    with open(file_path, "rb") as f:
+        sample = f.read(COMPRESSION_SAMPLE_SIZE)
+    if not sample:
+        return False
+    level = level or get_version_store_compression_level()
+    compressed = zstd.ZstdCompressor(level=level).compress(sample)
+    return len(compressed) <= len(sample) * COMPRESSION_MAX_RATIO
+
+def compress_file(src_file_path, dst_file_path, zstd, level: int = None) -> int:
+    """Comprime el archivo con zstd en flujo (sin cargarlo en memoria) y retorna el tamaño resultante."""
+    level = level or get_version_store_compression_level()
+    compressor = zstd.ZstdCompressor(level=level)
+    with open(src_file_path, "rb") as src, open(dst_file_path, "wb") as dst:
+        compressor.copy_stream(src, dst, read_size=STREAM_BLOCK_SIZE, write_size=STREAM_BLOCK_SIZE)
+        return dst.tell()
+
+def is_compressed(path) -> bool:
+    return str(path).endswith(ZSTD_SUFFIX)
+
+def open_decompressed(path):
+    """
+    Abre un blob para leer su contenido original en flujo: los .zst se descomprimen a
+    medida que se leen (nunca se cargan completos en memoria). Para leer un blob
+    comprimido hace falta zstandard aunque la compresión ya no esté activada.
+    """
+    if not is_compressed(path):
+        return open(path, "rb")
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError(f"❌ Se necesita zstandard para leer el blob comprimido {path}: {e}") from e
+    return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), read_size=STREAM_BLOCK_SIZE)
@@ -0,0 +1,381 @@
+# /app/runtime/core/data/services/blob_store.py
+import os
+import hashlib
+import threading
+from pathlib import Path
+from config.file_store import get_documents_directory, get_blobs_directory, get_restored_directory
+from core.data.services.file_copy_service import clone_file
+from core.data.services.delta_codec import create_delta, apply_delta, read_delta_header, DeltaError
+from core.data.services.blob_compression import (
+    ZSTD_SUFFIX,
+    COMPRESSION_MAX_RATIO,
+    STREAM_BLOCK_SIZE,
+    get_zstd,
+    should_compress,
+    compress_file,
+    open_decompressed
+)
+
+# Sufijo de los blobs guardados como delta respecto de otro blob
+DELTA_SUFFIX = ".delta"
+
+# Formas en que se guarda un contenido, por sufijo: completo o como delta, y cada uno
+# sin comprimir o comprimido con zstd (se busca en este orden)
+FULL_SUFFIXES = ("", ZSTD_SUFFIX)
+DELTA_SUFFIXES = (DELTA_SUFFIX, DELTA_SUFFIX + ZSTD_SUFFIX)
+
+# Un delta se conserva solo si ocupa como máximo esta fracción del blob completo
+DELTA_MAX_RATIO = 0.5
+
+# Archivos temporales de una escritura en curso (o interrumpida) en el almacén
+TEMP_SUFFIX = ".tmp"
+
+HASH_LENGTH = 64
+HEX_DIGITS = frozenset("0123456789abcdef")
+
+class BlobStoreError(Exception):
+    """El archivo cambió mientras se guardaba: su contenido ya no corresponde a su hash."""
+
+def blob_path(content_hash: str) -> Path:
+    """
+    Ruta del blob de un contenido: /<documents_directory>/blobs/<ab>/<hash>, donde <ab>
+    son los dos primeros caracteres del hash (evita directorios con millones de archivos).
+    """
+    return get_blobs_directory() / content_hash[:2] / content_hash
+
+def delta_path(content_hash: str) -> Path:
+    """Ruta del blob de un contenido cuando está guardado como delta sin comprimir."""
+    return blob_path(content_hash).with_name(content_hash + DELTA_SUFFIX)
+
+def _find(content_hash: str, suffixes) -> Path:
+    for suffix in suffixes:
+        path = blob_path(content_hash).with_name(content_hash + suffix)
+        if path.exists():
+            return path
+    return None
+
+def find_full_blob(content_hash: str) -> Path:
+    """Ruta del blob completo del contenido (sin comprimir o .zst), o None si no lo hay."""
+    return _find(content_hash, FULL_SUFFIXES)
+
+def find_delta(content_hash: str) -> Path:
+    """Ruta del delta del contenido (sin comprimir o .zst), o None si no lo hay."""
+    return _find(content_hash, DELTA_SUFFIXES)
+
+def has_blob(content_hash: str) -> bool:
+    """Indica si el contenido está en el almacén, completo o como delta."""
+    return find_full_blob(content_hash) is not None or find_delta(content_hash) is not None
+
+def is_delta(content_hash: str) -> bool:
+    """Indica si el contenido está guardado solo como delta."""
+    return find_full_blob(content_hash) is None and find_delta(content_hash) is not None
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def _temp_path(path: Path) -> Path:
+    # Con el hilo: varios hilos pueden reconstruir a la vez la misma base (ver hash_stored_content)
+    return path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}{TEMP_SUFFIX}")
+
+def is_temp_file(path) -> bool:
+    """Indica si es el archivo temporal de una escritura en el almacén (ver _temp_path)."""
+    name = Path(path).name
+    return name.startswith(".") and name.endswith(TEMP_SUFFIX)
+
+def parse_blob_name(name: str):
+    """
+    Retorna (hash, sufijo) si 'name' es el nombre de un blob del almacén (p. ej.
+    '<hash>.delta.zst' -> ('<hash>', '.delta.zst')), o None si no lo es.
+    """
+    content_hash, suffix = name[:HASH_LENGTH], name[HASH_LENGTH:]
+    if len(content_hash) != HASH_LENGTH or not HEX_DIGITS.issuperset(content_hash):
+        return None
+    if suffix not in FULL_SUFFIXES + DELTA_SUFFIXES:
+        return None
+    return content_hash, suffix
+
+def iter_store_files():
+    """
+    Recorre el almacén de blobs y produce (ruta, hash, sufijo) por cada archivo. Los que
+    no son blobs (temporales, u otros) se producen con hash y sufijo None.
+    """
+    blobs_dir = get_blobs_directory()
+    with os.scandir(blobs_dir) as prefixes:
+        for prefix in prefixes:
+            if not prefix.is_dir(follow_symlinks=False):
+                yield Path(prefix.path), None, None
+                continue
+            with os.scandir(prefix.path) as entries:
+                for entry in entries:
+                    parsed = parse_blob_name(entry.name)
+                    if parsed is None or parsed[0][:2] != prefix.name:
+                        yield Path(entry.path), None, None
+                    else:
+                        yield Path(entry.path), parsed[0], parsed[1]
+
+def get_delta_base(content_hash: str) -> str:
+    """Hash de la base del delta guardado para 'content_hash' (lanza FileNotFoundError si no hay delta)."""
+    delta = find_delta(content_hash)
+    if delta is None:
+        raise FileNotFoundError(f"❌ El contenido {content_hash} no está guardado como delta")
+    with open_decompressed(delta) as f:
+        base_hash, _ = read_delta_header(f)
+    return base_hash
+
+def store_blob(src_file_path, content_hash: str, stat_result=None) -> Path:
+    """
+    Guarda el archivo en el almacén direccionado por contenido y retorna la ruta del blob.
+
+    Si el contenido ya está almacenado (otra versión u otro documento con los mismos bytes)
+    no se copia nada. Si la compresión está activada (VERSION_STORE_COMPRESSION) y el
+    archivo se comprime lo suficiente, se guarda como <hash>.zst. Si no, se clona con
+    reflink o enlace duro cuando el sistema de archivos lo permite (ver clone_file) o se
+    copia. En ambos casos se escribe primero un archivo temporal que se renombra al
+    terminar, de modo que nunca queda un blob a medias.
+
+    Con 'stat_result' (el stat con el que se calculó 'content_hash') se comprueba que el
+    archivo no cambió durante la copia; si cambió se lanza BlobStoreError y no se guarda.
+    """
+    existing = find_full_blob(content_hash)
+    if existing is not None:
+        print(f"♻️ Contenido ya almacenado, se reutiliza: {existing.name[:12]}")
+        return existing
+
+    path = blob_path(content_hash)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = _temp_path(path)
+    try:
+        target = None
+        zstd = get_zstd()
+        if zstd is not None:
+            size = stat_result.st_size if stat_result is not None else os.path.getsize(src_file_path)
+            if should_compress(src_file_path, size, zstd):
+                if compress_file(src_file_path, temp_path, zstd) <= size * COMPRESSION_MAX_RATIO:
+                    target = path.with_name(content_hash + ZSTD_SUFFIX)
+                else:
+                    _remove(temp_path)
+        if target is None:
+            clone_file(src_file_path, temp_path)
+            target = path
+
+        if stat_result is not None:
+            current = os.stat(src_file_path)
+            if (current.st_size, current.st_mtime_ns) != (stat_result.st_size, stat_result.st_mtime_ns):
+                raise BlobStoreError(f"❌ El archivo cambió mientras se guardaba: {src_file_path}")
+        os.replace(temp_path, target)
+    except BaseException:
+        _remove(temp_path)
+        raise
+    # El contenido vuelve a estar completo (p. ej. se restauró una versión antigua)
+    for suffix in DELTA_SUFFIXES:
+        _remove(path.with_name(content_hash + suffix))
+    return target
+
+class _HashingWriter:
+    """Destino de escritura que calcula el SHA-256 de lo escrito y, si hay 'out', lo reenvía."""
+
+    def __init__(self, out=None):
+        self.out = out
+        self.sha256 = hashlib.sha256()
+
+    def write(self, data):
+        self.sha256.update(data)
+        if self.out is not None:
+            self.out.write(data)
+
+def _write_content(content_hash: str, out, scratch: bool = False) -> str:
+    """
+    Escribe en el archivo abierto 'out' el contenido completo de 'content_hash', en flujo:
+    descomprime el blob o aplica su delta (materializando antes la base si hace falta).
+    Retorna el SHA-256 de lo escrito (con 'out' None solo se calcula). Lanza
+    FileNotFoundError si no está en el almacén.
+
+    Con 'scratch' la base no se materializa en el directorio de versiones restauradas:
+    se reconstruye en un temporal que se borra al terminar (ver _scratch_copy).
+    """
+    writer = _HashingWriter(out)
+    full = find_full_blob(content_hash)
+    if full is not None:
+        with open_decompressed(full) as src:
+            while True:
+                block = src.read(STREAM_BLOCK_SIZE)
+                if not block:
+                    break
+                writer.write(block)
+        return writer.sha256.hexdigest()
+
+    delta = find_delta(content_hash)
+    if delta is None:
+        raise FileNotFoundError(f"❌ El contenido {content_hash} no está en el almacén")
+    with open_decompressed(delta) as f:
+        base_hash, target_size = read_delta_header(f)
+        if not scratch:
+            apply_delta(materialize_blob(base_hash), f, writer, target_size)
+        elif blob_path(base_hash).exists():
+            apply_delta(blob_path(base_hash), f, writer, target_size)
+        else:
+            base = _scratch_copy(base_hash)
+            try:
+                apply_delta(base, f, writer, target_size)
+            finally:
+                _remove(base)
+    return writer.sha256.hexdigest()
+
+def _scratch_copy(content_hash: str) -> Path:
+    """
+    Reconstruye el contenido completo de 'content_hash' en un temporal del directorio de
+    versiones restauradas y retorna su ruta; quien lo pide debe borrarlo. Las bases
+    intermedias de una cadena de deltas se borran en cuanto se usan, así que como mucho
+    hay dos copias completas a la vez.
+    """
+    temp_path = _temp_path(get_restored_directory() / content_hash)
+    try:
+        with open(temp_path, "wb") as out:
+            _write_content(content_hash, out, scratch=True)
+    except BaseException:
+        _remove(temp_path)
+        raise
+    return temp_path
+
+def hash_stored_content(content_hash: str) -> str:
+    """
+    Lee el contenido guardado de 'content_hash' (descomprimiéndolo o aplicando su delta) y
+    retorna su SHA-256, que debe coincidir con 'content_hash'. No deja copias en disco: las
+    bases de un delta que no están completas y sin comprimir se reconstruyen en temporales
+    que se borran al terminar.
+    """
+    return _write_content(content_hash, None, scratch=True)
+
+def restore_blob(content_hash: str, destination) -> Path:
+    """
+    Escribe el contenido completo de 'content_hash' en 'destination' (a través de un
+    archivo temporal que se renombra al terminar) y comprueba que coincide con su hash.
+    """
+    destination = Path(destination)
+    temp_path = _temp_path(destination)
+    try:
+        with open(temp_path, "wb") as out:
+            digest = _write_content(content_hash, out)
+        if digest != content_hash:
+            raise DeltaError(f"❌ La reconstrucción de {content_hash[:12]} no coincide con su hash")
+        os.replace(temp_path, destination)
+    except BaseException:
+        _remove(temp_path)
+        raise
+    return destination
+
+def materialize_blob(content_hash: str) -> Path:
+    """
+    Retorna la ruta de un archivo sin comprimir con el contenido completo de 'content_hash'.
+    Si está comprimido o guardado como delta se reconstruye (aplicando antes, si hace falta,
+    los deltas de su base) en el directorio de versiones restauradas, donde se reutiliza en
+    las siguientes llamadas. Lanza FileNotFoundError si el contenido no está en el almacén.
+    """
+    path = blob_path(content_hash)
+    if path.exists():
+        return path
+    if not has_blob(content_hash):
+        raise FileNotFoundError(f"❌ El contenido {content_hash} no está en el almacén")
+
+    restored = get_restored_directory() / content_hash
+    if restored.exists():
+        return restored
+    return restore_blob(content_hash, restored)
+
+def legacy_relative_path(file_path) -> str:
+    """
+    Ruta de un archivo de versión anterior al almacén de blobs relativa al directorio de
+    documentos: '<document_id>/<archivo>'. La BD guarda rutas absolutas, que dejan de
+    coincidir si los datos se copian a otra máquina o a otro usuario; esta parte no cambia.
+    Se aceptan separadores de Windows y POSIX.
+    """
+    parts = [part for part in str(file_path).replace("\\", "/").split("/") if part]
+    return "/".join(parts[-2:])
+
+def resolve_legacy_file(file_path) -> Path:
+    """
+    Archivo de una versión anterior al almacén de blobs: su ruta guardada si existe o, si
+    no, '<document_id>/<archivo>' dentro del directorio de documentos actual. Retorna None
+    si no está en ninguno de los dos sitios.
+    """
+    if not file_path:
+        return None
+    path = Path(file_path)
+    if path.is_file():
+        return path
+    relative = legacy_relative_path(file_path)
+    if not relative:
+        return None
+    path = get_documents_directory().joinpath(*relative.split("/"))
+    return path if path.is_file() else None
+
+def materialize_version_file(file_path, blob_hash: str = None) -> Path:
+    """
+    Ruta legible del archivo de una versión (Version.file_path y Version.blob_hash).
+    Las versiones anteriores al almacén de blobs (sin blob_hash) se leen de su ruta (ver
+    resolve_legacy_file). Las del almacén se leen siempre por su hash: 'file_path' puede
+    apuntar a un blob que ya se comprimió o se guardó como delta.
+    """
+    if not blob_hash:
+        path = resolve_legacy_file(file_path)
+        if path is None:
+            raise FileNotFoundError(f"❌ No se encontró el archivo de la versión: {file_path}")
+        return path
+    return materialize_blob(blob_hash)
+
+def compact_blob(content_hash: str, base_hash: str) -> bool:
+    """
+    Reemplaza el blob completo de 'content_hash' por un delta respecto del blob completo
+    de 'base_hash' (normalmente, la versión siguiente del mismo documento). Antes de borrar
+    el blob completo se comprueba que el delta lo reconstruye exactamente. El delta se
+    comprime si la compresión está activada y lo reduce. Si no ocupa como mucho la mitad
+    que el blob guardado, se descarta y el blob queda como estaba.
+    Retorna True si el blob se guardó como delta.
+    """
+    full = find_full_blob(content_hash)
+    if content_hash == base_hash or full is None or find_full_blob(base_hash) is None:
+        return False
+
+    target = delta_path(content_hash)
+    temp_path = _temp_path(target)
+    compressed_path = _temp_path(target.with_name(target.name + ZSTD_SUFFIX))
+    # Las copias descomprimidas que solo hacen falta para calcular el delta se borran al final
+    scratch = []
+    try:
+        readable = {}
+        for blob_hash in (base_hash, content_hash):
+            readable[blob_hash] = blob_path(blob_hash)
+            if not readable[blob_hash].exists():
+                readable[blob_hash] = _temp_path(get_restored_directory() / blob_hash)
+                scratch.append(readable[blob_hash])
+                restore_blob(blob_hash, readable[blob_hash])
+        base = readable[base_hash]
+
+        stored_size = full.stat().st_size
+        delta_size = create_delta(base, base_hash, readable[content_hash], temp_path)
+        check = _HashingWriter()
+        with open(temp_path, "rb") as f:
+            apply_delta(base, f, check)
+        if check.sha256.hexdigest() != content_hash:
+            raise DeltaError(f"❌ El delta de {content_hash[:12]} no reconstruye el contenido original")
+
+        zstd = get_zstd()
+        if zstd is not None and should_compress(temp_path, delta_size, zstd):
+            compressed_size = compress_file(temp_path, compressed_path, zstd)
+            if compressed_size <= delta_size * COMPRESSION_MAX_RATIO:
+                os.replace(compressed_path, temp_path)
+                target = target.with_name(target.name + ZSTD_SUFFIX)
+                delta_size = compressed_size
+
+        if delta_size > stored_size * DELTA_MAX_RATIO:
+            return False
+        os.replace(temp_path, target)
+    finally:
+        for path in [temp_path, compressed_path] + scratch:
+            _remove(path)
+    os.remove(full)
+    print(f"🗜️ Versión {content_hash[:12]} guardada como delta: {stored_size} -> {delta_size} bytes")
+    return True
@@ -1,7 +1,7 @@
 from diskcache import Cache
 from pathlib import Path
 import threading
-from config.config import get_base_directory
+from config.config import get_base_directory, get_ocr_cache_size_mb
 import json
 from datetime import datetime
 
@@ -17,6 +17,33 @@ analyzed_cache = Cache(str(CACHE_DIR / "analyzed"))
 spelling_cache = Cache(str(CACHE_DIR / "spelling"))
 suggestions_cache = Cache(str(CACHE_DIR / "suggestions"))
 
+# Caché de resultados de OCR direccionada por contenido. No se limpia con clear_all_caches():
+# sus claves dependen solo de la imagen y de la configuración del OCR, no de la BD.
+ocr_cache = Cache(
+    str(CACHE_DIR / "ocr"),
+    size_limit=get_ocr_cache_size_mb() * 1024 * 1024,
+    eviction_policy="least-recently-used"
+)
+
+# Contadores acumulados del OCR de PDF por pasada (fija, baja y alta resolución). Tampoco
+# se limpia con clear_all_caches(): mide el tiempo del OCR a lo largo de todo el archivo.
+ocr_stats_cache = Cache(str(CACHE_DIR / "ocr_stats"))
+
+# Huella rápida y SHA-256 del último contenido leído de cada ruta (ver hash_service).
+# Depende solo del contenido de los archivos, por lo que tampoco la limpia clear_all_caches().
+fingerprint_cache = Cache(str(CACHE_DIR / "fingerprints"))
+
+# Resultados parciales de la sincronización (texto extraído y análisis) por versión de
+# archivo, para retomar un archivo tras una interrupción sin repetir el trabajo hecho (ver
+# SyncRun). Se guardan aquí y no en sync_journal: así no se duplica el texto en la BD ni se
+# confirma una transacción de SQLite por etapa. Se borran al persistir la versión; lo que
+# quede de archivos que nunca se completaron se descarta por antigüedad al llenarse.
+stage_cache = Cache(str(CACHE_DIR / "stages"))
+
+# Punto de control de la verificación del almacén de versiones (ver storage_maintenance_use_case).
+# No se limpia con clear_all_caches(): permite retomar una verificación interrumpida.
+storage_cache = Cache(str(CACHE_DIR / "storage"))
+
 def datetime_handler(obj):
     """Handler para serializar objetos datetime"""
     if isinstance(obj, datetime):
@@ -58,6 +85,7 @@ def cache_version(version):
         "author_id": version.author_id,
         "comment": version.comment,
         "size_mb": float(version.size_mb) if version.size_mb else 0.0,
+        "blob_hash": version.blob_hash,
         "updated_at": json.dumps(version.updated_at, default=datetime_handler)
     }
     # Guardar la versión individual
@@ -166,3 +194,84 @@ def cache_word_suggestions(word: str, suggestions: list):
 def get_cached_word_suggestions(word: str):
     """Obtiene las sugerencias cacheadas para una palabra"""
     return suggestions_cache.get(f"word:{word}")
+
+# Métodos para OCR
+def cache_ocr_text(key: str, text: str):
+    """Guarda el texto reconocido para una imagen (clave generada por ocr_cache_key)"""
+    ocr_cache[f"ocr:{key}"] = text
+    return text
+
+def get_cached_ocr_text(key: str):
+    """Obtiene el texto reconocido de una imagen, o None si no está en caché"""
+    return ocr_cache.get(f"ocr:{key}")
+
+def cache_ocr_confidence(key: str, confidence: float):
+    """Guarda la confianza media del OCR de una imagen (misma clave que su texto)"""
+    ocr_cache[f"conf:{key}"] = confidence
+    return confidence
+
+def get_cached_ocr_confidence(key: str):
+    """Obtiene la confianza media del OCR de una imagen, o None si no está en caché"""
+    return ocr_cache.get(f"conf:{key}")
+
+def record_ocr_pass(pass_name: str, pages: int, cached_pages: int, seconds: float):
+    """
+    Suma al contador de una pasada de OCR las páginas procesadas, las que se tomaron de la
+    caché y el tiempo empleado. Los incrementos son atómicos entre procesos.
+    """
+    ocr_stats_cache.incr(f"{pass_name}:pages", pages)
+    ocr_stats_cache.incr(f"{pass_name}:cached", cached_pages)
+    ocr_stats_cache.incr(f"{pass_name}:ms", int(round(seconds * 1000)))
+
+def get_ocr_pass_stats(pass_name: str) -> dict:
+    """Obtiene los contadores acumulados de una pasada de OCR"""
+    return {
+        "pages": ocr_stats_cache.get(f"{pass_name}:pages", 0),
+        "cached_pages": ocr_stats_cache.get(f"{pass_name}:cached", 0),
+        "seconds": ocr_stats_cache.get(f"{pass_name}:ms", 0) / 1000,
+    }
+
+def clear_ocr_stats():
+    """Reinicia los contadores del OCR"""
+    ocr_stats_cache.clear()
+
+# Métodos para las huellas de contenido
+def cache_content_fingerprint(path: str, size: int, fingerprint: str, content_hash: str):
+    """Guarda la huella rápida y el SHA-256 del contenido actual de un archivo"""
+    fingerprint_cache[f"path:{path}"] = (size, fingerprint, content_hash)
+    return content_hash
+
+def get_cached_content_fingerprint(path: str):
+    """Obtiene (tamaño, huella, SHA-256) del último contenido leído de un archivo, o None"""
+    return fingerprint_cache.get(f"path:{path}")
+
+def clear_content_fingerprint(path: str):
+    """Descarta la huella guardada de un archivo: su próxima lectura se trata como contenido nuevo"""
+    fingerprint_cache.delete(f"path:{path}")
+
+# Métodos para los resultados parciales de la sincronización
+def cache_stage_result(version_hash: str, stage: str, result):
+    """Guarda el resultado de una etapa (extracted, analyzed) de una versión de archivo"""
+    stage_cache[f"{version_hash}:{stage}"] = result
+
+def get_cached_stage_result(version_hash: str, stage: str):
+    """Obtiene el resultado guardado de una etapa de una versión de archivo, o None"""
+    return stage_cache.get(f"{version_hash}:{stage}")
+
+def clear_stage_results(version_hash: str, stages):
+    """Descarta los resultados parciales de una versión de archivo ya persistida"""
+    for stage in stages:
+        stage_cache.delete(f"{version_hash}:{stage}")
+
+# Métodos para el punto de control de la verificación del almacén
+def save_verify_checkpoint(state: dict):
+    """Guarda el avance de la verificación del almacén"""
+    storage_cache["verify:checkpoint"] = state
+
+def get_verify_checkpoint():
+    """Obtiene el avance guardado de una verificación interrumpida, o None"""
+    return storage_cache.get("verify:checkpoint")
+
+def clear_verify_checkpoint():
+    """Descarta el avance guardado de la verificación del almacén"""
+    storage_cache.delete("verify:checkpoint")
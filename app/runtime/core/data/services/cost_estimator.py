@@ -0,0 +1,106 @@
+# /app/runtime/core/data/services/cost_estimator.py
+from pathlib import Path
+from zipfile import ZipFile, BadZipFile
+from core.data.services.extractor_registry import get_extractor
+from core.data.services.extractors.pdf_text_backends import get_pdf_text_backend, PdfTextLayerError
+
+# Segundos aproximados por unidad de trabajo. Solo se usan para ordenar y
+# clasificar documentos, no para prometer tiempos exactos.
+BASE_SECONDS = 0.5              # Metadatos, ortografía y NER de un documento corto
+TEXT_SECONDS_PER_PAGE = 0.05    # Extracción de la capa de texto de un PDF
+TEXT_SECONDS_PER_MB = 0.5       # Extracción de texto de un DOCX, ODT, RTF o TXT
+OCR_SECONDS_PER_PAGE = 4.0      # Rasterizado + Tesseract de una página
+OCR_SECONDS_PER_IMAGE = 2.0     # Tesseract de una imagen incrustada o suelta
+
+# Carpeta de las imágenes incrustadas en los formatos comprimidos
+EMBEDDED_IMAGE_FOLDERS = {".docx": "word/media/", ".odt": "Pictures/"}
+
+# Tamaño aproximado de una página de PDF cuando no se pueden contar
+BYTES_PER_PDF_PAGE = 100 * 1024
+
+# Páginas que se revisan para decidir si un PDF tiene capa de texto
+TEXT_LAYER_SAMPLE_PAGES = 2
+MIN_TEXT_CHARS = 10
+
+def file_kind(file_path, needs_ocr: bool) -> str:
+    """Tipo de archivo con el que se agrupan los tiempos históricos (p. ej. 'pdf-ocr')."""
+    kind = Path(file_path).suffix.lower().lstrip(".") or "otro"
+    return f"{kind}-ocr" if needs_ocr else kind
+
+def count_pdf_pages(file_path) -> int:
+    """Cuenta las páginas de un PDF recorriendo su árbol de páginas (sin extraer texto)."""
+    return get_pdf_text_backend().count_pages(file_path)
+
+def pdf_has_text_layer(file_path) -> bool:
+    """Revisa las primeras páginas para saber si el PDF tiene texto seleccionable."""
+    try:
+        pages = get_pdf_text_backend().read_pages(file_path, max_pages=TEXT_LAYER_SAMPLE_PAGES)
+    except PdfTextLayerError:
+        return False
+    return len("".join(page.text for page in pages).strip()) >= MIN_TEXT_CHARS
+
+def count_embedded_images(file_path, folder: str) -> int:
+    """Cuenta las imágenes incrustadas en un DOCX u ODT (las que requerirían OCR)."""
+    try:
+        with ZipFile(file_path, "r") as archive:
+            return sum(1 for name in archive.namelist() if name.startswith(folder))
+    except BadZipFile:
+        return 0
+
+def estimate_cost(file_path, size_bytes: int = None) -> dict:
+    """
+    Estima el costo de procesar un archivo a partir de su tamaño, número de páginas
+    y presencia de capa de texto.
+
+    Retorna un diccionario con:
+      - "cost_seconds": Estimación del tiempo de procesamiento.
+      - "pages": Número de páginas (None si no aplica o no se pudo leer).
+      - "needs_ocr": True si el documento depende de OCR.
+    """
+    ext = Path(file_path).suffix.lower()
+    if size_bytes is None:
+        size_bytes = Path(file_path).stat().st_size
+    size_mb = size_bytes / (1024 * 1024)
+
+    if ext == ".pdf":
+        try:
+            pages = count_pdf_pages(file_path)
+        except Exception:
+            pages = None
+        needs_ocr = not pdf_has_text_layer(file_path)
+        # Si no se pudo contar, se aproxima ~100 KB por página
+        page_estimate = pages if pages else max(1, int(size_bytes / BYTES_PER_PDF_PAGE))
+        per_page = OCR_SECONDS_PER_PAGE if needs_ocr else TEXT_SECONDS_PER_PAGE
+        return {
+            "cost_seconds": BASE_SECONDS + page_estimate * per_page,
+            "pages": pages,
+            "needs_ocr": needs_ocr
+        }
+
+    extractor = get_extractor(file_path)
+    if extractor is not None and extractor.needs_ocr:
+        # Imagen suelta: todo su texto sale del OCR
+        return {"cost_seconds": BASE_SECONDS + OCR_SECONDS_PER_IMAGE, "pages": None, "needs_ocr": True}
+
+    folder = EMBEDDED_IMAGE_FOLDERS.get(ext)
+    images = count_embedded_images(file_path, folder) if folder else 0
+    return {
+        "cost_seconds": BASE_SECONDS + size_mb * TEXT_SECONDS_PER_MB + images * OCR_SECONDS_PER_IMAGE,
+        "pages": None,
+        "needs_ocr": images > 0
+    }
+
+def estimate_cost_from_size(file_path, size_bytes: int) -> dict:
+    """
+    Estimación sin abrir el archivo, solo por su extensión y tamaño: se usa cuando
+    estimate_cost falla o supera los límites del proceso aislado. Se supone que los PDF
+    tienen capa de texto (no se difieren) y que las imágenes sueltas requieren OCR.
+    """
+    if Path(file_path).suffix.lower() == ".pdf":
+        pages = max(1, int(size_bytes / BYTES_PER_PDF_PAGE))
+        return {"cost_seconds": BASE_SECONDS + pages * TEXT_SECONDS_PER_PAGE, "pages": None, "needs_ocr": False}
+    extractor = get_extractor(file_path)
+    if extractor is not None and extractor.needs_ocr:
+        return {"cost_seconds": BASE_SECONDS + OCR_SECONDS_PER_IMAGE, "pages": None, "needs_ocr": True}
+    size_mb = size_bytes / (1024 * 1024)
+    return {"cost_seconds": BASE_SECONDS + size_mb * TEXT_SECONDS_PER_MB, "pages": None, "needs_ocr": False}
@@ -0,0 +1,198 @@
+# /app/runtime/core/data/services/delta_codec.py
+import re
+import zlib
+import struct
+import hashlib
+
+# Formato de un delta:
+#   MAGIC | hash del blob base (64 caracteres ASCII) | tamaño del resultado (uint64)
+#   y a continuación operaciones hasta el final del archivo:
+#   b"C" offset (uint64) longitud (uint64)  -> copiar 'longitud' bytes de la base
+#   b"I" longitud (uint64) datos            -> insertar los datos
+DELTA_MAGIC = b"PLDELTA1"
+_HEADER = struct.Struct(">64sQ")
+_COPY = struct.Struct(">QQ")
+_LENGTH = struct.Struct(">Q")
+
+# Fragmentación definida por contenido: se corta después de ciertas anclas, respetando un
+# tamaño mínimo y máximo. Como los cortes dependen del contenido y no de la posición,
+# insertar o borrar bytes solo cambia los fragmentos tocados. La búsqueda usa el motor de
+# expresiones regulares, en código nativo, en lugar de un hash rodante byte a byte en Python.
+# - BINARY_ANCHOR aparece cada ~64 KB en datos comprimidos (flujos de PDF, DOCX, imágenes)
+#   y siempre es un corte.
+# - Las anclas de texto sin comprimir (saltos de línea, objetos de PDF), donde la primera no
+#   aparece nunca, son mucho más frecuentes: solo se corta en una de cada
+#   TEXT_ANCHOR_MODULUS, elegida por los bytes que la siguen. Si se cortara en la primera
+#   después del tamaño mínimo, cada corte dependería del anterior y tras una inserción los
+#   cortes tardarían en volver a coincidir con los de la base.
+BINARY_ANCHOR = b"\x8f\xa3"
+CHUNK_ANCHORS = re.compile(rb"\x8f\xa3|\n|endobj")
+TEXT_ANCHOR_MODULUS = 64
+TEXT_ANCHOR_WINDOW = 16
+CHUNK_MIN_SIZE = 16 * 1024
+CHUNK_MAX_SIZE = 256 * 1024
+
+# Bytes que se leen del archivo de una vez al fragmentarlo
+READ_SIZE = 4 * 1024 * 1024
+
+# Datos nuevos que se acumulan antes de escribir una operación de inserción
+MAX_INSERT_SIZE = 1024 * 1024
+
+class DeltaError(Exception):
+    """El delta está dañado o no corresponde a la base indicada."""
+
+def _is_cut(data: bytes, anchor) -> bool:
+    if anchor.group() == BINARY_ANCHOR:
+        return True
+    following = data[anchor.end():anchor.end() + TEXT_ANCHOR_WINDOW]
+    return zlib.crc32(following) % TEXT_ANCHOR_MODULUS == 0
+
+def iter_chunks(f):
+    """Recorre el archivo abierto 'f' y produce sus fragmentos (bytes) en orden."""
+    data = b""
+    position = 0
+    eof = False
+    while True:
+        if not eof and len(data) - position < CHUNK_MAX_SIZE:
+            block = f.read(READ_SIZE)
+            eof = not block
+            data = data[position:] + block
+            position = 0
+            continue
+
+        remaining = len(data) - position
+        if remaining == 0:
+            return
+        end = position + min(remaining, CHUNK_MAX_SIZE)
+        for anchor in CHUNK_ANCHORS.finditer(data, position + CHUNK_MIN_SIZE, end):
+            if _is_cut(data, anchor):
+                end = anchor.end()
+                break
+        yield data[position:end]
+        position = end
+
+def chunk_digest(chunk: bytes) -> bytes:
+    return hashlib.blake2b(chunk, digest_size=16).digest()
+
+def index_chunks(base_path) -> dict:
+    """Índice de los fragmentos de la base: huella -> (offset, longitud) de su primera aparición."""
+    index = {}
+    offset = 0
+    with open(base_path, "rb") as f:
+        for chunk in iter_chunks(f):
+            index.setdefault(chunk_digest(chunk), (offset, len(chunk)))
+            offset += len(chunk)
+    return index
+
+def create_delta(base_path, base_hash: str, target_path, delta_path) -> int:
+    """
+    Escribe en 'delta_path' las operaciones que reconstruyen 'target_path' a partir de
+    'base_path' (cuyo hash de contenido es 'base_hash'). Los fragmentos del destino que
+    ya están en la base se copian de ella; el resto se inserta. Retorna el tamaño del delta.
+    """
+    index = index_chunks(base_path)
+    target_size = 0
+    pending_copy = None  # (offset, longitud) de la copia en curso
+    pending_insert = []
+    pending_insert_size = 0
+
+    with open(target_path, "rb") as target, open(delta_path, "wb") as out:
+        out.write(DELTA_MAGIC)
+        out.write(_HEADER.pack(base_hash.encode("ascii"), 0))
+
+        def flush_copy():
+            nonlocal pending_copy
+            if pending_copy:
+                out.write(b"C" + _COPY.pack(*pending_copy))
+                pending_copy = None
+
+        def flush_insert():
+            nonlocal pending_insert, pending_insert_size
+            if pending_insert:
+                out.write(b"I" + _LENGTH.pack(pending_insert_size))
+                out.write(b"".join(pending_insert))
+                pending_insert = []
+                pending_insert_size = 0
+
+        for chunk in iter_chunks(target):
+            target_size += len(chunk)
+            match = index.get(chunk_digest(chunk))
+            if match is None:
+                flush_copy()
+                pending_insert.append(chunk)
+                pending_insert_size += len(chunk)
+                if pending_insert_size >= MAX_INSERT_SIZE:
+                    flush_insert()
+                continue
+
+            flush_insert()
+            offset, length = match
+            if pending_copy and pending_copy[0] + pending_copy[1] == offset:
+                # Fragmentos consecutivos también en la base: una sola copia
+                pending_copy = (pending_copy[0], pending_copy[1] + length)
+            else:
+                flush_copy()
+                pending_copy = (offset, length)
+
+        flush_copy()
+        flush_insert()
+        delta_size = out.tell()
+        # El tamaño del resultado se conoce al final: se completa la cabecera
+        out.seek(len(DELTA_MAGIC))
+        out.write(_HEADER.pack(base_hash.encode("ascii"), target_size))
+    return delta_size
+
+def read_delta_header(f) -> tuple:
+    """Lee la cabecera de un delta abierto y retorna (hash de la base, tamaño del resultado)."""
+    if f.read(len(DELTA_MAGIC)) != DELTA_MAGIC:
+        raise DeltaError("❌ El archivo no es un delta de versión")
+    header = f.read(_HEADER.size)
+    if len(header) != _HEADER.size:
+        raise DeltaError("❌ Cabecera de delta incompleta")
+    base_hash, target_size = _HEADER.unpack(header)
+    return base_hash.decode("ascii"), target_size
+
+def _read_exact(f, size: int) -> bytes:
+    # Un flujo descomprimido puede devolver menos bytes de los pedidos sin haber terminado
+    data = f.read(size)
+    while len(data) < size:
+        more = f.read(size - len(data))
+        if not more:
+            raise DeltaError("❌ Delta truncado")
+        data += more
+    return data
+
+def apply_delta(base_path, delta, out, target_size: int = None):
+    """
+    Reconstruye el contenido original a partir de 'base_path' y del delta abierto 'delta'
+    (se lee de forma secuencial, por lo que puede ser un flujo descomprimido), escribiéndolo
+    en el archivo abierto 'out' por bloques (nunca se carga un archivo completo en memoria).
+    Si la cabecera del delta ya se leyó con read_delta_header, 'target_size' es el tamaño
+    que indicaba; si no, se lee aquí.
+    """
+    if target_size is None:
+        _, target_size = read_delta_header(delta)
+    written = 0
+    with open(base_path, "rb") as base:
+        while True:
+            operation = delta.read(1)
+            if not operation:
+                break
+            if operation == b"C":
+                offset, length = _COPY.unpack(_read_exact(delta, _COPY.size))
+                base.seek(offset)
+                remaining = length
+                while remaining:
+                    block = base.read(min(remaining, READ_SIZE))
+                    if not block:
+                        raise DeltaError("❌ La base del delta es más corta de lo esperado")
+                    out.write(block)
+                    remaining -= len(block)
+            elif operation == b"I":
+                length, = _LENGTH.unpack(_read_exact(delta, _LENGTH.size))
+                out.write(_read_exact(delta, length))
+            else:
+                raise DeltaError("❌ Operación de delta desconocida")
+            written += length
+    if written != target_size:
+        raise DeltaError(f"❌ El delta produjo {written} bytes en lugar de {target_size}")
@@ -0,0 +1,55 @@
+# /app/runtime/core/data/services/document_analysis.py
+import time
+from core.data.services.file_scanner import scan_file, format_extracted_text
+from core.data.services.spellcheck_service import detect_spelling_errors
+from core.data.services.entity_detection_service import extract_entities
+
+# Las funciones de este módulo no acceden a la base de datos, por lo que pueden
+# ejecutarse en un proceso aparte. Sus resultados son serializables.
+
+def extract_document_text(file_path):
+    """
+    Etapa de extracción: obtiene el texto completo del archivo (con OCR si es
+    necesario) y lo retorna ya formateado.
+    """
+    extracted_text = scan_file(file_path)
+    full_text = format_extracted_text(extracted_text)
+
+    print("📝 fulltext ", full_text)
+
+    return full_text
+
+def analyze_text(full_text):
+    """
+    Etapa de análisis: detecta errores ortográficos y extrae entidades del texto.
+    Retorna un diccionario con:
+      - "text": El mismo texto recibido.
+      - "spelling_errors": Lista de errores ortográficos detectados.
+      - "entities": Entidades extraídas del texto.
+    """
+    spelling_errors = detect_spelling_errors(full_text)
+    entities = extract_entities(full_text)
+
+    print("entities finales ", entities)
+
+    return {
+        "text": full_text,
+        "spelling_errors": spelling_errors,
+        "entities": entities
+    }
+
+def analyze_document(file_path):
+    """
+    Ejecuta todas las etapas pesadas de un documento: extracción de texto,
+    detección de errores ortográficos y extracción de entidades.
+    """
+    return analyze_text(extract_document_text(file_path))
+
+def run_timed(task, argument):
+    """
+    Ejecuta 'task(argument)' y retorna (resultado, segundos). Se mide dentro del proceso
+    que hace el trabajo, de modo que el tiempo de espera en el pool no se cuenta.
+    """
+    started_at = time.perf_counter()
+    result = task(argument)
+    return result, time.perf_counter() - started_at
@@ -0,0 +1,368 @@
+# /app/runtime/core/data/services/extraction_sandbox.py
+import os
+import time
+import queue
+import atexit
+import signal
+import sys
+import threading
+from concurrent.futures import Future
+# multiprocessing.util registra al importarse el atexit que espera a los procesos hijos.
+# Se importa antes de registrar shutdown_sandboxes para que este se ejecute primero
+# (atexit va en orden inverso): si no, la salida espera para siempre a los procesos
+# aislados, que siguen esperando tareas. El contexto de los pools se obtiene de este mismo
+# import (multiprocessing.get_context), así no queda como un import sin uso.
+import multiprocessing.util
+from config.config import (
+    get_sync_workers,
+    get_sync_background_workers,
+    get_extraction_sandbox_enabled,
+    get_extraction_timeout_seconds,
+    get_metadata_timeout_seconds,
+    get_extraction_max_rss_mb
+)
+from core.data.services.metadata_extractor import extract_metadata
+from core.data.services.cost_estimator import estimate_cost, estimate_cost_from_size
+
+# Incremento de 'nice' de los procesos que atienden la cola de segundo plano
+BACKGROUND_NICE = 10
+
+# Cada cuántos segundos se revisan el tiempo y la memoria de una tarea en curso
+POLL_INTERVAL = 0.25
+
+# Segundos de espera para que un proceso termine antes de forzarlo
+STOP_TIMEOUT = 5
+
+_pools = {}
+_pools_lock = threading.Lock()
+_rss_warned = False
+
+class SandboxError(Exception):
+    """
+    Una tarea aislada superó su límite de tiempo o de memoria, o su proceso terminó
+    abruptamente. El proceso se detiene y se reemplaza en la siguiente tarea.
+    """
+
+def redirect_stdout_to_stderr():
+    """
+    Envía a stderr todo lo que el proceso imprima. stdout es el canal del protocolo con
+    Electron y solo lo escribe bridge.event_handler.send_response desde el proceso
+    principal; un print de un proceso hijo podría colarse en medio de una respuesta.
+    """
+    if sys.stderr is None:
+        return
+    sys.stdout.flush()
+    os.dup2(sys.stderr.fileno(), 1)  # También para los subprocesos (pdftoppm, tesseract...)
+    sys.stdout = sys.stderr
+
+def init_worker_process(background: bool = False):
+    """Inicializador de los procesos hijos: desvía stdout y, en segundo plano, reduce la prioridad."""
+    redirect_stdout_to_stderr()
+    if background:
+        lower_priority()
+
+def lower_priority():
+    """Inicializador de los procesos de segundo plano: reduce su prioridad de CPU."""
+    if hasattr(os, "nice"):
+        try:
+            os.nice(BACKGROUND_NICE)
+        except OSError:
+            pass
+
+def _sandbox_main(connection, initializer):
+    """Bucle del proceso aislado: ejecuta las tareas que recibe y devuelve (ok, resultado)."""
+    if hasattr(os, "setpgrp"):
+        # Grupo propio: al detenerlo también se detienen pdftoppm, tesseract y el pool de OCR
+        os.setpgrp()
+    redirect_stdout_to_stderr()
+    if initializer is not None:
+        initializer()
+    while True:
+        try:
+            task = connection.recv()
+        except (EOFError, OSError):
+            break  # El proceso principal terminó
+        if task is None:
+            break
+        task_function, args = task
+        try:
+            response = (True, task_function(*args))
+        except Exception as e:
+            response = (False, e)
+        try:
+            connection.send(response)
+        except Exception as e:
+            # El resultado o la excepción no se pueden serializar
+            connection.send((False, RuntimeError(f"{type(e).__name__}: {e}")))
+
+def _rss_bytes(pid: int):
+    """
+    Memoria residente del proceso y sus hijos. Usa psutil si está instalado; en Linux sin
+    psutil se lee /proc (solo el proceso, sin sus hijos). Retorna None si no se puede medir.
+    """
+    global _rss_warned
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+
+    if psutil is not None:
+        try:
+            process = psutil.Process(pid)
+            total = process.memory_info().rss
+            for child in process.children(recursive=True):
+                try:
+                    total += child.memory_info().rss
+                except psutil.Error:
+                    pass
+            return total
+        except psutil.Error:
+            return None
+
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        if not _rss_warned:
+            print("⚠️ No se puede medir la memoria de los procesos de extracción (instala psutil)")
+            _rss_warned = True
+        return None
+
+def _kill_process_tree(process):
+    """Detiene el proceso aislado y todos sus descendientes."""
+    try:
+        import psutil
+        for child in psutil.Process(process.pid).children(recursive=True):
+            try:
+                child.kill()
+            except psutil.Error:
+                pass
+    except Exception:
+        pass
+    if hasattr(os, "killpg"):
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except OSError:
+            pass
+    process.kill()
+    process.join(STOP_TIMEOUT)
+
+class _SandboxWorker:
+    """Un hilo del proceso principal que atiende un proceso aislado (creado al primer uso)."""
+
+    def __init__(self, pool, index: int):
+        self.pool = pool
+        self.process = None
+        self.connection = None
+        self.thread = threading.Thread(target=self._serve, name=f"{pool.name}-{index}", daemon=True)
+        self.thread.start()
+
+    def _serve(self):
+        while True:
+            item = self.pool._queue.get()
+            if item is None:
+                break
+            future, task_function, args, timeout = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = self._execute(task_function, args, timeout)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+        self.stop()
+
+    def _start(self):
+        context = multiprocessing.get_context("spawn")
+        parent_connection, child_connection = context.Pipe()
+        # No es daemon: los procesos daemon no pueden crear el pool de OCR
+        process = context.Process(
+            target=_sandbox_main,
+            args=(child_connection, self.pool.initializer),
+            name=self.thread.name
+        )
+        try:
+            process.start()
+        except BaseException:
+            parent_connection.close()
+            raise
+        finally:
+            child_connection.close()
+        # Solo se registra una vez iniciado, para que stop() no use un proceso a medias
+        self.process = process
+        self.connection = parent_connection
+
+    def _execute(self, task_function, args, timeout):
+        if self.process is None or not self.process.is_alive():
+            self._start()
+        self.connection.send((task_function, args))
+
+        started_at = time.monotonic()
+        max_rss = self.pool.max_rss_mb * 1024 * 1024 if self.pool.max_rss_mb else None
+        while True:
+            if self.connection.poll(POLL_INTERVAL):
+                try:
+                    ok, value = self.connection.recv()
+                except (EOFError, OSError):
+                    exitcode = self._reset()
+                    raise SandboxError(f"El proceso de extracción terminó abruptamente (código {exitcode})")
+                if ok:
+                    return value
+                raise value
+
+            if not self.process.is_alive():
+                exitcode = self._reset()
+                raise SandboxError(f"El proceso de extracción terminó abruptamente (código {exitcode})")
+
+            elapsed = time.monotonic() - started_at
+            if timeout and elapsed > timeout:
+                self._reset(kill=True)
+                raise SandboxError(f"Se superó el límite de tiempo ({timeout:.0f} s)")
+
+            if max_rss:
+                rss = _rss_bytes(self.process.pid)
+                if rss is not None and rss > max_rss:
+                    self._reset(kill=True)
+                    raise SandboxError(
+                        f"Se superó el límite de memoria ({rss // (1024 * 1024)} MB de "
+                        f"{self.pool.max_rss_mb} MB)"
+                    )
+
+    def _reset(self, kill: bool = False):
+        """Descarta el proceso actual; la siguiente tarea creará uno nuevo. Retorna su código de salida."""
+        process, self.process = self.process, None
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+        if process is None:
+            return None
+        if kill:
+            _kill_process_tree(process)
+        else:
+            process.join(STOP_TIMEOUT)
+        return process.exitcode
+
+    def stop(self):
+        """Pide al proceso que termine y, si no lo hace, lo detiene."""
+        if self.process is None:
+            return
+        try:
+            self.connection.send(None)
+            self.process.join(STOP_TIMEOUT)
+        except (OSError, ValueError):
+            pass
+        self._reset(kill=self.process is not None and self.process.is_alive())
+
+class SandboxPool:
+    """
+    Ejecuta tareas en procesos aislados y reutilizables, con un límite de tiempo por
+    tarea y un límite de memoria residente por proceso (incluidos sus hijos).
+
+    Tiene la misma interfaz básica que un Executor (submit retorna un Future). Si una
+    tarea supera un límite, su proceso se detiene y el Future falla con SandboxError;
+    el resto de las tareas continúa en un proceso nuevo. Así, un archivo malformado que
+    bloquea pdfminer o agota la memoria al rasterizar no detiene el backend ni la
+    sincronización.
+    """
+
+    def __init__(self, workers: int, timeout: float = None, max_rss_mb: int = None,
+                 initializer=None, name: str = "sandbox"):
+        self.name = name
+        self.timeout = timeout
+        self.max_rss_mb = max_rss_mb
+        self.initializer = initializer
+        self._queue = queue.Queue()
+        self._workers = [_SandboxWorker(self, index) for index in range(max(1, workers))]
+
+    def submit(self, task_function, *args, timeout: float = None) -> Future:
+        """Encola 'task_function(*args)'. 'timeout' reemplaza el límite de tiempo del pool."""
+        future = Future()
+        self._queue.put((future, task_function, args, timeout if timeout is not None else self.timeout))
+        return future
+
+    def shutdown(self, cancel_futures: bool = False):
+        """Detiene los procesos. Con 'cancel_futures' se cancelan las tareas en cola."""
+        if cancel_futures:
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    item[0].cancel()
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.thread.join()
+
+def _get_pool(key: str, factory):
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = factory()
+        return pool
+
+def get_extraction_sandbox(background: bool = False) -> SandboxPool:
+    """
+    Devuelve el pool aislado para la extracción de texto (SYNC_WORKERS procesos, o
+    SYNC_BACKGROUND_WORKERS con prioridad reducida para la cola de segundo plano).
+    Los procesos se crean al primer uso y se reutilizan entre sincronizaciones.
+    """
+    if background:
+        return _get_pool("background", lambda: SandboxPool(
+            get_sync_background_workers(),
+            timeout=get_extraction_timeout_seconds(),
+            max_rss_mb=get_extraction_max_rss_mb(),
+            initializer=lower_priority,
+            name="extraction-background"
+        ))
+    return _get_pool("foreground", lambda: SandboxPool(
+        get_sync_workers(),
+        timeout=get_extraction_timeout_seconds(),
+        max_rss_mb=get_extraction_max_rss_mb(),
+        name="extraction"
+    ))
+
+def get_metadata_sandbox() -> SandboxPool:
+    """Devuelve el pool aislado (un proceso) para la lectura de metadatos."""
+    return _get_pool("metadata", lambda: SandboxPool(
+        1,
+        timeout=get_metadata_timeout_seconds(),
+        max_rss_mb=get_extraction_max_rss_mb(),
+        name="metadata"
+    ))
+
+def shutdown_sandboxes():
+    """Detiene los procesos aislados que se hayan creado."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(cancel_futures=True)
+
+atexit.register(shutdown_sandboxes)
+
+def extract_metadata_isolated(file_path, stat_result=None) -> dict:
+    """
+    extract_metadata en el proceso aislado de metadatos (si EXTRACTION_SANDBOX está
+    activo). Lanza SandboxError si el archivo supera los límites.
+    """
+    if not get_extraction_sandbox_enabled():
+        return extract_metadata(file_path, stat_result)
+    return get_metadata_sandbox().submit(extract_metadata, str(file_path), stat_result).result()
+
+def estimate_cost_isolated(file_path, size_bytes: int) -> dict:
+    """
+    estimate_cost en el proceso aislado de metadatos (si EXTRACTION_SANDBOX está activo),
+    con sus mismos límites: contar páginas y revisar la capa de texto de un PDF
+    malformado no debe bloquear ni detener el backend. Si la estimación falla o supera
+    los límites, se estima por el tamaño (ver estimate_cost_from_size).
+    """
+    try:
+        if not get_extraction_sandbox_enabled():
+            return estimate_cost(file_path, size_bytes)
+        return get_metadata_sandbox().submit(estimate_cost, str(file_path), size_bytes).result()
+    except Exception as e:
+        print(f"⚠️ No se pudo estimar el costo de {file_path}: {e}")
+        return estimate_cost_from_size(file_path, size_bytes)
@@ -0,0 +1,122 @@
+# /app/runtime/core/data/services/extractor_registry.py
+from pathlib import Path
+
+class Extractor:
+    """
+    Registro de un formato soportado: extensiones, tipos MIME y el módulo que lo procesa.
+
+    El módulo del backend (pdfminer, python-docx, Tesseract...) no se importa al registrar
+    el formato, sino la primera vez que se extrae un archivo de ese tipo. Cada backend
+    expone extract_text(file_path) y, opcionalmente, extract_metadata(file_path), que
+    retorna los metadatos incrustados en el archivo (ver metadata_extractor).
+    """
+
+    def __init__(self, name: str, extensions, mime_types, loader, needs_ocr: bool = False):
+        self.name = name
+        self.extensions = tuple(extensions)
+        self.mime_types = tuple(mime_types)
+        self.needs_ocr = needs_ocr  # El texto siempre se obtiene con OCR (p. ej. imágenes)
+        self._loader = loader
+        self._module = None
+
+    @property
+    def backend(self):
+        """Módulo del backend (se importa al primer uso)."""
+        if self._module is None:
+            self._module = self._loader()
+        return self._module
+
+    def extract_text(self, file_path) -> str:
+        return self.backend.extract_text(file_path)
+
+    def extract_metadata(self, file_path) -> dict:
+        """Metadatos incrustados en el archivo ({} si el formato no tiene)."""
+        extract = getattr(self.backend, "extract_metadata", None)
+        return extract(file_path) if extract else {}
+
+_by_extension = {}
+_by_mime_type = {}
+
+def register_extractor(extractor: Extractor):
+    """Registra (o reemplaza) el extractor de sus extensiones y tipos MIME."""
+    for extension in extractor.extensions:
+        _by_extension[extension.lower()] = extractor
+    for mime_type in extractor.mime_types:
+        _by_mime_type[mime_type.lower()] = extractor
+
+def get_extractor(file_path, mime_type: str = None):
+    """
+    Extractor de un archivo según su extensión o, si no se reconoce, según el tipo MIME
+    indicado. Retorna None si el formato no está soportado.
+    El tipo MIME no se deduce de la extensión: mimetypes asocia text/plain a decenas de
+    extensiones (.c, .log, .conf...) que no son documentos.
+    """
+    extractor = _by_extension.get(Path(file_path).suffix.lower())
+    if extractor is None and mime_type:
+        extractor = _by_mime_type.get(mime_type.split(";")[0].strip().lower())
+    return extractor
+
+def require_extractor(file_path, mime_type: str = None) -> Extractor:
+    """Como get_extractor, pero lanza ValueError si el formato no está soportado."""
+    extractor = get_extractor(file_path, mime_type)
+    if extractor is None:
+        raise ValueError(f"❌ Formato de archivo no soportado: {Path(file_path).suffix.lower()}")
+    return extractor
+
+def is_supported(file_path) -> bool:
+    """Indica si la extensión del archivo tiene un extractor registrado."""
+    return Path(file_path).suffix.lower() in _by_extension
+
+def supported_extensions() -> frozenset:
+    """Extensiones con extractor registrado (las que recorre la sincronización)."""
+    return frozenset(_by_extension)
+
+# Cargadores de los backends. Los imports explícitos (en lugar de importlib) permiten
+# que PyInstaller detecte los módulos al crear el ejecutable.
+
+def _load_pdf():
+    from core.data.services.extractors import pdf_extractor
+    return pdf_extractor
+
+def _load_docx():
+    from core.data.services.extractors import docx_extractor
+    return docx_extractor
+
+def _load_doc():
+    from core.data.services.extractors import doc_extractor
+    return doc_extractor
+
+def _load_odt():
+    from core.data.services.extractors import odt_extractor
+    return odt_extractor
+
+def _load_rtf():
+    from core.data.services.extractors import rtf_extractor
+    return rtf_extractor
+
+def _load_text():
+    from core.data.services.extractors import text_extractor
+    return text_extractor
+
+def _load_image():
+    from core.data.services.extractors import image_extractor
+    return image_extractor
+
+register_extractor(Extractor("pdf", [".pdf"], ["application/pdf"], _load_pdf))
+register_extractor(Extractor(
+    "docx",
+    [".docx"],
+    ["application/vnd.openxmlformats-officedocument.wordprocessingml.document"],
+    _load_docx
+))
+register_extractor(Extractor("doc", [".doc"], ["application/msword"], _load_doc))
+register_extractor(Extractor("odt", [".odt"], ["application/vnd.oasis.opendocument.text"], _load_odt))
+register_extractor(Extractor("rtf", [".rtf"], ["application/rtf", "text/rtf"], _load_rtf))
+register_extractor(Extractor("txt", [".txt"], ["text/plain"], _load_text))
+register_extractor(Extractor(
+    "image",
+    [".png", ".jpg", ".jpeg", ".jfif", ".tif", ".tiff", ".bmp", ".gif", ".webp"],
+    ["image/png", "image/jpeg", "image/tiff", "image/bmp", "image/gif", "image/webp"],
+    _load_image,
+    needs_ocr=True
+))
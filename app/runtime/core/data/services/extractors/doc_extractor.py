@@ -0,0 +1,100 @@
+# /app/runtime/core/data/services/extractors/doc_extractor.py
+import os
+import shutil
+import subprocess
+import tempfile
+import zipfile
+from pathlib import Path
+
+# Segundos máximos para convertir un .doc con una herramienta externa
+DOC_CONVERT_TIMEOUT = 120
+
+# Ruta de LibreOffice en Windows (en Linux y macOS suele estar en el PATH)
+WINDOWS_SOFFICE_PATH = r"C:\Program Files\LibreOffice\program\soffice.exe"
+
+def _find_soffice():
+    soffice = shutil.which("soffice") or shutil.which("libreoffice")
+    if not soffice and os.name == 'nt' and os.path.exists(WINDOWS_SOFFICE_PATH):
+        soffice = WINDOWS_SOFFICE_PATH
+    return soffice
+
+def _extract_with_antiword(antiword, file_path) -> str:
+    result = subprocess.run(
+        [antiword, "-m", "UTF-8.txt", "-w", "0", str(file_path)],
+        capture_output=True,
+        timeout=DOC_CONVERT_TIMEOUT,
+        check=True
+    )
+    return result.stdout.decode("utf-8", errors="ignore")
+
+def _extract_with_soffice(soffice, file_path) -> str:
+    with tempfile.TemporaryDirectory(prefix="paperless-doc-") as temp_dir:
+        # Un perfil propio por conversión: LibreOffice no admite dos instancias con el mismo
+        profile = Path(temp_dir, "profile").as_uri()
+        subprocess.run(
+            [
+                soffice, f"-env:UserInstallation={profile}", "--headless",
+                "--convert-to", "txt:Text (encoded):UTF8", "--outdir", temp_dir, str(file_path)
+            ],
+            capture_output=True,
+            timeout=DOC_CONVERT_TIMEOUT,
+            check=True
+        )
+        output_path = Path(temp_dir, Path(file_path).stem + ".txt")
+        return output_path.read_text(encoding="utf-8-sig", errors="ignore")
+
+def extract_text(file_path) -> str:
+    """
+    Extrae el texto de un documento de Word 97-2003 (.doc, formato binario OLE), que
+    python-docx no puede leer. Usa antiword si está instalado y, si no, LibreOffice.
+    Los .doc que en realidad son DOCX renombrados se leen como DOCX.
+    """
+    if zipfile.is_zipfile(file_path):
+        from core.data.services.extractors import docx_extractor
+        return docx_extractor.extract_text(file_path)
+
+    antiword = shutil.which("antiword")
+    if antiword:
+        try:
+            return _extract_with_antiword(antiword, file_path)
+        except (subprocess.SubprocessError, OSError) as e:
+            print(f"⚠️ antiword no pudo leer {file_path}: {e}")
+
+    soffice = _find_soffice()
+    if soffice:
+        return _extract_with_soffice(soffice, file_path)
+
+    raise ValueError("❌ Para leer archivos .doc se necesita antiword o LibreOffice instalado")
+
+def extract_metadata(file_path) -> dict:
+    """
+    Título, autor, asunto y fechas del resumen OLE (SummaryInformation) del .doc.
+    Requiere el paquete opcional olefile; sin él solo se usan los datos del sistema de archivos.
+    """
+    if zipfile.is_zipfile(file_path):
+        from core.data.services.extractors import docx_extractor
+        return docx_extractor.extract_metadata(file_path)
+
+    try:
+        import olefile
+    except ImportError:
+        return {}
+
+    if not olefile.isOleFile(str(file_path)):
+        return {}
+    with olefile.OleFileIO(str(file_path)) as ole:
+        meta = ole.get_metadata()
+
+    def text(value):
+        return value.decode("cp1252", errors="ignore").strip() if isinstance(value, bytes) else (value or "")
+
+    def date(value):
+        return value.strftime("%Y-%m-%d %H:%M:%S") if value else None
+
+    return {
+        "title": text(meta.title),
+        "author": text(meta.author),
+        "description": text(meta.subject),
+        "created": date(meta.create_time),
+        "modified": date(meta.last_saved_time),
+    }
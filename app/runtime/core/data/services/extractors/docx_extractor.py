@@ -0,0 +1,50 @@
+# /app/runtime/core/data/services/extractors/docx_extractor.py
+from docx import Document
+from core.data.services.metadata_extractor import normalize_date
+from core.data.services.extractors.image_extractor import ocr_archive_images
+
+# Formatos de imagen incrustados en DOCX a los que se aplica OCR
+# (EMF/WMF solo pueden decodificarse en Windows; en otros sistemas se omiten)
+DOCX_IMAGE_EXTENSIONS = (
+    ".png", ".jpg", ".jpeg", ".jfif", ".gif", ".bmp", ".tif", ".tiff", ".webp", ".emf", ".wmf"
+)
+
+def extract_text_from_docx(file_path):
+    """Extrae texto de un archivo DOCX y detecta imágenes."""
+    doc = Document(file_path)
+    full_text = []
+    contains_images = False
+
+    for para in doc.paragraphs:
+        full_text.append(para.text)
+
+    # Buscar imágenes en el DOCX
+    for rel in doc.part.rels:
+        if "image" in doc.part.rels[rel].target_ref:
+            contains_images = True
+            full_text.append("{IMAGEN}")  # Opcional: indicar dónde había una imagen
+
+    return "\n".join(full_text), contains_images
+
+def extract_images_and_apply_ocr(docx_path):
+    """Extrae las imágenes de un archivo DOCX y aplica OCR."""
+    return ocr_archive_images(docx_path, "word/media/", DOCX_IMAGE_EXTENSIONS)
+
+def extract_text(file_path) -> str:
+    """Extrae el texto de un DOCX; si contiene imágenes, les aplica OCR."""
+    extracted_text, contains_images = extract_text_from_docx(file_path)
+    if contains_images:
+        print("📄 DOCX contiene imágenes: aplicando OCR")
+        extracted_text += "\n" + extract_images_and_apply_ocr(file_path)
+    return extracted_text
+
+def extract_metadata(file_path) -> dict:
+    """Título, autor y fechas de las propiedades del documento (docProps/core.xml)."""
+    core_props = Document(file_path).core_properties
+    return {
+        "title": core_props.title if core_props.title else "",
+        "author": core_props.author if core_props.author else "",
+        "created": normalize_date(core_props.created.isoformat()) if core_props.created else None,
+        "modified": normalize_date(core_props.modified.isoformat()) if core_props.modified else None,
+        "description": "",  # No existe un campo estándar de descripción en docx; se deja vacío.
+    }
@@ -0,0 +1,50 @@
+# /app/runtime/core/data/services/extractors/image_extractor.py
+import hashlib
+from zipfile import ZipFile
+from PIL import Image, UnidentifiedImageError
+from core.data.services.ocr_service import ocr_image_file, ocr_images
+
+# Etiquetas EXIF usadas como metadatos
+EXIF_DESCRIPTION = 270
+EXIF_DATETIME = 306
+EXIF_ARTIST = 315
+
+def extract_text(file_path) -> str:
+    """Extrae el texto de una imagen (PNG, JPEG, TIFF de varias páginas...) con OCR."""
+    return ocr_image_file(file_path)
+
+def _exif_date(value):
+    """Convierte una fecha EXIF ('2023:12:31 23:59:59') al formato ISO."""
+    if not value or len(value) < 19:
+        return None
+    return f"{value[:10].replace(':', '-')}{value[10:19]}"
+
+def extract_metadata(file_path) -> dict:
+    """Autor, descripción y fecha de captura de los datos EXIF de la imagen (si los tiene)."""
+    try:
+        with Image.open(file_path) as image:
+            exif = image.getexif()
+    except (UnidentifiedImageError, OSError):
+        return {}
+    return {
+        "author": exif.get(EXIF_ARTIST),
+        "description": exif.get(EXIF_DESCRIPTION),
+        "created": _exif_date(exif.get(EXIF_DATETIME)),
+    }
+
+def ocr_archive_images(archive_path, folder: str, extensions) -> str:
+    """
+    Aplica OCR a las imágenes incrustadas en un documento comprimido (DOCX, ODT) bajo
+    'folder'. Las imágenes se leen del zip directamente en memoria (sin archivos
+    temporales), las repetidas se descartan por hash de contenido y las únicas se
+    procesan en paralelo.
+    """
+    unique_images = {}
+    with ZipFile(archive_path, "r") as archive:
+        for file in archive.namelist():
+            if file.startswith(folder) and file.lower().endswith(extensions):
+                image_bytes = archive.read(file)
+                unique_images.setdefault(hashlib.sha256(image_bytes).digest(), image_bytes)
+
+    ocr_text = ocr_images(unique_images.values())
+    return "\n".join(text for text in ocr_text if text.strip())
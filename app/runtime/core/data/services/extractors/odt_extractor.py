@@ -0,0 +1,86 @@
+# /app/runtime/core/data/services/extractors/odt_extractor.py
+import xml.etree.ElementTree as ET
+from zipfile import ZipFile
+from core.data.services.metadata_extractor import normalize_date
+from core.data.services.extractors.image_extractor import ocr_archive_images
+
+# Espacios de nombres de OpenDocument
+TEXT_NS = "urn:oasis:names:tc:opendocument:xmlns:text:1.0"
+META_NS = "urn:oasis:names:tc:opendocument:xmlns:meta:1.0"
+OFFICE_NS = "urn:oasis:names:tc:opendocument:xmlns:office:1.0"
+DC_NS = "http://purl.org/dc/elements/1.1/"
+
+PARAGRAPH_TAGS = {f"{{{TEXT_NS}}}p", f"{{{TEXT_NS}}}h"}
+SPACE_TAG = f"{{{TEXT_NS}}}s"
+TAB_TAG = f"{{{TEXT_NS}}}tab"
+LINE_BREAK_TAG = f"{{{TEXT_NS}}}line-break"
+
+# Formatos de imagen incrustados en ODT (carpeta Pictures/) a los que se aplica OCR
+ODT_IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".bmp", ".tif", ".tiff", ".webp")
+
+def _inline_text(element) -> str:
+    """Texto de un párrafo: respeta text:s, text:tab y text:line-break y omite los párrafos anidados."""
+    parts = [element.text or ""]
+    for child in element:
+        if child.tag == SPACE_TAG:
+            parts.append(" " * int(child.get(f"{{{TEXT_NS}}}c", 1)))
+        elif child.tag == TAB_TAG:
+            parts.append("\t")
+        elif child.tag == LINE_BREAK_TAG:
+            parts.append("\n")
+        elif child.tag not in PARAGRAPH_TAGS:
+            parts.append(_inline_text(child))
+        parts.append(child.tail or "")
+    return "".join(parts)
+
+def _paragraphs(element):
+    """Recorre el documento en orden y devuelve el texto de cada párrafo y título."""
+    for child in element:
+        if child.tag in PARAGRAPH_TAGS:
+            yield _inline_text(child)
+        # Cuadros de texto, tablas y notas contienen sus propios párrafos
+        yield from _paragraphs(child)
+
+def extract_text_from_odt(file_path):
+    """Extrae el texto de content.xml e indica si el documento tiene imágenes."""
+    with ZipFile(file_path, "r") as odt_zip:
+        root = ET.fromstring(odt_zip.read("content.xml"))
+        contains_images = any(
+            name.startswith("Pictures/") and name.lower().endswith(ODT_IMAGE_EXTENSIONS)
+            for name in odt_zip.namelist()
+        )
+    return "\n".join(_paragraphs(root)), contains_images
+
+def extract_text(file_path) -> str:
+    """Extrae el texto de un ODT; si contiene imágenes, les aplica OCR."""
+    extracted_text, contains_images = extract_text_from_odt(file_path)
+    if contains_images:
+        print("📄 ODT contiene imágenes: aplicando OCR")
+        extracted_text += "\n" + ocr_archive_images(file_path, "Pictures/", ODT_IMAGE_EXTENSIONS)
+    return extracted_text
+
+def _odf_date(value):
+    # OpenDocument guarda fracciones de segundo de hasta 9 dígitos, que fromisoformat no acepta
+    return normalize_date(value[:19]) if value else None
+
+def extract_metadata(file_path) -> dict:
+    """Título, autor, descripción y fechas de meta.xml."""
+    with ZipFile(file_path, "r") as odt_zip:
+        if "meta.xml" not in odt_zip.namelist():
+            return {}
+        root = ET.fromstring(odt_zip.read("meta.xml"))
+
+    meta = root.find(f"{{{OFFICE_NS}}}meta")
+    if meta is None:
+        return {}
+
+    def field(namespace, name):
+        return (meta.findtext(f"{{{namespace}}}{name}") or "").strip()
+
+    return {
+        "title": field(DC_NS, "title"),
+        "author": field(META_NS, "initial-creator") or field(DC_NS, "creator"),
+        "description": field(DC_NS, "description") or field(DC_NS, "subject"),
+        "created": _odf_date(field(META_NS, "creation-date")),
+        "modified": _odf_date(field(DC_NS, "date")),
+    }
@@ -0,0 +1,79 @@
+# /app/runtime/core/data/services/extractors/pdf_extractor.py
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdfdocument import PDFDocument
+from core.data.services.ocr_service import ocr_pdf_pages, count_pdf_pages
+from core.data.services.metadata_extractor import normalize_date
+from core.data.services.extractors.pdf_text_backends import get_pdf_text_backend, PdfTextLayerError
+
+# Caracteres mínimos para considerar que una página tiene capa de texto útil
+MIN_PAGE_TEXT_CHARS = 10
+# Una página cubierta por una imagen (p. ej. una hoja escaneada con un pie de página
+# digital) solo se considera texto si supera este número de caracteres
+MIN_IMAGE_PAGE_TEXT_CHARS = 200
+# Fracción del área de la página a partir de la cual una imagen se considera "de página completa"
+FULL_PAGE_IMAGE_RATIO = 0.5
+
+def classify_page(page) -> str:
+    """Retorna el texto de la página (PdfPageText) o None si no tiene texto útil y requiere OCR."""
+    chars = len(page.text.strip())
+    is_image_page = page.image_ratio >= FULL_PAGE_IMAGE_RATIO
+    min_chars = MIN_IMAGE_PAGE_TEXT_CHARS if is_image_page else MIN_PAGE_TEXT_CHARS
+    return page.text if chars >= min_chars else None
+
+def extract_pdf_text_layer(file_path, backend=None):
+    """
+    Lee la capa de texto del PDF en una sola pasada (con el backend de PDF_TEXT_BACKEND
+    o el indicado) y retorna una lista con el texto de cada página, o None en las
+    páginas sin texto útil (las que requieren OCR).
+    """
+    backend = backend or get_pdf_text_backend()
+    return [classify_page(page) for page in backend.read_pages(file_path)]
+
+def extract_text_from_pdf_with_ocr(file_path):
+    """
+    Convierte cada página de un PDF en imagen y extrae su texto con OCR.
+    Las páginas se procesan en paralelo (OCR_WORKERS) y el texto conserva su orden.
+    """
+    page_count = count_pdf_pages(file_path)
+    ocr_text = ocr_pdf_pages(file_path, range(1, page_count + 1))
+    return "\n".join(ocr_text)
+
+def extract_text(file_path) -> str:
+    """
+    Extrae el texto de un PDF: usa la capa de texto de cada página y aplica OCR solo a
+    las páginas que no la tienen (p. ej. las hojas de firmas escaneadas de un contrato).
+    """
+    try:
+        pages = extract_pdf_text_layer(file_path)
+    except PdfTextLayerError:
+        # Si hay un error en el parsing, puede ser un escaneado o corrupto
+        print("📄 PDF sin capa de texto legible: se aplicará OCR")
+        return extract_text_from_pdf_with_ocr(file_path)
+
+    missing_pages = [number for number, text in enumerate(pages, start=1) if text is None]
+    if missing_pages:
+        print(f"📄 {len(missing_pages)} de {len(pages)} página(s) sin texto: se aplicará OCR")
+        for page_number, text in zip(missing_pages, ocr_pdf_pages(file_path, missing_pages)):
+            pages[page_number - 1] = text
+    return "\n".join(pages)
+
+def _info_text(info: dict, key: bytes) -> str:
+    value = info.get(key)
+    if not value:
+        return ""
+    return value.decode('utf-8', errors='ignore') if isinstance(value, bytes) else str(value)
+
+def extract_metadata(file_path) -> dict:
+    """Título, autor, fechas y asunto del diccionario /Info del PDF."""
+    metadata = {}
+    with open(file_path, 'rb') as f:
+        parser = PDFParser(f)
+        doc = PDFDocument(parser)
+        if hasattr(doc, 'info') and doc.info:
+            info = doc.info[0]
+            metadata['title'] = _info_text(info, b'/Title')
+            metadata['author'] = _info_text(info, b'/Author')
+            metadata['created'] = normalize_date(_info_text(info, b'/CreationDate'))
+            metadata['modified'] = normalize_date(_info_text(info, b'/ModDate'))
+            metadata['description'] = _info_text(info, b'/Subject')
+    return metadata
@@ -0,0 +1,195 @@
+# /app/runtime/core/data/services/extractors/pdf_text_backends.py
+import threading
+from config.config import get_pdf_text_backend_name
+
+# Bibliotecas disponibles para leer la capa de texto
+BACKEND_AUTO = "auto"
+BACKEND_PDFMINER = "pdfminer"
+BACKEND_PYPDFIUM2 = "pypdfium2"
+
+# PDFium no es seguro entre hilos: las llamadas de un mismo proceso se serializan
+_pdfium_lock = threading.Lock()
+
+_backends = {}
+_backends_lock = threading.Lock()
+_fallback_warned = False
+
+class PdfTextLayerError(Exception):
+    """El PDF no se pudo analizar (dañado, cifrado o sin estructura legible)."""
+
+class PdfPageText:
+    """Texto de una página y fracción de su área cubierta por imágenes."""
+
+    __slots__ = ("text", "image_ratio")
+
+    def __init__(self, text: str, image_ratio: float):
+        self.text = text
+        self.image_ratio = image_ratio
+
+class PdfTextBackend:
+    """Interfaz común de las bibliotecas que leen la capa de texto de un PDF."""
+
+    name = None
+
+    def read_pages(self, file_path, max_pages: int = None) -> list:
+        """
+        Lee las páginas del PDF (o solo las primeras 'max_pages') y retorna una lista de
+        PdfPageText en orden. Lanza PdfTextLayerError si el PDF no se puede analizar.
+        """
+        raise NotImplementedError
+
+    def count_pages(self, file_path) -> int:
+        """Número de páginas del PDF (sin extraer texto)."""
+        raise NotImplementedError
+
+class PdfminerBackend(PdfTextBackend):
+    """
+    pdfminer.six: Python puro, con análisis de layout completo. Es la opción más lenta,
+    pero no requiere bibliotecas nativas.
+    """
+
+    name = BACKEND_PDFMINER
+
+    def __init__(self):
+        from pdfminer.high_level import extract_pages
+        from pdfminer.layout import LTTextContainer, LTFigure, LTImage
+        from pdfminer.pdfparser import PDFParser, PDFSyntaxError
+        from pdfminer.pdfdocument import PDFDocument
+        from pdfminer.pdfpage import PDFPage
+
+        self._extract_pages = extract_pages
+        self._text_container = LTTextContainer
+        self._figure = LTFigure
+        self._image = LTImage
+        self._parser = PDFParser
+        self._document = PDFDocument
+        self._page = PDFPage
+        self._syntax_error = PDFSyntaxError
+
+    def _image_area(self, element) -> float:
+        """Área ocupada por las imágenes de un elemento del layout (recorre las figuras anidadas)."""
+        if isinstance(element, self._image):
+            return element.width * element.height
+        if isinstance(element, self._figure):
+            # Una figura con imágenes ocupa su propio recuadro, aunque contenga varias
+            return element.width * element.height if any(self._image_area(child) for child in element) else 0.0
+        return 0.0
+
+    def read_pages(self, file_path, max_pages: int = None) -> list:
+        pages = []
+        try:
+            for page_layout in self._extract_pages(file_path, maxpages=max_pages or 0):
+                text_parts = []
+                image_area = 0.0
+                for element in page_layout:
+                    if isinstance(element, self._text_container):
+                        text_parts.append(element.get_text())
+                    else:
+                        image_area += self._image_area(element)
+
+                page_area = page_layout.width * page_layout.height
+                pages.append(PdfPageText("".join(text_parts), image_area / page_area if page_area > 0 else 0.0))
+        except self._syntax_error as e:
+            raise PdfTextLayerError(str(e)) from e
+        return pages
+
+    def count_pages(self, file_path) -> int:
+        with open(file_path, "rb") as f:
+            document = self._document(self._parser(f))
+            return sum(1 for _ in self._page.create_pages(document))
+
+class Pypdfium2Backend(PdfTextBackend):
+    """
+    pypdfium2: enlaces a PDFium (el motor de PDF de Chromium). Extrae el texto en código
+    nativo, varias veces más rápido que pdfminer en documentos con capa de texto.
+    """
+
+    name = BACKEND_PYPDFIUM2
+
+    def __init__(self):
+        import pypdfium2
+        import pypdfium2.raw as pdfium_c
+
+        self._pdfium = pypdfium2
+        self._image_filter = [pdfium_c.FPDF_PAGEOBJ_IMAGE]
+
+    def _open(self, file_path):
+        try:
+            return self._pdfium.PdfDocument(str(file_path))
+        except self._pdfium.PdfiumError as e:
+            raise PdfTextLayerError(str(e)) from e
+
+    def _read_page(self, page) -> PdfPageText:
+        textpage = page.get_textpage()
+        try:
+            text = textpage.get_text_range().replace("\r\n", "\n")
+        finally:
+            textpage.close()
+
+        width, height = page.get_size()
+        page_area = width * height
+        image_area = 0.0
+        # Incluye las imágenes dentro de XObjects de formulario (max_depth)
+        for image in page.get_objects(filter=self._image_filter):
+            left, bottom, right, top = image.get_pos()
+            image_area += max(0.0, right - left) * max(0.0, top - bottom)
+        return PdfPageText(text, min(1.0, image_area / page_area) if page_area > 0 else 0.0)
+
+    def read_pages(self, file_path, max_pages: int = None) -> list:
+        with _pdfium_lock:
+            pdf = self._open(file_path)
+            try:
+                page_count = len(pdf) if not max_pages else min(len(pdf), max_pages)
+                pages = []
+                for index in range(page_count):
+                    page = pdf[index]
+                    try:
+                        pages.append(self._read_page(page))
+                    finally:
+                        page.close()
+                return pages
+            except self._pdfium.PdfiumError as e:
+                raise PdfTextLayerError(str(e)) from e
+            finally:
+                pdf.close()
+
+    def count_pages(self, file_path) -> int:
+        with _pdfium_lock:
+            pdf = self._open(file_path)
+            try:
+                return len(pdf)
+            finally:
+                pdf.close()
+
+BACKENDS = {
+    BACKEND_PDFMINER: PdfminerBackend,
+    BACKEND_PYPDFIUM2: Pypdfium2Backend,
+}
+
+def create_pdf_text_backend(name: str = None) -> PdfTextBackend:
+    """
+    Crea el backend configurado en PDF_TEXT_BACKEND. Con 'auto' (por defecto) se usa
+    pypdfium2 si está instalado y, si no, pdfminer.
+    """
+    global _fallback_warned
+    name = (name or get_pdf_text_backend_name()).lower()
+    if name == BACKEND_AUTO:
+        try:
+            return Pypdfium2Backend()
+        except ImportError as e:
+            if not _fallback_warned:
+                print(f"⚠️ pypdfium2 no disponible ({e}); se usará pdfminer")
+                _fallback_warned = True
+            return PdfminerBackend()
+    if name not in BACKENDS:
+        raise ValueError(f"❌ Backend de PDF desconocido: {name} (opciones: {', '.join(BACKENDS)}, auto)")
+    return BACKENDS[name]()
+
+def get_pdf_text_backend(name: str = None) -> PdfTextBackend:
+    """Devuelve el backend indicado (o el configurado), creándolo la primera vez."""
+    key = (name or get_pdf_text_backend_name()).lower()
+    with _backends_lock:
+        backend = _backends.get(key)
+        if backend is None:
+            backend = _backends[key] = create_pdf_text_backend(key)
+        return backend
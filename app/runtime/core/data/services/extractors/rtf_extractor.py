@@ -0,0 +1,45 @@
+# /app/runtime/core/data/services/extractors/rtf_extractor.py
+import re
+from striprtf.striprtf import rtf_to_text
+from core.data.services.extractors.text_extractor import decode_text
+
+# Grupos del bloque {\info ...} con los metadatos del documento
+INFO_TEXT_PATTERN = r"\{\\%s\s+([^{}]*)\}"
+INFO_DATE_PATTERN = r"\{\\%s\s*\\yr(\d{4})\\mo(\d{1,2})\\dy(\d{1,2})(?:\\hr(\d{1,2}))?(?:\\min(\d{1,2}))?"
+# El bloque {\info} va en la cabecera: no hace falta leer el resto (imágenes incluidas)
+INFO_READ_BYTES = 64 * 1024
+
+def _read_rtf(file_path, max_bytes: int = -1) -> str:
+    with open(file_path, "rb") as f:
+        # El RTF es ASCII; los caracteres no ASCII van escapados (\'xx, \uN), que
+        # rtf_to_text decodifica con la página de códigos del documento
+        return decode_text(f.read(max_bytes))
+
+def extract_text(file_path) -> str:
+    """
+    Extrae el texto de un archivo RTF descartando las palabras de control y los grupos
+    que no son texto (tablas de fuentes, estilos, imágenes...).
+    """
+    return rtf_to_text(_read_rtf(file_path), errors="ignore")
+
+def _info_text(rtf: str, name: str) -> str:
+    match = re.search(INFO_TEXT_PATTERN % name, rtf)
+    return rtf_to_text(match.group(1), errors="ignore").strip() if match else ""
+
+def _info_date(rtf: str, name: str):
+    match = re.search(INFO_DATE_PATTERN % name, rtf)
+    if not match:
+        return None
+    year, month, day, hour, minute = (int(value or 0) for value in match.groups())
+    return f"{year:04d}-{month:02d}-{day:02d} {hour:02d}:{minute:02d}:00"
+
+def extract_metadata(file_path) -> dict:
+    """Título, autor, asunto y fechas del bloque {\\info} del RTF."""
+    rtf = _read_rtf(file_path, INFO_READ_BYTES)
+    return {
+        "title": _info_text(rtf, "title"),
+        "author": _info_text(rtf, "author"),
+        "description": _info_text(rtf, "subject"),
+        "created": _info_date(rtf, "creatim"),
+        "modified": _info_date(rtf, "revtim"),
+    }
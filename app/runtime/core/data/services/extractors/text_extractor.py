@@ -0,0 +1,24 @@
+# /app/runtime/core/data/services/extractors/text_extractor.py
+import codecs
+
+# Codificaciones que se prueban en orden cuando el archivo no tiene BOM. cp1252 cubre
+# la mayoría de los .txt antiguos creados en Windows; latin-1 nunca falla.
+FALLBACK_ENCODINGS = ("utf-8", "cp1252", "latin-1")
+
+def decode_text(data: bytes) -> str:
+    """Decodifica texto plano respetando el BOM (UTF-8/UTF-16) si lo hay."""
+    if data.startswith(codecs.BOM_UTF8):
+        return data[len(codecs.BOM_UTF8):].decode("utf-8", errors="replace")
+    if data.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return data.decode("utf-16", errors="replace")
+    for encoding in FALLBACK_ENCODINGS:
+        try:
+            return data.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    return data.decode("latin-1")
+
+def extract_text(file_path) -> str:
+    """Lee un archivo de texto plano."""
+    with open(file_path, "rb") as f:
+        return decode_text(f.read())
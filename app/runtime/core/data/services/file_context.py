@@ -0,0 +1,53 @@
+# /app/runtime/core/data/services/file_context.py
+import os
+from core.data.services.extraction_sandbox import extract_metadata_isolated
+from core.data.services.hash_service import (
+    calculate_content_hash,
+    calculate_unique_hash,
+    calculate_version_hash
+)
+
+class FileContext:
+    """
+    Contexto de procesamiento de un archivo durante una sincronización.
+
+    Memoriza el stat(), los metadatos y el hash del contenido, de modo que cada
+    uno se calcula una sola vez por archivo aunque lo consulten varias etapas
+    (hash único, hash de versión, registro del documento, manifiesto...).
+    """
+
+    def __init__(self, file_path, stat_result=None, content_hash=None):
+        self.file_path = str(file_path)
+        self._stat = stat_result
+        self._metadata = None
+        # Puede venir ya calculado (p. ej. por hash_files, varios archivos en paralelo)
+        self._content_hash = content_hash
+
+    @property
+    def stat(self):
+        """Resultado de os.stat() del archivo."""
+        if self._stat is None:
+            self._stat = os.stat(self.file_path)
+        return self._stat
+
+    @property
+    def metadata(self) -> dict:
+        """Metadatos del archivo (se extraen una única vez, en un proceso aislado)."""
+        if self._metadata is None:
+            self._metadata = extract_metadata_isolated(self.file_path, self.stat)
+        return self._metadata
+
+    @property
+    def content_hash(self) -> str:
+        """Hash SHA-256 del contenido (el archivo se lee una única vez)."""
+        if self._content_hash is None:
+            self._content_hash = calculate_content_hash(self.file_path)
+        return self._content_hash
+
+    def unique_hash(self, main_path) -> str:
+        """Hash único del documento calculado con los datos memorizados."""
+        return calculate_unique_hash(self.file_path, main_path, context=self)
+
+    def version_hash(self) -> str:
+        """Hash de versión del documento calculado con los datos memorizados."""
+        return calculate_version_hash(self.file_path, context=self)
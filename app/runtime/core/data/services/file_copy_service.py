@@ -1,22 +1,81 @@
 # file_copy_service.py
 import os
+import sys
+import errno
 import shutil
-from pathlib import Path
-from config.file_store import get_documents_directory
+from config.config import get_version_store_link_mode
 
-def copy_file_to_storage(src_file_path, document_id, version_tag):
+# Formas de guardar un archivo en el almacén
+LINK_AUTO = "auto"          # reflink si se puede; si no, copia
+LINK_REFLINK = "reflink"    # clon copy-on-write: comparte bloques hasta que uno de los dos cambie
+LINK_HARDLINK = "hardlink"  # enlace duro: el mismo archivo con dos nombres
+LINK_COPY = "copy"
+
+LINK_MODES = (LINK_AUTO, LINK_HARDLINK, LINK_COPY)
+
+# ioctl de Linux que clona un archivo compartiendo sus bloques (Btrfs, XFS, bcachefs, ZFS 2.2...)
+FICLONE = 0x40049409
+
+# Errores con los que el sistema indica que no admite el clon o el enlace entre esos archivos
+UNSUPPORTED_ERRNOS = {
+    errno.EXDEV, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EINVAL, errno.ENOTTY,
+    errno.ENOSYS, errno.EPERM, errno.EACCES
+}
+
+# (método, dispositivo de origen) que ya fallaron por falta de soporte: no se reintentan
+_unsupported = set()
+
+def _reflink(src, dst):
+    """Clona 'src' en 'dst' (nuevo) sin copiar datos. Lanza OSError si no se admite."""
+    if sys.platform.startswith("linux"):
+        import fcntl
+        with open(src, "rb") as source, open(dst, "wb") as target:
+            fcntl.ioctl(target.fileno(), FICLONE, source.fileno())
+    elif sys.platform == "darwin":
+        # clonefile(2) de APFS
+        import ctypes
+        libc = ctypes.CDLL(None, use_errno=True)
+        if libc.clonefile(os.fsencode(src), os.fsencode(dst), 0) != 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error), str(src))
+    else:
+        raise OSError(errno.EOPNOTSUPP, "reflink no disponible en este sistema", str(src))
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def clone_file(src, dst, mode: str = None) -> str:
     """
-    Copia el archivo desde la ruta origen a la estructura interna:
-    /<documents_directory>/<document_id>/<version_tag>_<filename>
+    Crea 'dst' (que no debe existir) con el contenido de 'src' de la forma más barata que
+    admita el sistema de archivos según VERSION_STORE_LINK, y retorna el método usado
+    (reflink, hardlink o copy). Si un método no está soportado para el dispositivo de
+    'src' se recuerda y se pasa al siguiente; la copia es siempre el último recurso.
     """
-    dest_dir = Path(get_documents_directory()) / str(document_id)
-    dest_dir.mkdir(parents=True, exist_ok=True)
-    filename = Path(src_file_path).name
-    dest_file_name = f"{version_tag}_{filename}"
-    dest_file_path = dest_dir / dest_file_name
-    shutil.copy(src_file_path, dest_file_path)
-    return str(dest_file_path)
-
-# Caso de uso:
-# new_path = copy_file_to_storage("ruta/al/archivo.pdf", document_id=123, version_tag="v1.0")
-# Luego, se registra esta ruta en la tabla versions de la BD.
\ No newline at end of file
+    mode = (mode or get_version_store_link_mode()).lower()
+    if mode not in LINK_MODES:
+        raise ValueError(f"❌ Modo de almacenamiento desconocido: {mode} (opciones: {', '.join(LINK_MODES)})")
+
+    methods = []
+    if mode == LINK_HARDLINK:
+        methods.append((LINK_HARDLINK, os.link))
+    if mode in (LINK_AUTO, LINK_HARDLINK):
+        methods.append((LINK_REFLINK, _reflink))
+
+    device = os.stat(src).st_dev
+    for method, link in methods:
+        if (method, device) in _unsupported:
+            continue
+        try:
+            link(src, dst)
+            return method
+        except OSError as e:
+            _remove(dst)
+            if e.errno in UNSUPPORTED_ERRNOS:
+                print(f"ℹ️ {method} no disponible para {src} ({e}); se usará la siguiente opción")
+                _unsupported.add((method, device))
+
+    shutil.copyfile(src, dst)
+    return LINK_COPY
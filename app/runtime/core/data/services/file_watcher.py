@@ -0,0 +1,141 @@
+# /app/runtime/core/data/services/file_watcher.py
+import os
+import threading
+import time
+from pathlib import Path
+from config.config import get_watch_debounce_seconds
+
+# Un lote se sincroniza como máximo tras este múltiplo del debounce,
+# aunque sigan llegando eventos (p. ej. un escáner copiando muchos archivos).
+MAX_DELAY_FACTOR = 10
+
+class DocumentWatcher:
+    """
+    Vigila 'main_path' con las notificaciones del sistema de archivos (inotify en Linux,
+    a través de watchdog) y entrega las rutas modificadas en lotes.
+
+    Los eventos se agrupan (debounce): 'on_changes' recibe la lista de rutas tocadas
+    cuando pasan 'debounce_seconds' sin eventos nuevos. No se hacen recorridos
+    periódicos del árbol.
+    """
+
+    def __init__(self, main_path, on_changes, extensions=None, debounce_seconds=None):
+        self.main_path = str(main_path)
+        self.on_changes = on_changes
+        self.extensions = {ext.lower() for ext in extensions} if extensions else None
+        self.debounce_seconds = debounce_seconds or get_watch_debounce_seconds()
+
+        self._observer = None
+        self._worker = None
+        self._pending = set()
+        self._first_event_at = None
+        self._last_event_at = None
+        self._condition = threading.Condition()
+        self._stopped = threading.Event()
+
+    @property
+    def is_running(self) -> bool:
+        return self._observer is not None
+
+    def start(self):
+        """Inicia la vigilancia. Lanza ImportError si watchdog no está instalado."""
+        if self.is_running:
+            return
+
+        from watchdog.observers import Observer
+        from watchdog.events import FileSystemEventHandler
+
+        watcher = self
+
+        # Solo los eventos que cambian archivos: watchdog>=4 también notifica las aperturas
+        # y los cierres sin escritura (FileOpenedEvent, FileClosedNoWriteEvent), y la propia
+        # sincronización lee cada archivo varias veces, lo que volvería a encolarlo.
+        class _Handler(FileSystemEventHandler):
+            def on_created(self, event):
+                if not event.is_directory:
+                    watcher._add_path(event.src_path)
+
+            def on_modified(self, event):
+                if not event.is_directory:
+                    watcher._add_path(event.src_path)
+
+            def on_deleted(self, event):
+                if not event.is_directory:
+                    watcher._add_path(event.src_path)
+
+            def on_moved(self, event):
+                if not event.is_directory:
+                    watcher._add_path(event.src_path)
+                    # En los renombrados interesa sobre todo la ruta de destino
+                    watcher._add_path(event.dest_path)
+
+            def on_closed(self, event):
+                # FileClosedEvent: se cerró tras escribir
+                if not event.is_directory:
+                    watcher._add_path(event.src_path)
+
+        self._stopped.clear()
+        self._worker = threading.Thread(target=self._run, name="document-watcher", daemon=True)
+        self._worker.start()
+
+        self._observer = Observer()
+        self._observer.schedule(_Handler(), self.main_path, recursive=True)
+        self._observer.daemon = True
+        self._observer.start()
+        print(f"👀 Vigilando cambios en: {self.main_path}")
+
+    def stop(self):
+        """Detiene la vigilancia; los cambios pendientes se descartan."""
+        if not self.is_running:
+            return
+        self._observer.stop()
+        self._observer.join()
+        self._observer = None
+
+        self._stopped.set()
+        with self._condition:
+            self._pending.clear()
+            self._condition.notify_all()
+        self._worker.join()
+        self._worker = None
+        print(f"🛑 Vigilancia detenida: {self.main_path}")
+
+    def _add_path(self, path):
+        path = os.fsdecode(path)
+        if self.extensions and Path(path).suffix.lower() not in self.extensions:
+            return
+        with self._condition:
+            now = time.monotonic()
+            if not self._pending:
+                self._first_event_at = now
+            self._last_event_at = now
+            self._pending.add(path)
+            self._condition.notify_all()
+
+    def _run(self):
+        """Hilo que espera a que se calme la ráfaga de eventos y entrega el lote."""
+        max_delay = self.debounce_seconds * MAX_DELAY_FACTOR
+        while not self._stopped.is_set():
+            with self._condition:
+                while not self._pending and not self._stopped.is_set():
+                    self._condition.wait()
+
+                while self._pending and not self._stopped.is_set():
+                    now = time.monotonic()
+                    quiet_for = now - self._last_event_at
+                    waiting_for = now - self._first_event_at
+                    if quiet_for >= self.debounce_seconds or waiting_for >= max_delay:
+                        break
+                    self._condition.wait(
+                        min(self.debounce_seconds - quiet_for, max_delay - waiting_for)
+                    )
+
+                if self._stopped.is_set():
+                    return
+                paths = sorted(self._pending)
+                self._pending.clear()
+
+            try:
+                self.on_changes(paths)
+            except Exception as e:
+                print(f"❌ Error sincronizando cambios detectados: {e}")
@@ -1,42 +1,161 @@
+import os
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from config.config import get_hash_workers, get_hash_fingerprint_name
 from core.data.services.metadata_extractor import extract_metadata
+from core.data.services.cache_service import cache_content_fingerprint, get_cached_content_fingerprint
 
-def calculate_unique_hash(file_path, main_path):
+# Tamaño de cada lectura al hashear: con bloques grandes hay pocas llamadas desde Python
+# y hashlib libera el GIL mientras procesa cada bloque
+HASH_BLOCK_SIZE = 1024 * 1024
+
+# Huellas rápidas disponibles para detectar contenido sin cambios
+FINGERPRINT_AUTO = "auto"
+FINGERPRINT_XXHASH = "xxhash"
+FINGERPRINT_OFF = "off"
+
+_fingerprint_warned = False
+
+def calculate_unique_hash(file_path, main_path, context=None):
     """
     Genera un hash único para el documento basado en la ruta principal y la fecha de creación.
     Si no se encuentra la fecha de creación, usa el hash del contenido como fallback.
+    Si se proporciona un FileContext, reutiliza sus metadatos y hash de contenido.
     """
-    metadata = extract_metadata(file_path)
+    metadata = context.metadata if context else extract_metadata(file_path)
     created_at = metadata.get("created")
 
     if created_at:
         unique_data = f"{main_path}_{created_at}"
     else:
         # Fallback: si no hay metadata confiable, usa el hash de contenido como unique_hash
-        unique_data = calculate_file_hash(file_path)
+        unique_data = context.content_hash if context else calculate_content_hash(file_path)
 
     return hashlib.sha256(unique_data.encode()).hexdigest()
 
-def calculate_version_hash(file_path):
+def calculate_version_hash(file_path, context=None):
     """
     Genera el hash de la versión basado en el contenido y metadatos del documento.
     Esto cambia cada vez que el documento es modificado.
+    Si se proporciona un FileContext, reutiliza sus metadatos y hash de contenido.
     """
-    metadata = extract_metadata(file_path)
+    metadata = context.metadata if context else extract_metadata(file_path)
     modified_at = metadata.get("modified", "unknown")
 
     # Se calcula el hash del contenido
-    file_content_hash = calculate_file_hash(file_path)
+    file_content_hash = context.content_hash if context else calculate_content_hash(file_path)
 
     version_data = f"{file_content_hash}_{modified_at}"
     return hashlib.sha256(version_data.encode()).hexdigest()
 
+def _hash_stream(f, *hashers):
+    """
+    Lee el archivo abierto 'f' hasta el final en bloques de HASH_BLOCK_SIZE sobre un único
+    búfer reutilizado y actualiza con cada bloque todos los 'hashers'.
+
+    No se usa mmap: si otro programa trunca el archivo mientras está mapeado, el proceso
+    recibe SIGBUS y termina; con lecturas grandes el rendimiento es equivalente (ver
+    benchmarks/bench_hashing.py).
+    """
+    buffer = bytearray(HASH_BLOCK_SIZE)
+    view = memoryview(buffer)
+    while True:
+        read = f.readinto(buffer)
+        if not read:
+            break
+        block = view[:read]
+        for hasher in hashers:
+            hasher.update(block)
+    return hashers
+
 def calculate_file_hash(file_path):
     """
     Calcula el hash SHA-256 del contenido del archivo.
     """
-    sha256 = hashlib.sha256()
-    with open(file_path, 'rb') as f:
-        for block in iter(lambda: f.read(4096), b""):
-            sha256.update(block)
+    # Sin búfer de Python: readinto escribe directamente en el bloque que se hashea
+    with open(file_path, 'rb', buffering=0) as f:
+        sha256, = _hash_stream(f, hashlib.sha256())
     return sha256.hexdigest()
+
+def get_fingerprint_factory():
+    """
+    Devuelve el constructor de la huella rápida configurada en HASH_FINGERPRINT, o None si
+    está desactivada. Con 'auto' (por defecto) se usa xxhash (XXH3 de 128 bits) si está
+    instalado.
+    """
+    global _fingerprint_warned
+    name = get_hash_fingerprint_name()
+    if name == FINGERPRINT_OFF:
+        return None
+    if name not in (FINGERPRINT_AUTO, FINGERPRINT_XXHASH):
+        raise ValueError(
+            f"❌ Huella de contenido desconocida: {name} "
+            f"(opciones: {FINGERPRINT_AUTO}, {FINGERPRINT_XXHASH}, {FINGERPRINT_OFF})"
+        )
+    try:
+        import xxhash
+    except ImportError as e:
+        if name == FINGERPRINT_XXHASH:
+            raise
+        if not _fingerprint_warned:
+            print(f"⚠️ xxhash no disponible ({e}); los archivos modificados se hashean siempre con SHA-256")
+            _fingerprint_warned = True
+        return None
+    return xxhash.xxh3_128
+
+def calculate_content_hash(file_path):
+    """
+    Hash SHA-256 del contenido del archivo, usando la huella rápida si está disponible.
+
+    Si hay una huella guardada del último contenido leído de esa ruta con el mismo tamaño,
+    primero se calcula solo la huella (mucho más barata que SHA-256); si coincide, el
+    archivo solo se tocó (copia de seguridad restaurada, cliente de sincronización...) y se
+    reutiliza el SHA-256 guardado. Si no hay huella guardada, el tamaño cambió o la huella
+    no coincide, se leen juntos la huella y el SHA-256 y ambos se guardan: un archivo nuevo
+    o modificado se lee una sola vez. Las huellas se comparan por ruta, nunca entre
+    archivos distintos.
+    """
+    fingerprint_factory = get_fingerprint_factory()
+    if fingerprint_factory is None:
+        return calculate_file_hash(file_path)
+
+    path = str(file_path)
+    with open(path, 'rb', buffering=0) as f:
+        size = os.fstat(f.fileno()).st_size
+        cached = get_cached_content_fingerprint(path)
+        if cached is not None and cached[0] == size:
+            fingerprint, = _hash_stream(f, fingerprint_factory())
+            if cached[1] == fingerprint.hexdigest():
+                return cached[2]
+            f.seek(0)
+
+        # Una sola pasada para ambos: la huella guardada corresponde siempre a ese SHA-256,
+        # aunque el archivo cambie entre dos lecturas
+        fingerprint, sha256 = _hash_stream(f, fingerprint_factory(), hashlib.sha256())
+    return cache_content_fingerprint(path, size, fingerprint.hexdigest(), sha256.hexdigest())
+
+def hash_files(file_paths, workers: int = None) -> dict:
+    """
+    Calcula calculate_content_hash de varios archivos a la vez en HASH_WORKERS hilos y
+    retorna {ruta: hash}. Los archivos que fallan se omiten: quien use el hash lo calculará
+    de nuevo y tratará el error en su lugar habitual.
+    """
+    file_paths = list(file_paths)
+    workers = min(workers or get_hash_workers(), len(file_paths))
+    hashes = {}
+    if workers <= 1:
+        for file_path in file_paths:
+            try:
+                hashes[file_path] = calculate_content_hash(file_path)
+            except Exception:
+                pass
+        return hashes
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hash") as pool:
+        futures = [(file_path, pool.submit(calculate_content_hash, file_path)) for file_path in file_paths]
+        for file_path, future in futures:
+            try:
+                hashes[file_path] = future.result()
+            except Exception:
+                pass
+    return hashes
@@ -1,9 +1,10 @@
 import re
 from pathlib import Path
 from datetime import datetime
-from pdfminer.pdfparser import PDFParser
-from pdfminer.pdfdocument import PDFDocument
-from docx import Document
+from core.data.services.extractor_registry import require_extractor
+
+# Autor con el que se registran los documentos sin autor en sus metadatos
+DEFAULT_AUTHOR = "unkowmn"
 
 def normalize_date(date_str):
     """
@@ -41,83 +42,44 @@ def get_filename_as_title(file_path):
     # Obtener el nombre del archivo con extensión (último componente después del último slash o backslash)
     filename = Path(file_path).name
     
-    # Remover la extensión (.pdf, .docx, .doc)
+    # Remover la extensión (.pdf, .docx, .odt...)
     title = filename.rsplit('.', 1)[0]
     
     return title
 
-def extract_pdf_metadata(file_path):
-    """Extrae metadatos relevantes de un archivo PDF."""
-    metadata = {}
-    with open(file_path, 'rb') as f:
-        parser = PDFParser(f)
-        doc = PDFDocument(parser)
-        if hasattr(doc, 'info') and doc.info:
-            info = doc.info[0]
-            metadata['title'] = info.get(b'/Title', b'').decode('utf-8', errors='ignore') if info.get(b'/Title') else ""
-            metadata['author'] = info.get(b'/Author', b'').decode('utf-8', errors='ignore') if info.get(b'/Author') else "unkowmn"
-            metadata['created'] = normalize_date(info.get(b'/CreationDate', b'').decode('utf-8', errors='ignore')) if info.get(b'/CreationDate') else None
-            metadata['modified'] = normalize_date(info.get(b'/ModDate', b'').decode('utf-8', errors='ignore')) if info.get(b'/ModDate') else None
-            metadata['description'] = info.get(b'/Subject', b'').decode('utf-8', errors='ignore') if info.get(b'/Subject') else ""
-
-    if not metadata.get('title'):
-        metadata['title'] = get_filename_as_title(file_path)
-
-    # Si no se obtuvo fecha de creación, usamos la del sistema (fallback)
-    if not metadata.get("created"):
-        metadata["created"] = datetime.fromtimestamp(Path(file_path).stat().st_ctime).strftime("%Y-%m-%d %H:%M:%S")
-
-    # Si no se obtuvo fecha de modificación, usamos la del sistema (fallback)
-    if not metadata.get("modified"):
-        metadata["modified"] = datetime.fromtimestamp(Path(file_path).stat().st_mtime).strftime("%Y-%m-%d %H:%M:%S")
-
-    # Agregar tamaño en MB
-    size_bytes = Path(file_path).stat().st_size
-    metadata['size_mb'] = round(size_bytes / (1024 * 1024), 2)
-
-    return metadata
+def extract_metadata(file_path, stat_result=None, mime_type: str = None):
+    """
+    Detecta el tipo de archivo y extrae los metadatos relevantes:
+    title, author, created, modified, description y size_mb.
 
-def extract_docx_metadata(file_path):
-    """Extrae metadatos relevantes de un archivo DOCX."""
-    doc = Document(file_path)
-    core_props = doc.core_properties
-    metadata = {
-        "title": core_props.title if core_props.title else "",
-        "author": core_props.author if core_props.author else "unkowmn",
-        "created": normalize_date(core_props.created.isoformat()) if core_props.created else None,
-        "modified": normalize_date(core_props.modified.isoformat()) if core_props.modified else None,
-        "description": "",  # No existe un campo estándar de descripción en docx; se deja vacío.
-    }
+    Los metadatos incrustados los aporta el extractor del formato (ver extractor_registry);
+    los que falten se completan con el nombre y las fechas del archivo.
+    Si se proporciona 'stat_result' se reutiliza en lugar de volver a llamar a stat().
+    """
+    extractor = require_extractor(file_path, mime_type)
+    file_stat = stat_result or Path(file_path).stat()
+    metadata = extractor.extract_metadata(file_path)
 
     if not metadata.get('title'):
         metadata['title'] = get_filename_as_title(file_path)
 
+    # Toda versión necesita un autor (versions.author_id no admite nulos)
+    if not metadata.get('author'):
+        metadata['author'] = DEFAULT_AUTHOR
+
     # Si no se obtuvo fecha de creación, usamos la del sistema (fallback)
     if not metadata.get("created"):
-        metadata["created"] = datetime.fromtimestamp(Path(file_path).stat().st_ctime).strftime("%Y-%m-%d %H:%M:%S")
+        metadata["created"] = datetime.fromtimestamp(file_stat.st_ctime).strftime("%Y-%m-%d %H:%M:%S")
 
     # Si no se obtuvo fecha de modificación, usamos la del sistema (fallback)
     if not metadata.get("modified"):
-        metadata["modified"] = datetime.fromtimestamp(Path(file_path).stat().st_mtime).strftime("%Y-%m-%d %H:%M:%S")
+        metadata["modified"] = datetime.fromtimestamp(file_stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S")
 
     # Agregar tamaño en MB
-    size_bytes = Path(file_path).stat().st_size
-    metadata["size_mb"] = round(size_bytes / (1024 * 1024), 2)
+    size_bytes = file_stat.st_size
+    metadata['size_mb'] = round(size_bytes / (1024 * 1024), 2)
 
     return metadata
 
-def extract_metadata(file_path):
-    """
-    Detecta el tipo de archivo y extrae los metadatos relevantes:
-    title, author, created, modified, description y size_mb.
-    """
-    ext = Path(file_path).suffix.lower()
-    if ext == ".pdf":
-        return extract_pdf_metadata(file_path)
-    elif ext in [".docx", ".doc"]:
-        return extract_docx_metadata(file_path)
-    else:
-        raise ValueError(f"Formato no soportado para metadatos: {ext}")
-
 # Ejemplo de uso:
-# metadata = extract_metadata("ruta/al/archivo.pdf")
\ No newline at end of file
+# metadata = extract_metadata("ruta/al/archivo.pdf")
@@ -0,0 +1,164 @@
+# /app/runtime/core/data/services/ocr_engine.py
+import os
+import threading
+from config.config import get_ocr_engine_name
+
+# Motores disponibles
+ENGINE_AUTO = "auto"
+ENGINE_TESSEROCR = "tesserocr"
+ENGINE_PYTESSERACT = "pytesseract"
+
+# Rutas de Tesseract en Windows (en Linux y macOS suele estar en el PATH)
+WINDOWS_TESSERACT_DIR = r"C:\Program Files\Tesseract-OCR"
+
+# Confianza que se informa cuando Tesseract no reconoce ninguna palabra
+NO_CONFIDENCE = -1.0
+
+# Un motor por hilo: los handles de la API de Tesseract no son seguros entre hilos
+_local = threading.local()
+_fallback_warned = False
+
+class OcrEngine:
+    """Interfaz común de los motores de OCR usados por ocr_service."""
+
+    name = None
+
+    def recognize(self, image) -> str:
+        """Extrae el texto de una imagen PIL."""
+        raise NotImplementedError
+
+    def recognize_with_confidence(self, image) -> tuple:
+        """
+        Extrae el texto de una imagen PIL y retorna (texto, confianza media de las palabras
+        entre 0 y 100). Si no se reconoce ninguna palabra la confianza es NO_CONFIDENCE.
+        """
+        raise NotImplementedError
+
+    def version(self) -> str:
+        """Versión de Tesseract usada (forma parte de la clave de la caché de OCR)."""
+        raise NotImplementedError
+
+    def close(self):
+        """Libera los recursos del motor."""
+
+class TesserocrEngine(OcrEngine):
+    """
+    Motor en proceso (tesserocr): mantiene un handle de la API de Tesseract con el idioma
+    ya cargado y lo reutiliza en cada página, sin lanzar procesos ni escribir imágenes
+    temporales.
+    """
+
+    name = ENGINE_TESSEROCR
+
+    def __init__(self, language: str):
+        import tesserocr
+
+        self._tesserocr = tesserocr
+        kwargs = {"lang": language}
+        if os.name == 'nt':
+            kwargs["path"] = os.path.join(WINDOWS_TESSERACT_DIR, "tessdata")
+        self._api = tesserocr.PyTessBaseAPI(**kwargs)
+
+    def recognize(self, image) -> str:
+        self._api.SetImage(image)
+        return self._api.GetUTF8Text()
+
+    def recognize_with_confidence(self, image) -> tuple:
+        self._api.SetImage(image)
+        text = self._api.GetUTF8Text()
+        # MeanTextConf usa el resultado ya calculado por GetUTF8Text (no reconoce de nuevo)
+        confidence = float(self._api.MeanTextConf()) if text.strip() else NO_CONFIDENCE
+        return text, confidence
+
+    def version(self) -> str:
+        # tesseract_version() retorna p. ej. "tesseract 5.3.0\n leptonica-1.82.0 ..."
+        info = self._tesserocr.tesseract_version() or ""
+        first_line = info.splitlines()[0] if info else ""
+        return first_line.replace("tesseract", "").strip() or "desconocida"
+
+    def close(self):
+        self._api.End()
+
+class PytesseractEngine(OcrEngine):
+    """
+    Motor de respaldo (pytesseract): lanza el ejecutable 'tesseract' en cada imagen.
+    Más lento, pero solo requiere tener Tesseract instalado.
+    """
+
+    name = ENGINE_PYTESSERACT
+
+    def __init__(self, language: str):
+        import pytesseract
+
+        if os.name == 'nt':
+            pytesseract.pytesseract.tesseract_cmd = os.path.join(WINDOWS_TESSERACT_DIR, "tesseract.exe")
+        else:
+            pytesseract.pytesseract.tesseract_cmd = "tesseract"
+        self._pytesseract = pytesseract
+        self._language = language
+        self._version = None
+
+    def recognize(self, image) -> str:
+        return self._pytesseract.image_to_string(image, lang=self._language)
+
+    def recognize_with_confidence(self, image) -> tuple:
+        # Una sola ejecución de tesseract produce el texto y la tabla TSV con la confianza
+        text, tsv = self._pytesseract.run_and_get_multiple_output(
+            image, extensions=["txt", "tsv"], lang=self._language
+        )
+        confidences = []
+        for row in tsv.splitlines()[1:]:
+            columns = row.split("\t")
+            # Columnas: level ... conf (10), text (11); las filas sin palabra tienen conf -1
+            if len(columns) < 12 or not columns[11].strip():
+                continue
+            try:
+                confidence = float(columns[10])
+            except ValueError:
+                continue
+            if confidence >= 0:
+                confidences.append(confidence)
+        confidence = sum(confidences) / len(confidences) if confidences else NO_CONFIDENCE
+        return text, confidence
+
+    def version(self) -> str:
+        if self._version is None:
+            try:
+                self._version = str(self._pytesseract.get_tesseract_version())
+            except Exception:
+                self._version = "desconocida"
+        return self._version
+
+def create_ocr_engine(language: str, name: str = None) -> OcrEngine:
+    """
+    Crea el motor configurado en OCR_ENGINE. Con 'auto' (por defecto) se usa tesserocr si
+    está instalado y, si no, pytesseract.
+    """
+    global _fallback_warned
+    name = (name or get_ocr_engine_name()).lower()
+    if name == ENGINE_PYTESSERACT:
+        return PytesseractEngine(language)
+    try:
+        return TesserocrEngine(language)
+    except (ImportError, RuntimeError) as e:
+        if name == ENGINE_TESSEROCR:
+            raise
+        if not _fallback_warned:
+            print(f"⚠️ tesserocr no disponible ({e}); se usará pytesseract")
+            _fallback_warned = True
+        return PytesseractEngine(language)
+
+def get_ocr_engine(language: str) -> OcrEngine:
+    """
+    Devuelve el motor del hilo actual para 'language', creándolo la primera vez.
+    En los procesos del pool de OCR hay un único hilo, por lo que cada proceso mantiene
+    un handle de Tesseract durante toda su vida.
+    """
+    engine = getattr(_local, "engine", None)
+    if engine is None or getattr(_local, "language", None) != language:
+        if engine is not None:
+            engine.close()
+        engine = create_ocr_engine(language)
+        _local.engine = engine
+        _local.language = language
+    return engine
@@ -0,0 +1,337 @@
+# /app/runtime/core/data/services/ocr_service.py
+import io
+import os
+import atexit
+import hashlib
+import tempfile
+import time
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from PIL import Image, ImageSequence, UnidentifiedImageError
+from pdf2image import convert_from_path, pdfinfo_from_path
+from config.config import (
+    get_ocr_workers,
+    get_ocr_page_window,
+    get_ocr_adaptive_dpi,
+    get_ocr_low_dpi,
+    get_ocr_high_dpi,
+    get_ocr_min_confidence
+)
+from core.data.services.ocr_engine import get_ocr_engine, NO_CONFIDENCE
+from core.data.services.extraction_sandbox import redirect_stdout_to_stderr
+from core.data.services.cache_service import (
+    get_cached_ocr_text,
+    cache_ocr_text,
+    get_cached_ocr_confidence,
+    cache_ocr_confidence,
+    record_ocr_pass,
+    get_ocr_pass_stats,
+    clear_ocr_stats
+)
+
+# Idioma y resolución usados por Tesseract y pdf2image
+OCR_LANGUAGE = "spa"
+OCR_DPI = 200
+
+# Pasadas del OCR de PDF que se miden (ver ocr_dpi_report)
+PASS_FIXED = "fixed"
+PASS_LOW = "low"
+PASS_HIGH = "high"
+
+# Imágenes más pequeñas (en píxeles por lado) no contienen texto legible: iconos, viñetas...
+MIN_OCR_IMAGE_SIDE = 32
+
+# Pool de OCR por páginas; se crea al primer uso y se reutiliza entre documentos
+_executor = None
+_executor_lock = threading.Lock()
+
+def _init_ocr_worker():
+    """Cada proceso del pool ya es un hilo de OCR: se evita que Tesseract cree los suyos."""
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+    redirect_stdout_to_stderr()
+
+def get_ocr_executor():
+    """Devuelve el pool de procesos de OCR (OCR_WORKERS procesos)."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=get_ocr_workers(),
+                mp_context=get_context("spawn"),
+                initializer=_init_ocr_worker
+            )
+        return _executor
+
+def shutdown_ocr_executor():
+    """Cierra el pool de OCR si se llegó a crear."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(cancel_futures=True)
+            _executor = None
+
+atexit.register(shutdown_ocr_executor)
+
+def ocr_image(image) -> str:
+    """Extrae el texto de una imagen PIL con el motor de OCR del hilo actual (ver ocr_engine)."""
+    return get_ocr_engine(OCR_LANGUAGE).recognize(image)
+
+def ocr_settings_key(dpi: int = None) -> str:
+    """
+    Describe la configuración que influye en el resultado del OCR. Forma parte de la clave
+    de la caché, de modo que cambiar el idioma, la resolución, el motor o Tesseract invalida
+    lo guardado.
+    """
+    engine = get_ocr_engine(OCR_LANGUAGE)
+    return f"lang={OCR_LANGUAGE};dpi={dpi or '-'};engine={engine.name};tesseract={engine.version()}"
+
+def ocr_cache_key(image_bytes: bytes, dpi: int = None) -> str:
+    """Clave de la caché de OCR: hash de los bytes de la imagen más la configuración del OCR."""
+    digest = hashlib.sha256(image_bytes).hexdigest()
+    settings = hashlib.sha256(ocr_settings_key(dpi).encode()).hexdigest()[:16]
+    return f"{digest}:{settings}"
+
+def recognize_image_bytes(image_bytes: bytes) -> str:
+    """
+    Decodifica una imagen en memoria y le aplica OCR (sin caché). Los TIFF con varias
+    páginas se reconocen página a página. Las imágenes que PIL no puede abrir (p. ej.
+    EMF/WMF fuera de Windows) o demasiado pequeñas se omiten.
+    """
+    try:
+        with Image.open(io.BytesIO(image_bytes)) as image:
+            texts = []
+            for frame in ImageSequence.Iterator(image):
+                if min(frame.size) < MIN_OCR_IMAGE_SIDE:
+                    continue
+                if frame.mode not in ("RGB", "L", "1"):
+                    frame = frame.convert("RGB")
+                texts.append(ocr_image(frame))
+            return "\n".join(texts)
+    except (UnidentifiedImageError, OSError) as e:
+        print(f"⚠️ Imagen omitida en OCR: {e}")
+        return ""
+
+def ocr_image_bytes(image_bytes: bytes, dpi: int = None) -> str:
+    """
+    Aplica OCR a una imagen en memoria consultando antes la caché de OCR. Las páginas que no
+    cambiaron entre versiones de un documento (o las imágenes repetidas) no se reprocesan.
+    """
+    key = ocr_cache_key(image_bytes, dpi)
+    text = get_cached_ocr_text(key)
+    if text is None:
+        text = cache_ocr_text(key, recognize_image_bytes(image_bytes))
+    return text
+
+def ocr_image_file(image_path, dpi: int = None) -> str:
+    """Aplica OCR (con caché) a una imagen en disco."""
+    with open(image_path, "rb") as f:
+        return ocr_image_bytes(f.read(), dpi)
+
+def ocr_images(images) -> list:
+    """
+    Aplica OCR a una lista de imágenes en memoria y retorna sus textos en el mismo orden.
+    Las que ya están en la caché no se reprocesan; el resto se reparte en el pool de OCR
+    (si OCR_WORKERS > 1) y se guarda en la caché.
+    """
+    images = list(images)
+    keys = [ocr_cache_key(image_bytes) for image_bytes in images]
+    texts = [get_cached_ocr_text(key) for key in keys]
+
+    missing = [index for index, text in enumerate(texts) if text is None]
+    if missing:
+        payloads = [images[index] for index in missing]
+        if get_ocr_workers() <= 1 or len(payloads) <= 1:
+            results = map(recognize_image_bytes, payloads)
+        else:
+            results = get_ocr_executor().map(recognize_image_bytes, payloads)
+        for index, text in zip(missing, results):
+            texts[index] = cache_ocr_text(keys[index], text)
+    return texts
+
+def count_pdf_pages(file_path) -> int:
+    """Número de páginas del PDF según poppler (pdfinfo)."""
+    return pdfinfo_from_path(str(file_path))["Pages"]
+
+def page_windows(page_numbers, window_size: int) -> list:
+    """
+    Agrupa las páginas en ventanas de páginas consecutivas de como máximo 'window_size'.
+    Ej.: [1, 2, 3, 7, 8] con tamaño 2 -> [(1, 2), (3, 3), (7, 8)].
+    """
+    windows = []
+    for page_number in page_numbers:
+        if windows:
+            first, last = windows[-1]
+            if page_number == last + 1 and last - first + 1 < window_size:
+                windows[-1] = (first, page_number)
+                continue
+        windows.append((page_number, page_number))
+    return windows
+
+def ocr_page_file(image_path, dpi: int, with_confidence: bool = False) -> tuple:
+    """
+    Aplica OCR (con caché) a una página rasterizada y retorna (texto, confianza, en_caché).
+    Sin 'with_confidence' la confianza es None y se comparte la caché con ocr_image_file.
+    """
+    with open(image_path, "rb") as f:
+        image_bytes = f.read()
+    key = ocr_cache_key(image_bytes, dpi)
+    text = get_cached_ocr_text(key)
+    if not with_confidence:
+        if text is not None:
+            return text, None, True
+        return cache_ocr_text(key, recognize_image_bytes(image_bytes)), None, False
+
+    confidence = get_cached_ocr_confidence(key)
+    if text is not None and confidence is not None:
+        return text, confidence, True
+    try:
+        with Image.open(io.BytesIO(image_bytes)) as image:
+            if image.mode not in ("RGB", "L", "1"):
+                image = image.convert("RGB")
+            text, confidence = get_ocr_engine(OCR_LANGUAGE).recognize_with_confidence(image)
+    except (UnidentifiedImageError, OSError) as e:
+        print(f"⚠️ Página omitida en OCR: {e}")
+        text, confidence = "", NO_CONFIDENCE
+    cache_ocr_confidence(key, confidence)
+    return cache_ocr_text(key, text), confidence, False
+
+def ocr_pdf_window(file_path, first_page: int, last_page: int, dpi: int = OCR_DPI,
+                   with_confidence: bool = False, pass_name: str = PASS_FIXED) -> list:
+    """
+    Rasteriza las páginas first_page..last_page a archivos temporales (una sola llamada a
+    poppler) y les aplica OCR de una en una, de modo que solo hay una imagen en memoria.
+    Retorna (texto, confianza) por página en orden y suma el tiempo de la ventana
+    (rasterizado incluido) a los contadores de 'pass_name'.
+    """
+    results = []
+    cached_pages = 0
+    started_at = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix="paperless-ocr-") as temp_dir:
+        image_paths = convert_from_path(
+            str(file_path),
+            dpi=dpi,
+            first_page=first_page,
+            last_page=last_page,
+            output_folder=temp_dir,
+            paths_only=True
+        )
+        # pdf2image nombra los archivos con el número de página, por lo que el orden es estable
+        for image_path in sorted(image_paths):
+            text, confidence, cached = ocr_page_file(image_path, dpi, with_confidence)
+            results.append((text, confidence))
+            cached_pages += cached
+            os.remove(image_path)
+    record_ocr_pass(pass_name, len(results), cached_pages, time.perf_counter() - started_at)
+    return results
+
+def _ocr_pages_at(file_path, page_numbers, dpi: int, with_confidence: bool, pass_name: str) -> list:
+    """
+    Aplica OCR a las páginas indicadas (ordenadas y sin repetir) a la resolución 'dpi' y
+    retorna (texto, confianza) por página. Las páginas se rasterizan por ventanas de
+    OCR_PAGE_WINDOW y, con OCR_WORKERS > 1, las ventanas se reparten en el pool de OCR.
+    """
+    workers = get_ocr_workers()
+    window_size = get_ocr_page_window()
+    if workers > 1:
+        # Ventanas más pequeñas si hace falta para que todos los procesos tengan trabajo
+        window_size = max(1, min(window_size, -(-len(page_numbers) // workers)))
+    windows = page_windows(page_numbers, window_size)
+
+    if workers <= 1 or len(windows) <= 1:
+        results = (
+            ocr_pdf_window(file_path, first, last, dpi, with_confidence, pass_name)
+            for first, last in windows
+        )
+    else:
+        # map() conserva el orden de las ventanas aunque terminen en distinto orden;
+        # solo viajan la ruta, el rango de páginas y los textos
+        count = len(windows)
+        results = get_ocr_executor().map(
+            ocr_pdf_window,
+            [file_path] * count,
+            [first for first, _ in windows],
+            [last for _, last in windows],
+            [dpi] * count,
+            [with_confidence] * count,
+            [pass_name] * count
+        )
+    return [page for window_results in results for page in window_results]
+
+def ocr_pdf_pages(file_path, page_numbers) -> list:
+    """
+    Aplica OCR a las páginas indicadas (numeradas desde 1) y retorna sus textos en orden
+    de página. La memoria usada no depende del número de páginas (ver _ocr_pages_at).
+
+    Con OCR_ADAPTIVE_DPI todas las páginas se reconocen primero a OCR_LOW_DPI y solo las
+    que quedan por debajo de OCR_MIN_CONFIDENCE se repiten a OCR_HIGH_DPI; de cada página
+    se conserva el texto con mayor confianza. Las páginas sin ninguna palabra (en blanco)
+    no se repiten.
+    """
+    page_numbers = sorted(set(page_numbers))
+    if not page_numbers:
+        return []
+
+    if not get_ocr_adaptive_dpi():
+        return [text for text, _ in _ocr_pages_at(file_path, page_numbers, OCR_DPI, False, PASS_FIXED)]
+
+    low_dpi = get_ocr_low_dpi()
+    high_dpi = get_ocr_high_dpi()
+    min_confidence = get_ocr_min_confidence()
+    pages = _ocr_pages_at(file_path, page_numbers, low_dpi, True, PASS_LOW)
+    if high_dpi <= low_dpi:
+        return [text for text, _ in pages]
+
+    retry = [
+        index for index, (_, confidence) in enumerate(pages)
+        if confidence != NO_CONFIDENCE and confidence < min_confidence
+    ]
+    if retry:
+        print(
+            f"🔎 OCR adaptativo: {len(retry)} de {len(pages)} páginas con confianza menor que "
+            f"{min_confidence:.0f}; se repiten a {high_dpi} dpi"
+        )
+        retried = _ocr_pages_at(file_path, [page_numbers[index] for index in retry], high_dpi, True, PASS_HIGH)
+        for index, (text, confidence) in zip(retry, retried):
+            if confidence >= pages[index][1]:
+                pages[index] = (text, confidence)
+    return [text for text, _ in pages]
+
+def _seconds_per_page(stats: dict):
+    """Segundos por página reconocida (sin contar las que vinieron de la caché), o None."""
+    pages = stats["pages"] - stats["cached_pages"]
+    return stats["seconds"] / pages if pages > 0 else None
+
+def ocr_dpi_report(reset: bool = False) -> dict:
+    """
+    Resume los contadores acumulados del OCR de PDF: páginas, tiempo y segundos por página
+    de cada pasada, porcentaje de páginas repetidas a alta resolución y una estimación del
+    tiempo ahorrado por el OCR adaptativo frente a reconocer todas las páginas a alta
+    resolución (y frente a la resolución fija, si hay datos de esa pasada). Con 'reset'
+    los contadores se reinician después de leerlos.
+    """
+    passes = {name: get_ocr_pass_stats(name) for name in (PASS_FIXED, PASS_LOW, PASS_HIGH)}
+    for stats in passes.values():
+        stats["seconds_per_page"] = _seconds_per_page(stats)
+
+    low, high, fixed = passes[PASS_LOW], passes[PASS_HIGH], passes[PASS_FIXED]
+    adaptive_seconds = low["seconds"] + high["seconds"]
+    # Las páginas tomadas de la caché no cuentan: se compara solo el trabajo real
+    recognized_pages = low["pages"] - low["cached_pages"]
+    report = {
+        "adaptive": get_ocr_adaptive_dpi(),
+        "dpi": {PASS_FIXED: OCR_DPI, PASS_LOW: get_ocr_low_dpi(), PASS_HIGH: get_ocr_high_dpi()},
+        "min_confidence": get_ocr_min_confidence(),
+        "passes": passes,
+        "retried_ratio": high["pages"] / low["pages"] if low["pages"] else None,
+        "saved_seconds_vs_high": None,
+        "saved_seconds_vs_fixed": None,
+    }
+    if recognized_pages > 0 and high["seconds_per_page"] is not None:
+        report["saved_seconds_vs_high"] = recognized_pages * high["seconds_per_page"] - adaptive_seconds
+    if recognized_pages > 0 and fixed["seconds_per_page"] is not None:
+        report["saved_seconds_vs_fixed"] = recognized_pages * fixed["seconds_per_page"] - adaptive_seconds
+
+    if reset:
+        clear_ocr_stats()
+    return report
@@ -0,0 +1,94 @@
+# /app/runtime/core/data/services/sync_progress.py
+import time
+from config.config import get_sync_progress_interval
+
+class SyncProgress:
+    """
+    Lleva la cuenta del avance de una sincronización y lo notifica mediante 'callback'.
+
+    Las notificaciones se limitan a una cada 'min_interval' segundos (salvo los cambios
+    de etapa y el final), de modo que reportar el progreso no afecte al rendimiento.
+    El callback recibe un diccionario con:
+      - files_discovered / files_processed
+      - bytes_discovered / bytes_processed
+      - files_deferred: archivos enviados a la cola de segundo plano
+      - stage: etapa actual
+      - background: True si la sincronización corresponde a la cola de segundo plano
+      - bytes_per_second y eta_seconds (None mientras no haya datos suficientes)
+    """
+
+    def __init__(self, callback=None, min_interval=None, background: bool = False):
+        self.callback = callback
+        self.background = background
+        self.min_interval = min_interval if min_interval is not None else get_sync_progress_interval()
+        self.files_discovered = 0
+        self.bytes_discovered = 0
+        self.files_processed = 0
+        self.bytes_processed = 0
+        self.files_deferred = 0
+        self.stage = "discovering"
+        self._started_at = time.monotonic()
+        self._last_emit = 0.0
+
+    def discovered(self, size_bytes: int):
+        """Registra un archivo encontrado durante el recorrido."""
+        self.files_discovered += 1
+        self.bytes_discovered += size_bytes
+        self._emit()
+
+    def set_stage(self, stage: str):
+        """Cambia la etapa actual; siempre se notifica."""
+        if stage != self.stage:
+            self.stage = stage
+            self._emit(force=True)
+
+    def advance(self, size_bytes: int = 0):
+        """Registra un archivo terminado (procesado, sin cambios o fallido)."""
+        self.files_processed += 1
+        self.bytes_processed += size_bytes
+        self._emit()
+
+    def defer(self, size_bytes: int):
+        """
+        Registra un archivo enviado a segundo plano. Deja de contar en el total de esta
+        sincronización, de modo que el tiempo restante estimado solo cubre la parte rápida.
+        """
+        self.files_deferred += 1
+        self.files_discovered -= 1
+        self.bytes_discovered -= size_bytes
+        self._emit()
+
+    def finish(self):
+        """Notifica el estado final."""
+        self.stage = "done"
+        self._emit(force=True)
+
+    def snapshot(self) -> dict:
+        elapsed = time.monotonic() - self._started_at
+        rate = self.bytes_processed / elapsed if elapsed > 0 and self.bytes_processed else None
+        remaining = max(0, self.bytes_discovered - self.bytes_processed)
+        return {
+            "files_discovered": self.files_discovered,
+            "files_processed": self.files_processed,
+            "bytes_discovered": self.bytes_discovered,
+            "bytes_processed": self.bytes_processed,
+            "files_deferred": self.files_deferred,
+            "stage": self.stage,
+            "background": self.background,
+            "elapsed_seconds": round(elapsed, 1),
+            "bytes_per_second": round(rate) if rate else None,
+            "eta_seconds": round(remaining / rate, 1) if rate else None
+        }
+
+    def _emit(self, force: bool = False):
+        if not self.callback:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_emit < self.min_interval:
+            return
+        self._last_emit = now
+        try:
+            self.callback(self.snapshot())
+        except Exception as e:
+            # Un fallo al notificar nunca debe interrumpir la sincronización
+            print(f"⚠️ Error notificando progreso: {e}")
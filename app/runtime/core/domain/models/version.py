@@ -1,6 +1,6 @@
 # /app/runtime/core/domain/models/version.py
 class VersionDomain:
-    def __init__(self, id, document_id, version_tag, file_path, file_hash, author_id, comment, updated_at, size_mb):
+    def __init__(self, id, document_id, version_tag, file_path, file_hash, author_id, comment, updated_at, size_mb, blob_hash=None):
         self.id = id
         self.document_id = document_id
         self.version_tag = version_tag
@@ -10,6 +10,7 @@ class VersionDomain:
         self.comment = comment
         self.updated_at = updated_at
         self.size_mb = size_mb
+        self.blob_hash = blob_hash
 
     def to_dict(self):
         return {
@@ -21,5 +22,6 @@ class VersionDomain:
             "author_id": self.author_id,
             "comment": self.comment,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-            "size_mb": self.size_mb
+            "size_mb": self.size_mb,
+            "blob_hash": self.blob_hash
         }
\ No newline at end of file
@@ -0,0 +1,261 @@
+# /app/runtime/core/usecases/plan_sync_use_case.py
+import os
+from itertools import islice
+from config.config import get_sync_defer_ocr, get_hash_workers
+from core.data.repositories.document_repository import DocumentRepository
+from core.data.repositories.version_repository import VersionRepository
+from core.data.repositories.sync_manifest_repository import SyncManifestRepository
+from core.data.repositories.sync_timing_repository import SyncTimingRepository
+from core.data.repositories.sync_journal_repository import (
+    SyncJournalRepository,
+    STAGE_EXTRACTED,
+    STAGE_ANALYZED,
+    STAGE_PERSISTED,
+    STAGE_FAILED
+)
+from core.data.services.file_context import FileContext
+from core.data.services.cost_estimator import file_kind, BASE_SECONDS
+from core.data.services.extraction_sandbox import estimate_cost_isolated
+from core.usecases.sync_documents_use_case import (
+    iter_document_paths,
+    manifest_matches,
+    failure_signature,
+    is_under_path,
+    prefetch_content_hashes,
+    resumable_stage,
+    ANY_KIND,
+    HASH_PREFETCH_PER_WORKER
+)
+
+# Estados con los que se clasifica cada archivo
+STATUS_NEW = "new"
+STATUS_CHANGED = "changed"
+STATUS_UNCHANGED = "unchanged"
+STATUS_MOVED = "moved"
+STATUS_DELETED = "deleted"
+STATUS_FAILED = "failed"  # Superó los límites de extracción y se omite hasta que cambie
+
+# Segundos por documento para la escritura en la BD cuando aún no hay historial
+DEFAULT_PERSIST_SECONDS = 0.05
+
+# Máximo de archivos detallados en la respuesta (los totales siempre cubren todo)
+MAX_LISTED_FILES = 500
+
+class SyncPlanner:
+    """
+    Calcula, sin extraer texto ni ejecutar NER, qué haría una sincronización de 'main_path':
+    clasifica cada archivo como nuevo, modificado, sin cambios, movido o eliminado
+    comparándolo con las tablas documents/versions, y estima el tiempo de cada etapa a
+    partir de los tiempos registrados en sincronizaciones anteriores.
+
+    Solo se leen el manifiesto (un stat() basta para los archivos sin cambios), los
+    metadatos y hashes de los archivos modificados, y las primeras páginas de los PDF
+    para saber si requieren OCR.
+    """
+
+    def __init__(self, main_path: str, cancel_event=None):
+        self.main_path = main_path
+        self.cancel_event = cancel_event
+        self.defer_ocr = get_sync_defer_ocr()
+        self.manifest = SyncManifestRepository().get_all()
+        self.journal = SyncJournalRepository().get_states()
+        self.averages = SyncTimingRepository().get_averages()
+        self.latest_hashes = VersionRepository().get_latest_hashes()
+        self.documents = {
+            unique_hash: (document_id, document_path)
+            for document_id, unique_hash, document_path in DocumentRepository().get_path_index()
+        }
+
+        self.counts = {status: 0 for status in (
+            STATUS_NEW, STATUS_CHANGED, STATUS_UNCHANGED, STATUS_MOVED, STATUS_DELETED, STATUS_FAILED
+        )}
+        self.estimates = {STAGE_EXTRACTED: 0.0, STAGE_ANALYZED: 0.0, STAGE_PERSISTED: 0.0}
+        self.deferred = {"files": 0, "estimated_seconds": 0.0}
+        self.bytes_to_process = 0
+        self.files = []
+        self.errors = []
+        self.used_history = False
+
+    def run(self) -> dict:
+        """Recorre 'main_path' y retorna el plan con los totales, estimaciones y archivos."""
+        seen_paths = set()
+        claimed_documents = set()
+
+        paths = iter_document_paths(self.main_path)
+        chunk_size = get_hash_workers() * HASH_PREFETCH_PER_WORKER
+        while True:
+            # Por tramos: los archivos modificados de cada tramo se hashean en paralelo
+            chunk = list(islice(paths, chunk_size))
+            if not chunk:
+                break
+            files = []
+            for file_path in chunk:
+                seen_paths.add(file_path)
+                try:
+                    files.append((file_path, os.stat(file_path)))
+                except Exception as e:
+                    self._error(file_path, e)
+            content_hashes = prefetch_content_hashes(files, self.manifest, self.journal)
+
+            for file_path, stat_result in files:
+                if self.cancel_event is not None and self.cancel_event.is_set():
+                    return {"success": False, "cancelled": True, "message": "Planificación cancelada"}
+                try:
+                    self._classify(file_path, stat_result, content_hashes.get(file_path), claimed_documents)
+                except Exception as e:
+                    self._error(file_path, e)
+
+        # Documentos registrados bajo 'main_path' cuyo archivo ya no existe
+        for document_id, document_path in self.documents.values():
+            if (
+                document_id not in claimed_documents
+                and document_path
+                and document_path not in seen_paths
+                and is_under_path(document_path, self.main_path)
+                and not os.path.exists(document_path)
+            ):
+                self._add(STATUS_DELETED, document_path)
+
+        total = sum(self.estimates.values())
+        return {
+            "success": True,
+            "main_path": self.main_path,
+            "counts": self.counts,
+            "bytes_to_process": self.bytes_to_process,
+            "estimated_seconds": {
+                **{stage: round(seconds, 1) for stage, seconds in self.estimates.items()},
+                "total": round(total, 1)
+            },
+            "deferred_ocr": {
+                "files": self.deferred["files"],
+                "estimated_seconds": round(self.deferred["estimated_seconds"], 1)
+            },
+            "uses_history": self.used_history,
+            "files": self.files,
+            "truncated": len(self.files) < sum(
+                count for status, count in self.counts.items() if status != STATUS_UNCHANGED
+            ),
+            "errors": self.errors
+        }
+
+    def _error(self, file_path: str, error: Exception):
+        """Registra un archivo que no se pudo planificar."""
+        print(f"❌ No se pudo planificar {file_path}: {error}")
+        self.errors.append({"path": file_path, "error": str(error)})
+
+    def _classify(self, file_path: str, stat_result, content_hash: str, claimed_documents: set):
+        """
+        Clasifica un archivo existente y suma su costo estimado si hay que procesarlo.
+        'content_hash' es el hash del contenido si ya se calculó (o None).
+        """
+        entry = self.manifest.get(file_path)
+        if manifest_matches(entry, stat_result):
+            document = self.documents.get(entry[3])
+            if document:
+                claimed_documents.add(document[0])
+            self.counts[STATUS_UNCHANGED] += 1
+            return
+
+        signature, stage = self.journal.get(file_path, (None, None))
+        if stage == STAGE_FAILED and signature == failure_signature(stat_result):
+            self._add(STATUS_FAILED, file_path)
+            return
+
+        context = FileContext(file_path, stat_result, content_hash)
+        unique_hash = context.unique_hash(self.main_path)
+        version_hash = context.version_hash()
+
+        document = self.documents.get(unique_hash)
+        if document is None:
+            self._add(STATUS_NEW, file_path, context, version_hash)
+            return
+
+        document_id, document_path = document
+        claimed_documents.add(document_id)
+        content_changed = self.latest_hashes.get(document_id) != version_hash
+        if document_path and document_path != file_path and not os.path.exists(document_path):
+            # Mismo documento en otra ruta; solo se procesa si además cambió su contenido
+            self._add(
+                STATUS_MOVED, file_path, context if content_changed else None, version_hash,
+                previous_path=document_path
+            )
+        elif content_changed:
+            self._add(STATUS_CHANGED, file_path, context, version_hash)
+        else:
+            self.counts[STATUS_UNCHANGED] += 1
+
+    def _add(self, status: str, file_path: str, context: FileContext = None,
+             version_hash: str = None, previous_path: str = None):
+        """Cuenta un archivo con 'status'; si se pasa 'context', el archivo se procesará."""
+        self.counts[status] += 1
+        item = {"path": file_path, "status": status}
+        if previous_path:
+            item["previous_path"] = previous_path
+
+        if context is not None:
+            size_bytes = context.stat.st_size
+            stages, needs_ocr = self._estimate(file_path, size_bytes, version_hash)
+            seconds = sum(stages.values())
+            self.bytes_to_process += size_bytes
+            if needs_ocr and self.defer_ocr:
+                # Se procesará en segundo plano, después de responder a la sincronización
+                self.deferred["files"] += 1
+                self.deferred["estimated_seconds"] += seconds
+            else:
+                for stage, stage_seconds in stages.items():
+                    self.estimates[stage] += stage_seconds
+            item.update({
+                "size": size_bytes,
+                "needs_ocr": needs_ocr,
+                "estimated_seconds": round(seconds, 2)
+            })
+
+        if len(self.files) < MAX_LISTED_FILES:
+            self.files.append(item)
+
+    def _estimate(self, file_path: str, size_bytes: int, version_hash: str):
+        """
+        Estima los segundos de cada etapa para un archivo. Usa el historial cuando existe
+        y, si no, la estimación de estimate_cost en el proceso aislado. Retorna
+        ({etapa: segundos}, needs_ocr).
+        """
+        resumed_stage = resumable_stage(version_hash)
+
+        if resumed_stage in (STAGE_EXTRACTED, STAGE_ANALYZED):
+            # El texto ya se extrajo en una sincronización interrumpida
+            cost = {"cost_seconds": BASE_SECONDS, "needs_ocr": False}
+        else:
+            cost = estimate_cost_isolated(file_path, size_bytes)
+
+        stages = {STAGE_EXTRACTED: 0.0, STAGE_ANALYZED: 0.0, STAGE_PERSISTED: 0.0}
+        if resumed_stage is None:
+            kind = file_kind(file_path, cost["needs_ocr"])
+            stages[STAGE_EXTRACTED] = self._from_history(
+                STAGE_EXTRACTED, kind, size_bytes, max(0.0, cost["cost_seconds"] - BASE_SECONDS)
+            )
+        if resumed_stage != STAGE_ANALYZED:
+            stages[STAGE_ANALYZED] = self._from_history(STAGE_ANALYZED, ANY_KIND, size_bytes, BASE_SECONDS)
+        stages[STAGE_PERSISTED] = self._from_history(
+            STAGE_PERSISTED, ANY_KIND, size_bytes, DEFAULT_PERSIST_SECONDS
+        )
+        return stages, cost["needs_ocr"]
+
+    def _from_history(self, stage: str, kind: str, size_bytes: int, default: float) -> float:
+        """Segundos estimados según el historial (proporcional al tamaño si se conoce)."""
+        average = self.averages.get((stage, kind))
+        if not average:
+            return default
+        self.used_history = True
+        per_file, per_mb = average
+        if per_mb is not None and size_bytes:
+            return per_mb * size_bytes / (1024 * 1024)
+        return per_file
+
+def plan_sync(main_path: str, cancel_event=None) -> dict:
+    """
+    Simula una sincronización de 'main_path' (dry-run) y retorna el conjunto de cambios
+    y el tiempo estimado por etapa, sin modificar la BD ni los archivos.
+    """
+    if not main_path or not os.path.isdir(main_path):
+        return {"success": False, "message": f"La ruta principal no existe: {main_path}"}
+    return SyncPlanner(main_path, cancel_event).run()
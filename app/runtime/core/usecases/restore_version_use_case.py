@@ -0,0 +1,36 @@
+# /app/runtime/core/usecases/restore_version_use_case.py
+import os
+import shutil
+from core.data.repositories.version_repository import VersionRepository
+from core.data.services.blob_store import materialize_version_file, restore_blob
+
+class RestoreVersionUseCase:
+    def __init__(self, version_repository: VersionRepository):
+        self.version_repository = version_repository
+
+    def execute(self, version_id: int, destination: str = None):
+        """
+        Obtiene el archivo de una versión, reconstruyéndolo si se guardó como delta o comprimido.
+        - Sin 'destination' retorna la ruta de un archivo legible con su contenido.
+        - Con 'destination' (ruta de archivo) lo escribe allí.
+        """
+        try:
+            version = self.version_repository.get_version_by_id(version_id)
+            if version is None:
+                return {"success": False, "error": f"Versión no encontrada: {version_id}"}
+
+            if not destination:
+                path = materialize_version_file(version.file_path, version.blob_hash)
+                return {"success": True, "versionId": version.id, "path": str(path)}
+
+            parent = os.path.dirname(os.path.abspath(destination))
+            os.makedirs(parent, exist_ok=True)
+            if version.blob_hash:
+                # Se descomprime o reconstruye directamente en el destino, sin copia intermedia
+                path = restore_blob(version.blob_hash, destination)
+            else:
+                shutil.copyfile(materialize_version_file(version.file_path), destination)
+                path = destination
+            return {"success": True, "versionId": version.id, "path": str(path)}
+        except Exception as e:
+            return {"success": False, "error": f"Error al restaurar la versión: {str(e)}"}
@@ -0,0 +1,350 @@
+# /app/runtime/core/usecases/storage_maintenance_use_case.py
+import os
+import time
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from config.config import get_storage_verify_workers, get_storage_gc_grace_minutes
+from config.file_store import get_documents_directory, get_blobs_directory, get_restored_directory
+from core.data.repositories.version_repository import VersionRepository
+from core.data.services.blob_store import (
+    DELTA_SUFFIXES,
+    find_full_blob,
+    find_delta,
+    get_delta_base,
+    hash_stored_content,
+    is_temp_file,
+    iter_store_files,
+    legacy_relative_path,
+    resolve_legacy_file
+)
+from core.data.services.cache_service import (
+    save_verify_checkpoint,
+    get_verify_checkpoint,
+    clear_verify_checkpoint
+)
+from core.usecases.sync_documents_use_case import pause_syncs
+
+# Estado de cada contenido referenciado por una versión
+STATUS_OK = "ok"
+STATUS_MISSING = "missing"        # No hay blob (ni su base, si es un delta) o falta el archivo
+STATUS_CORRUPT = "corrupt"        # El contenido leído no coincide con su hash o no se puede decodificar
+STATUS_UNREADABLE = "unreadable"  # Falta una dependencia para leerlo (zstandard)
+
+# Blobs en vuelo por hilo: el avance se guarda al terminar cada grupo
+VERIFY_PER_WORKER = 8
+
+# Máximo de versiones detalladas en la respuesta (los totales siempre cubren todo)
+MAX_LISTED_VERSIONS = 500
+
+def _load_references() -> list:
+    """Referencias de todas las versiones al almacén (ver VersionRepository.get_storage_references)."""
+    repository = VersionRepository()
+    try:
+        return repository.get_storage_references()
+    finally:
+        repository.session.close()
+
+def _check_blob(content_hash: str):
+    """Lee y hashea el contenido guardado de 'content_hash'. Retorna (hash, estado, detalle, bytes)."""
+    stored = find_full_blob(content_hash) or find_delta(content_hash)
+    try:
+        size_bytes = stored.stat().st_size if stored is not None else 0
+        digest = hash_stored_content(content_hash)
+    except FileNotFoundError as e:
+        return content_hash, STATUS_MISSING, str(e), 0
+    except ImportError as e:
+        return content_hash, STATUS_UNREADABLE, str(e), 0
+    except Exception as e:
+        return content_hash, STATUS_CORRUPT, f"{type(e).__name__}: {e}", 0
+    if digest != content_hash:
+        return content_hash, STATUS_CORRUPT, f"El contenido leído tiene el hash {digest}", size_bytes
+    return content_hash, STATUS_OK, None, size_bytes
+
+class StorageVerifier:
+    """
+    Comprueba que el archivo de cada versión sigue en el almacén y que su contenido
+    coincide con su hash.
+
+    Las versiones del almacén de blobs se verifican por 'blob_hash' (el SHA-256 del
+    contenido): cada blob se lee una sola vez aunque lo compartan varias versiones, se
+    descomprime o se reconstruye desde su delta y se hashea. 'versions.file_hash' no sirve
+    para esto porque combina el contenido con la fecha de modificación, por lo que de las
+    versiones anteriores al almacén (sin blob_hash) solo se comprueba que el archivo exista.
+
+    Los blobs se hashean en paralelo con STORAGE_VERIFY_WORKERS hilos y a lo sumo
+    VERIFY_PER_WORKER blobs por hilo en vuelo. Se recorren en orden de hash y, al
+    terminar cada grupo, el avance se guarda en la caché: si la verificación se cancela
+    o se interrumpe, la siguiente continúa desde ahí.
+    """
+
+    def __init__(self, resume: bool = True, cancel_event=None, on_progress=None, workers: int = None):
+        self.cancel_event = cancel_event
+        self.on_progress = on_progress
+        self.workers = workers or get_storage_verify_workers()
+        self.references = _load_references()
+
+        checkpoint = get_verify_checkpoint() if resume else None
+        if checkpoint is None:
+            checkpoint = {"cursor": "", "started_at": time.time(), "checked": 0, "bytes": 0, "problems": {}}
+        self.checkpoint = checkpoint
+        self.resumed = bool(checkpoint["cursor"])
+
+    def run(self) -> dict:
+        blob_hashes = sorted({blob_hash for _, _, _, blob_hash in self.references if blob_hash})
+        pending = [blob_hash for blob_hash in blob_hashes if blob_hash > self.checkpoint["cursor"]]
+        total = len(blob_hashes)
+        group_size = self.workers * VERIFY_PER_WORKER
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="storage-verify") as executor:
+            for start in range(0, len(pending), group_size):
+                if self.cancel_event is not None and self.cancel_event.is_set():
+                    return {
+                        "success": False,
+                        "cancelled": True,
+                        "message": "Verificación cancelada. La próxima continuará desde donde se detuvo."
+                    }
+                group = pending[start:start + group_size]
+                for content_hash, status, detail, size_bytes in executor.map(_check_blob, group):
+                    self.checkpoint["checked"] += 1
+                    self.checkpoint["bytes"] += size_bytes
+                    if status != STATUS_OK:
+                        self.checkpoint["problems"][content_hash] = (status, detail)
+                self.checkpoint["cursor"] = group[-1]
+                save_verify_checkpoint(self.checkpoint)
+                self._progress(total)
+
+        report = self._report(total)
+        clear_verify_checkpoint()
+        return report
+
+    def _progress(self, total: int):
+        if self.on_progress is not None:
+            self.on_progress({
+                "stage": "verifying",
+                "blobs_checked": self.checkpoint["checked"],
+                "blobs_total": total,
+                "bytes_checked": self.checkpoint["bytes"],
+                "elapsed_seconds": round(time.time() - self.checkpoint["started_at"], 1)
+            })
+
+    def _report(self, total: int) -> dict:
+        problems = self.checkpoint["problems"]
+        counts = {status: 0 for status in (STATUS_OK, STATUS_MISSING, STATUS_CORRUPT, STATUS_UNREADABLE)}
+        listed = []
+        legacy_checked = 0
+
+        for version_id, document_id, file_path, blob_hash in self.references:
+            if blob_hash:
+                status, detail = problems.get(blob_hash, (STATUS_OK, None))
+            else:
+                # Versión anterior al almacén de blobs: solo se puede comprobar que exista
+                legacy_checked += 1
+                if resolve_legacy_file(file_path) is not None:
+                    status, detail = STATUS_OK, None
+                else:
+                    status, detail = STATUS_MISSING, f"No se encontró el archivo: {file_path}"
+            counts[status] += 1
+            if status != STATUS_OK and len(listed) < MAX_LISTED_VERSIONS:
+                listed.append({
+                    "versionId": version_id,
+                    "documentId": document_id,
+                    "blobHash": blob_hash,
+                    "filePath": file_path,
+                    "status": status,
+                    "detail": detail
+                })
+
+        damaged = len(self.references) - counts[STATUS_OK]
+        if damaged:
+            print(f"⚠️ Almacén verificado: {damaged} versión(es) con problemas")
+        else:
+            print(f"✅ Almacén verificado: {len(self.references)} versiones correctas")
+        return {
+            "success": True,
+            "message": "Verificación completada.",
+            "resumed": self.resumed,
+            "versions": len(self.references),
+            "counts": counts,
+            "blobs_checked": total,
+            "legacy_versions_checked": legacy_checked,
+            "bytes_checked": self.checkpoint["bytes"],
+            "elapsed_seconds": round(time.time() - self.checkpoint["started_at"], 1),
+            "problems": listed,
+            "problems_truncated": damaged > len(listed)
+        }
+
+class StorageCollector:
+    """
+    Borra del almacén lo que ya no referencia ninguna versión:
+      - blobs sin versión, salvo los que son base de un delta en uso (transitivamente)
+      - deltas redundantes (el mismo contenido también está completo)
+      - archivos de versiones anteriores al almacén (documents/<id>/...) sin versión
+      - temporales de escrituras interrumpidas y versiones reconstruidas en 'restored'
+        (se vuelven a generar al pedirlas)
+
+    Si la cabecera de algún delta no se puede leer, no se sabe qué blob es su base y en
+    esa ejecución no se borra ningún blob sin versión; del mismo modo, si alguna versión
+    antigua no encuentra su archivo no se borra ningún archivo de versiones antiguas. Los
+    errores se informan en 'errors'.
+    Nada con menos de STORAGE_GC_GRACE_MINUTES de antigüedad se borra, y la limpieza se
+    ejecuta sin sincronizaciones en curso en este proceso. Es idempotente: si se
+    interrumpe, la siguiente ejecución continúa con lo que quede. Con 'dry_run' solo
+    informa lo que borraría.
+    """
+
+    def __init__(self, dry_run: bool = False, cancel_event=None, grace_minutes: int = None):
+        self.dry_run = dry_run
+        self.cancel_event = cancel_event
+        grace_minutes = get_storage_gc_grace_minutes() if grace_minutes is None else grace_minutes
+        self.cutoff = time.time() - grace_minutes * 60
+        self.deleted = {"blobs": 0, "deltas": 0, "legacy": 0, "temp": 0, "restored": 0}
+        self.freed_bytes = 0
+        self.kept_recent = 0
+        self.kept_unverified = 0
+        # Hay deltas cuya base no se pudo leer: cualquier blob podría ser esa base
+        self.unknown_bases = False
+        # Hay versiones antiguas sin archivo: cualquier archivo huérfano podría ser el suyo
+        self.unresolved_legacy = False
+        self.errors = []
+
+    def run(self) -> dict:
+        with pause_syncs():
+            references = _load_references()
+            referenced = self._referenced_blobs(references)
+            legacy_paths = self._legacy_paths(references)
+
+            for path, content_hash, suffix in iter_store_files():
+                if self._cancelled():
+                    return self._cancelled_result()
+                if content_hash is None:
+                    if is_temp_file(path):
+                        self._delete(path, "temp")
+                elif content_hash not in referenced:
+                    if self.unknown_bases:
+                        self.kept_unverified += 1
+                    else:
+                        self._delete(path, "blobs")
+                elif suffix in DELTA_SUFFIXES and find_full_blob(content_hash) is not None:
+                    self._delete(path, "deltas")
+
+            if legacy_paths is not None:
+                self._collect_legacy(legacy_paths)
+            self._collect_restored()
+
+        verb = "se borrarían" if self.dry_run else "borrados"
+        total = sum(self.deleted.values())
+        print(f"🧹 Limpieza del almacén: {total} archivo(s) {verb}, {self.freed_bytes} bytes")
+        message = "Limpieza completada." if not self.dry_run else "Simulación de limpieza completada."
+        if self.unknown_bases:
+            print("⚠️ No se borraron blobs sin versión: no se pudo leer la base de algunos deltas")
+            message += " No se borraron blobs sin versión porque no se pudo leer la base de algunos deltas."
+        if self.unresolved_legacy:
+            print("⚠️ No se borraron archivos de versiones antiguas: algunas versiones no encuentran su archivo")
+            message += (" No se borraron archivos de versiones antiguas porque algunas versiones"
+                        " no encuentran su archivo.")
+        return {
+            "success": True,
+            "message": message,
+            "dry_run": self.dry_run,
+            "deleted": self.deleted,
+            "freed_bytes": self.freed_bytes,
+            "kept_recent": self.kept_recent,
+            "kept_unverified": self.kept_unverified,
+            "errors": self.errors[:MAX_LISTED_VERSIONS]
+        }
+
+    def _referenced_blobs(self, references) -> set:
+        """Hashes de los blobs de las versiones más las bases de los deltas que los reconstruyen."""
+        referenced = set()
+        pending = [blob_hash for _, _, _, blob_hash in references if blob_hash]
+        while pending:
+            content_hash = pending.pop()
+            if content_hash in referenced:
+                continue
+            referenced.add(content_hash)
+            if find_full_blob(content_hash) is None and find_delta(content_hash) is not None:
+                try:
+                    pending.append(get_delta_base(content_hash))
+                except Exception as e:
+                    # No se sabe su base (p. ej. un .delta.zst sin zstandard): por seguridad
+                    # en esta ejecución no se borra ningún blob sin versión
+                    self.unknown_bases = True
+                    self.errors.append(f"No se pudo leer el delta de {content_hash}: {e}")
+        return referenced
+
+    def _legacy_paths(self, references):
+        """
+        Rutas '<document_id>/<archivo>' (ver legacy_relative_path) de los archivos de las
+        versiones anteriores al almacén de blobs. Se comparan por esta ruta relativa y no
+        por la absoluta guardada en la BD, que puede ser de otra máquina. Retorna None si
+        alguna versión no encuentra su archivo: no se sabe cuál es y, por seguridad, en esta
+        ejecución no se borra ningún archivo de versiones antiguas.
+        """
+        legacy_paths = set()
+        for version_id, _, file_path, blob_hash in references:
+            if blob_hash:
+                continue
+            if resolve_legacy_file(file_path) is None:
+                self.unresolved_legacy = True
+                self.errors.append(f"No se encontró el archivo de la versión {version_id}: {file_path}")
+            legacy_paths.add(os.path.normcase(legacy_relative_path(file_path or "")))
+        return None if self.unresolved_legacy else legacy_paths
+
+    def _collect_legacy(self, legacy_paths: set):
+        """Archivos de versiones anteriores al almacén de blobs que ya no tienen versión."""
+        documents_dir = get_documents_directory()
+        blobs_dir = get_blobs_directory()
+        for root, dirs, files in os.walk(documents_dir):
+            if Path(root) == documents_dir:
+                dirs[:] = [name for name in dirs if Path(root, name) != blobs_dir]
+            for name in files:
+                path = Path(root, name)
+                relative = path.relative_to(documents_dir).as_posix()
+                if os.path.normcase(relative) not in legacy_paths:
+                    self._delete(path, "legacy")
+
+    def _collect_restored(self):
+        restored_dir = get_restored_directory()
+        for entry in os.scandir(restored_dir):
+            if entry.is_file(follow_symlinks=False):
+                self._delete(Path(entry.path), "temp" if is_temp_file(entry.name) else "restored")
+
+    def _delete(self, path: Path, kind: str):
+        try:
+            stat_result = path.stat()
+            # El enlace duro o el renombrado que crea un blob actualizan st_ctime
+            if max(stat_result.st_mtime, stat_result.st_ctime) > self.cutoff:
+                self.kept_recent += 1
+                return
+            if not self.dry_run:
+                os.remove(path)
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            self.errors.append(f"No se pudo borrar {path}: {e}")
+            return
+        self.deleted[kind] += 1
+        self.freed_bytes += stat_result.st_size
+
+    def _cancelled(self) -> bool:
+        return self.cancel_event is not None and self.cancel_event.is_set()
+
+    def _cancelled_result(self) -> dict:
+        return {
+            "success": False,
+            "cancelled": True,
+            "message": "Limpieza cancelada. La próxima continuará con lo que quede.",
+            "deleted": self.deleted,
+            "freed_bytes": self.freed_bytes
+        }
+
+def verify_storage(resume: bool = True, cancel_event=None, on_progress=None) -> dict:
+    """
+    Verifica el almacén de versiones (ver StorageVerifier). Con 'resume' en False se
+    descarta el avance de una verificación anterior interrumpida.
+    """
+    return StorageVerifier(resume, cancel_event, on_progress).run()
+
+def gc_storage(dry_run: bool = False, cancel_event=None) -> dict:
+    """Borra del almacén lo que ninguna versión referencia (ver StorageCollector)."""
+    return StorageCollector(dry_run, cancel_event).run()
@@ -1,163 +1,911 @@
 import os
 from pathlib import Path
 import time
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from config.config import (
+    get_sync_workers,
+    get_sync_batch_size,
+    get_sync_defer_ocr,
+    get_sync_background_workers,
+    get_extraction_sandbox_enabled,
+    get_hash_workers,
+    get_version_store_delta,
+    get_version_store_delta_max_chain
+)
 from core.data.repositories.document_repository import DocumentRepository
 from core.data.repositories.version_repository import VersionRepository
 from core.data.repositories.author_repository import AuthorRepository
 from core.data.repositories.analyzed_content_repository import AnalyzedContentRepository
-from core.data.repositories.legal_calendar_repository import LegalCalendarRepository
 from core.data.repositories.spelling_error_repository import SpellingErrorRepository
-from core.data.services.file_copy_service import copy_file_to_storage
-from core.data.services.metadata_extractor import extract_metadata
-from core.data.services.file_scanner import scan_file, format_extracted_text
-from core.data.services.hash_service import calculate_version_hash, calculate_unique_hash
-from core.data.services.spellcheck_service import detect_spelling_errors
-from core.data.services.entity_detection_service import extract_entities
+from core.data.repositories.sync_manifest_repository import SyncManifestRepository
+from core.data.repositories.sync_timing_repository import SyncTimingRepository
+from core.data.repositories.unit_of_work import UnitOfWork
+from core.data.repositories.sync_journal_repository import (
+    SyncJournalRepository,
+    STAGE_EXTRACTED,
+    STAGE_ANALYZED,
+    STAGE_PERSISTED,
+    STAGE_FAILED
+)
+from core.data.services.blob_store import store_blob, compact_blob, is_delta
+from core.data.services.file_context import FileContext
+from core.data.services.hash_service import hash_files
+from core.data.services.document_analysis import extract_document_text, analyze_text, run_timed
+from core.data.services.sync_progress import SyncProgress
+from core.data.services.cost_estimator import file_kind
+from core.data.services.extractor_registry import supported_extensions
+from core.data.services.extraction_sandbox import (
+    get_extraction_sandbox,
+    init_worker_process,
+    estimate_cost_isolated,
+    SandboxError
+)
 from core.data.services.cache_service import (
     cache_document,
     cache_version,
     cache_analyzed_content,
     cache_spelling_errors,
     clear_all_caches,
-    cache_word_suggestions
+    cache_word_suggestions,
+    cache_stage_result,
+    get_cached_stage_result,
+    clear_stage_results
 )
 
-# Lista de extensiones válidas
-ALLOWED_EXTENSIONS = {".pdf", ".doc", ".docx"}
+# Lista de extensiones válidas (las que tienen un extractor registrado)
+ALLOWED_EXTENSIONS = supported_extensions()
+
+# Tareas enviadas al pool por cada proceso antes de esperar resultados
+MAX_PENDING_PER_WORKER = 2
 
-def sync_documents(main_path: str):
+# Archivos modificados que se hashean juntos (en paralelo) por cada hilo de HASH_WORKERS
+HASH_PREFETCH_PER_WORKER = 4
+
+# Tipo con el que se registran los tiempos de las etapas que no dependen del formato
+ANY_KIND = "*"
+
+# Evita que una sincronización manual y una del modo vigilancia se ejecuten a la vez
+_sync_lock = threading.Lock()
+
+def pause_syncs():
     """
-    Sincroniza documentos en el directorio 'main_path' de forma recursiva.
+    Bloqueo que, mientras se mantiene (with pause_syncs(): ...), impide que empiece una
+    sincronización en este proceso; si hay una en curso, espera a que termine.
     """
-    # Instanciar repositorios
-    doc_repo = DocumentRepository()
-    ver_repo = VersionRepository()
-    author_repo = AuthorRepository()
-    analyzed_repo = AnalyzedContentRepository()
-    calendar_repo = LegalCalendarRepository()
-    spelling_repo = SpellingErrorRepository()
+    return _sync_lock
 
-    # Recorrer recursivamente el directorio principal
+class SyncRepositories:
+    """
+    Agrupa los repositorios de consulta y registro usados durante una sincronización.
+    Las escrituras de cada versión se hacen a través de una UnitOfWork.
+    Solo el proceso principal los instancia, de modo que es el único escritor de SQLite.
+    """
+    def __init__(self):
+        self.documents = DocumentRepository()
+        self.versions = VersionRepository()
+        self.authors = AuthorRepository()
+        self.manifest = SyncManifestRepository()
+        self.journal = SyncJournalRepository()
+        self.timings = SyncTimingRepository()
+
+    def close(self):
+        """
+        Libera las conexiones de los repositorios al terminar la sincronización (las lecturas
+        las dejan tomadas y el pool del engine se agotaba tras varias sincronizaciones).
+        AuthorRepository abre una sesión por operación.
+        """
+        for repository in (self.documents, self.versions, self.manifest, self.journal, self.timings):
+            repository.session.close()
+
+def iter_document_paths(main_path: str):
+    """Recorre recursivamente 'main_path' y devuelve las rutas con extensión soportada."""
     for root, dirs, files in os.walk(main_path):
         for file in files:
-            ext = Path(file).suffix.lower()
-            if ext not in ALLOWED_EXTENSIONS:
-                continue
+            if Path(file).suffix.lower() in ALLOWED_EXTENSIONS:
+                yield os.path.join(root, file)
+
+def manifest_matches(entry, stat_result) -> bool:
+    """Indica si la firma guardada en el manifiesto coincide con el stat() actual del archivo."""
+    return bool(entry) and entry[:3] == (
+        stat_result.st_size,
+        stat_result.st_mtime_ns,
+        str(stat_result.st_ino)
+    )
+
+def prepare_document(context: FileContext, main_path: str, repos: SyncRepositories):
+    """
+    Etapa ligera (proceso principal): metadatos, autor, hashes y registro del documento.
+    Los metadatos y el hash del contenido se toman del FileContext, por lo que el
+    archivo se analiza y se lee una sola vez.
+    Retorna un diccionario con lo necesario para persistir la nueva versión;
+    "is_new_version" es False si el contenido no ha cambiado. Del documento y del autor
+    solo se guardan valores simples (id, título): los objetos de la ORM pertenecen a las
+    sesiones de los repositorios y, leídos dentro de la transacción de la UnitOfWork,
+    se recargarían por otra conexión que espera el bloqueo de escritura de SQLite.
+    """
+    file_path = context.file_path
+    file = os.path.basename(file_path)
+    previous_version = True
+    is_new_version = True
+    previous_blob_hash = None
+
+    # 1. Extraer metadatos del documento
+    metadata = context.metadata
+
+    print("metadata extraido: ", metadata)
+
+    # 2. Verificar y actualizar el autor en la BD
+    author_name = metadata.get("author", "").strip()
+    if author_name:
+        author = repos.authors.get_or_create_author(author_name)
+    else:
+        author = None  # Si no hay autor, se registrará sin este campo en la BD
+
+    # 3. Generar unique_hash (persistente) y version_hash (basado en contenido)
+    doc_unique_hash = context.unique_hash(main_path)
+    version_hash = context.version_hash()
+
+    # 4. Verificar si el documento ya existe en la BD
+    document = repos.documents.get_document_by_unique_hash(doc_unique_hash)
+    if not document:
+        # Si no existe, se registra como nuevo documento
+        document = repos.documents.create_document(
+            title=metadata.get("title", file),
+            description=metadata.get("description", ""),
+            doc_type="desconocido",
+            unique_hash=doc_unique_hash,
+            main_path=file_path
+        )
+
+        previous_version = False
+
+    # 4.5. Verificar si ha cambiado la versión
+    if previous_version:
+        latest_version = repos.versions.get_latest_version_by_document_id(document.id)
+        if latest_version and latest_version.file_hash == version_hash:
+            print(f"📌 El documento '{file}' no ha cambiado, se omite nueva versión.")
+            is_new_version = False
+        if latest_version:
+            previous_blob_hash = latest_version.blob_hash
+
+    return {
+        "file_path": file_path,
+        "context": context,
+        "metadata": metadata,
+        "author_id": author.id if author else None,
+        "document_id": document.id,
+        "title": document.title,
+        "unique_hash": doc_unique_hash,
+        "version_hash": version_hash,
+        "previous_blob_hash": previous_blob_hash,
+        "is_new_version": is_new_version
+    }
 
-            file_path = os.path.join(root, file)
-            print(f"📂 Procesando: {file_path}")
+def persist_document(prepared: dict, analysis: dict, uow: UnitOfWork):
+    """
+    Etapa de escritura (proceso principal): guarda el archivo, crea la versión y
+    guarda errores ortográficos, contenido analizado y eventos del calendario.
+    Todas las filas se escriben en la transacción de 'uow' con inserciones masivas;
+    el commit queda a cargo de quien llama.
+    """
+    file_path = prepared["file_path"]
+    document_id = prepared["document_id"]
+    title = prepared["title"]
+    entities = analysis["entities"]
+
+    # 6. Generar tag de versión y guardar el archivo en el almacén de blobs
+    # (si el mismo contenido ya está almacenado, la versión lo reutiliza sin copiarlo)
+    version_tag = f"v{int(time.time())}"
+    context = prepared["context"]
+    blob_hash = context.content_hash
+    stored_file_path = store_blob(file_path, blob_hash, context.stat)
+
+    # 6.8. Se crea una nueva versión porque el documento cambió
+    version = uow.versions.add_version(
+        document_id=document_id,
+        version_tag=version_tag,
+        file_path=str(stored_file_path),
+        file_hash=prepared["version_hash"],
+        author_id=prepared["author_id"],
+        comment="",
+        size_mb=prepared["metadata"].get("size_mb", 0.0),
+        blob_hash=blob_hash
+    )
+
+    # 7. Registrar los errores ortográficos detectados en el fulltext
+    uow.spelling.create_errors(
+        [error.get("word") for error in analysis["spelling_errors"]],
+        version_id=version.id
+    )
+
+    # Para fechas: Si alguna entrada de fecha no tiene evento, se asigna un valor por defecto.
+    if "fechas" in entities:
+        for idx, fecha in enumerate(entities["fechas"]):
+            if not fecha.get("evento"):
+                entities["fechas"][idx]["evento"] = f"Evento de {title}"
+
+    # 9. Guardar el fulltext y las entidades en analyzed_content
+    uow.analyzed.create_or_update(
+        version_id=version.id,
+        text=analysis["text"],
+        entities=entities
+    )
+
+    # 9.5. Marcar el archivo como persistido en el diario, dentro de la misma transacción
+    uow.journal.mark(file_path, prepared["version_hash"], STAGE_PERSISTED)
+
+    # 10. Generar eventos en el calendario a partir de entidades de tipo fecha
+    events = []
+    for fecha in entities.get("fechas", []):
+        # Si la fecha no tiene un evento asociado, se asigna un valor por defecto.
+        evento = fecha.get("evento", f"Evento de {title}")
+
+        # Se extraen fecha y hora, asegurando que la fecha sea válida
+        fecha_valor = fecha.get("fecha")
+        hora_valor = fecha.get("hora") if "hora" in fecha else None
+
+        if fecha_valor:
+            events.append({"event": evento, "date": fecha_valor, "time": hora_valor})
+
+    uow.calendar.create_events(document_id=document_id, events=events)
+
+    print(f"✅ Documento procesado correctamente: {file_path}")
+
+def record_in_manifest(prepared: dict, repos: SyncRepositories):
+    """Guarda la firma del archivo para que la próxima sincronización lo omita si no cambia."""
+    repos.manifest.record(
+        prepared["file_path"],
+        prepared["context"].stat,
+        prepared["unique_hash"],
+        prepared["version_hash"]
+    )
+
+def compact_previous_version(prepared: dict, repos: SyncRepositories) -> bool:
+    """
+    Con VERSION_STORE_DELTA, guarda la versión anterior del documento como delta respecto
+    de la que se acaba de persistir. No se compacta si el mismo contenido es la última
+    versión de otro documento, ni si ya hay VERSION_STORE_DELTA_MAX_CHAIN versiones
+    anteriores seguidas como delta (esa se conserva completa y corta la cadena).
+    """
+    previous_hash = prepared.get("previous_blob_hash")
+    current_hash = prepared["context"].content_hash
+    if not previous_hash or previous_hash == current_hash:
+        return False
+
+    document_id = prepared["document_id"]
+    for other_id in repos.versions.get_document_ids_by_blob(previous_hash):
+        if other_id == document_id:
+            continue
+        latest = repos.versions.get_latest_version_by_document_id(other_id)
+        if latest is not None and latest.blob_hash == previous_hash:
+            return False
+
+    # Versiones más antiguas que la anterior ya guardadas como delta, de la más reciente hacia atrás
+    chain = 0
+    for version in repos.versions.get_versions_by_document_id(document_id):
+        if version.blob_hash in (current_hash, previous_hash):
+            continue
+        if not version.blob_hash or not is_delta(version.blob_hash):
+            break
+        chain += 1
+    if chain >= get_version_store_delta_max_chain():
+        return False
+
+    return compact_blob(previous_hash, current_hash)
+
+def resumable_stage(version_hash: str):
+    """
+    Última etapa intermedia guardada en la caché de etapas para 'version_hash'
+    (STAGE_ANALYZED, STAGE_EXTRACTED o None si hay que empezar desde la extracción).
+    """
+    for stage in (STAGE_ANALYZED, STAGE_EXTRACTED):
+        if get_cached_stage_result(version_hash, stage) is not None:
+            return stage
+    return None
 
-            previous_version = True
+def prefetch_content_hashes(files, manifest: dict, journal: dict) -> dict:
+    """
+    Calcula a la vez (ver hash_files) el hash del contenido de los archivos de 'files'
+    ([(ruta, stat)]) que habrá que preparar: los que no coinciden con el manifiesto ni se
+    omiten por haber fallado antes. Retorna {ruta: hash}.
+    """
+    changed = []
+    for file_path, stat_result in files:
+        if manifest_matches(manifest.get(file_path), stat_result):
+            continue
+        signature, stage = journal.get(file_path, (None, None))
+        if stage == STAGE_FAILED and signature == failure_signature(stat_result):
+            continue
+        changed.append(file_path)
+    return hash_files(changed) if changed else {}
+
+def failure_signature(stat_result) -> str:
+    """
+    Firma con la que el diario recuerda un archivo que superó los límites de extracción:
+    mientras el archivo no cambie (tamaño, mtime, inodo) no se vuelve a intentar.
+    """
+    return f"stat:{stat_result.st_size}:{stat_result.st_mtime_ns}:{stat_result.st_ino}"
 
-            # 1. Extraer metadatos del documento
-            metadata = extract_metadata(file_path)
+def is_under_path(path: str, main_path: str) -> bool:
+    """Indica si 'path' está dentro del directorio 'main_path'."""
+    root = os.path.join(os.path.abspath(main_path), "")
+    return os.path.abspath(path).startswith(root)
 
-            print("metadata extraido: ", metadata)
+class SyncCancelled(Exception):
+    """Se lanza dentro de SyncRun cuando se solicita cancelar la sincronización."""
 
-            # 2. Verificar y actualizar el autor en la BD
-            author_name = metadata.get("author", "").strip()
-            if author_name:
-                author = author_repo.get_or_create_author(author_name)
-            else:
-                author = None  # Si no hay autor, se registrará sin este campo en la BD
-            
-            # 3. Generar unique_hash (persistente) y version_hash (basado en contenido)
-            doc_unique_hash = calculate_unique_hash(file_path, main_path)
-            version_hash = calculate_version_hash(file_path)
-
-            # 4. Verificar si el documento ya existe en la BD
-            document = doc_repo.get_document_by_unique_hash(doc_unique_hash)
-            if not document:
-                # Si no existe, se registra como nuevo documento
-                document = doc_repo.create_document(
-                    title=metadata.get("title", file),
-                    description=metadata.get("description", ""),
-                    doc_type="desconocido",
-                    unique_hash=doc_unique_hash,
-                    main_path=file_path
-                )
-
-                previous_version = False
+def create_sync_executor(workers: int, background: bool = False):
+    """
+    Crea el pool de procesos de la sincronización. 'spawn' evita heredar conexiones
+    abiertas de SQLite y diskcache en los hijos; en segundo plano los procesos se
+    ejecutan con prioridad reducida para no competir con la interfaz. Lo que impriman
+    los procesos va a stderr (ver init_worker_process).
+    """
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=get_context("spawn"),
+        initializer=init_worker_process,
+        initargs=(background,)
+    )
+
+class SyncRun:
+    """
+    Una ejecución de sincronización sobre un conjunto de rutas.
 
-            # 4.5. Verificar si ha cambiado la versión
-            if previous_version:
-                latest_version = ver_repo.get_latest_version_by_document_id(document.id)
-                if latest_version and latest_version.file_hash == version_hash:
-                    print(f"📌 El documento '{file}' no ha cambiado, se omite nueva versión.")
-                    continue  # Si no hay cambios, pasamos al siguiente documento
+    Con 'workers' > 1 (por defecto SYNC_WORKERS) las etapas pesadas
+    (scan_file, detect_spelling_errors, extract_entities) se reparten en un pool de
+    procesos, mientras que metadatos, hashes y escrituras en la BD se realizan en el
+    proceso principal para que SQLite tenga un único escritor.
 
-            # 5. Extraer el contenido completo con OCR si es necesario
-            extracted_text = scan_file(file_path)
+    Los archivos cuya firma (tamaño, mtime, inodo) coincide con el manifiesto se omiten
+    tras un único stat(), sin leer su contenido ni sus metadatos.
 
-            full_text = format_extracted_text(extracted_text)
+    Antes de analizar, se estima el costo de cada archivo (ver estimate_cost_isolated) y se
+    procesan primero los más baratos. Con 'defer_heavy' los que requieren OCR no se
+    procesan: quedan en 'deferred' para la cola de segundo plano.
 
-            print("📝 fulltext ", full_text)
+    Las filas de cada versión se escriben con inserciones masivas y se confirman en
+    lotes de SYNC_BATCH_SIZE documentos, con un solo commit por lote.
 
-            # 6. Generar tag de versión y copiar el archivo a la estructura interna
-            version_tag = f"v{int(time.time())}"
+    El avance se notifica a través de 'on_progress' (ver SyncProgress).
 
-            # 6.8. Se crea una nueva versión porque el documento cambió
-            copied_file_path = copy_file_to_storage(file_path, document.id, version_tag)
-            version = ver_repo.add_version(
-                document_id=document.id,
-                version_tag=version_tag,
-                file_path=copied_file_path,
-                file_hash=version_hash,
-                author_id=author.id if author else None,
-                comment="",
-                size_mb=metadata.get("size_mb", 0.0)
-            )
+    Si se pasa 'cancel_event' (threading.Event), se consulta entre archivos: al activarse
+    se escribe el lote en curso y la ejecución termina; lo pendiente se retoma después.
 
-            # 7. Detectar errores ortográficos en el fulltext
-            spelling_errors = detect_spelling_errors(full_text)
-            for error in spelling_errors:
-                spelling_repo.create_error(
-                    error_word=error.get("word"),
-                    version_id=version.id
-                )
+    El resultado de cada etapa intermedia (extracted, analyzed) se guarda en la caché de
+    etapas por version_hash, fuera de la BD; si la sincronización se interrumpe, la
+    siguiente retoma cada archivo desde su última etapa terminada. Los archivos
+    persistidos se marcan en el diario 'sync_journal' dentro de la transacción del lote.
 
-            # 8. Extraer entidades del fulltext (usa spaCy + regex)
-            entities = extract_entities(full_text)
+    La extracción de texto y de metadatos se ejecuta en procesos aislados con límites
+    de tiempo y memoria (ver extraction_sandbox). Un archivo que los supera se registra
+    en el diario como 'failed' y se omite en las siguientes sincronizaciones hasta que
+    cambie.
+    """
 
-            print("entities finales ", entities)
+    def __init__(self, main_path: str, workers: int = None, on_progress=None,
+                 background: bool = False, progress: SyncProgress = None, executor=None,
+                 cancel_event=None):
+        self.main_path = main_path
+        self.cancel_event = cancel_event
+        self.background = background
+        self.workers = workers or (get_sync_background_workers() if background else get_sync_workers())
+        self.batch_size = get_sync_batch_size()
+        self.repos = SyncRepositories()
+        self.manifest = self.repos.manifest.get_all()
+        self.journal = self.repos.journal.get_states()
+        # Un progreso o un pool compartidos (p. ej. por la cola de segundo plano) no se cierran aquí
+        self.owns_progress = progress is None
+        self.progress = progress or SyncProgress(on_progress, background=background)
+        self.owns_executor = executor is None
+        self.executor = executor
+        self.sandbox = None
+        self.pending = {}
+        self.batch = []
+        self.deferred = []
+        self.pool_broken = False
+        self.cancelled = False
+        self.stats = {"processed": 0, "unchanged": 0, "failed": 0}
+
+    def run(self, file_paths, full_walk: bool = False, defer_heavy: bool = False,
+            refresh_cache: bool = True):
+        """
+        Procesa 'file_paths'. Con 'full_walk' las rutas cubren todo 'main_path', por lo que
+        las entradas del manifiesto que no aparezcan corresponden a archivos eliminados.
+        Con 'refresh_cache' en False no se reconstruye la caché al terminar.
+        """
+        try:
+            files, missing_paths = self._discover(file_paths)
+            planned = self._plan(files, defer_heavy)
+            if planned:
+                self._start_executor()
+
+            self.progress.set_stage("processing")
+            for prepared in planned:
+                self._check_cancelled()
+                try:
+                    self._resume(prepared)
+                except Exception as e:
+                    print(f"❌ Error procesando {prepared['file_path']}: {e}")
+                    self._fail(prepared)
+
+                # Limitar las tareas en vuelo para no acumular resultados en memoria
+                if len(self.pending) >= self.workers * MAX_PENDING_PER_WORKER:
+                    self._drain()
+
+            while self.pending:
+                self._check_cancelled()
+                self._drain()
+            self._commit_batch()
+
+            if full_walk:
+                # Olvidar los archivos que ya no existen bajo 'main_path'
+                seen_paths = {file_path for file_path, _ in files}
+                missing_paths.extend(
+                    path for path in self.manifest
+                    if path not in seen_paths and is_under_path(path, self.main_path)
+                )
+            self.repos.manifest.delete_paths(missing_paths)
+            self.repos.journal.delete_paths(missing_paths)
+            # Lo ya persistido está en el manifiesto; el diario solo conserva los fallidos.
+            # Las etapas intermedias son de diarios anteriores, que guardaban el texto en la BD.
+            self.repos.journal.delete_stages((STAGE_PERSISTED, STAGE_EXTRACTED, STAGE_ANALYZED))
+        except SyncCancelled:
+            self.cancelled = True
+            # Lo ya analizado se guarda; lo que estaba en el pool se retomará desde la caché de etapas
+            self._commit_batch()
+        finally:
+            # Un lote sin escribir no se pierde: sus resultados quedan en el diario
+            self.repos.manifest.flush()
+            self.repos.timings.flush()
+            # Las extracciones en cola ya no se necesitan; se retomarán desde el diario
+            for future in self.pending:
+                future.cancel()
+            if self.owns_executor and self.executor is not None:
+                self.executor.shutdown(cancel_futures=True)
+                self.executor = None
+            self.repos.close()
+
+        print(
+            f"📊 Procesados: {self.stats['processed']}, sin cambios: {self.stats['unchanged']}, "
+            f"con error: {self.stats['failed']}, en segundo plano: {len(self.deferred)}"
+        )
+
+        if self.cancelled:
+            print("🛑 Sincronización cancelada")
+            self._done()
+            return {
+                "success": False,
+                "cancelled": True,
+                "message": "Sincronización cancelada. Los documentos pendientes se procesarán en la próxima sincronización."
+            }
+
+        if not self.stats["processed"] or not refresh_cache:
+            # Nada cambió: la caché sigue siendo válida y no es necesario reconstruirla
+            self._done()
+            if self.deferred:
+                message = f"Sincronización completada. {len(self.deferred)} documento(s) con OCR se procesarán en segundo plano."
+            elif self.stats["processed"]:
+                message = "Sincronización completada."
+            else:
+                message = "Sincronización completada. No se detectaron cambios."
+            return {"success": True, "message": message, "deferred": len(self.deferred)}
+
+        self.progress.set_stage("caching")
+        result = migrate_to_cache()
+        self._done()
+        if self.deferred:
+            result["message"] = f"{result['message']} {len(self.deferred)} documento(s) con OCR se procesarán en segundo plano."
+        result["deferred"] = len(self.deferred)
+        return result
+
+    def _check_cancelled(self):
+        """Lanza SyncCancelled si se solicitó la cancelación."""
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise SyncCancelled()
+
+    def _done(self):
+        """Notifica el estado final si el progreso pertenece a esta ejecución."""
+        if self.owns_progress:
+            self.progress.finish()
+
+    def _start_executor(self):
+        """Crea el pool si hace falta. En segundo plano siempre se usa uno, para que la prioridad
+        reducida se aplique al trabajo pesado y no al proceso principal."""
+        if get_extraction_sandbox_enabled():
+            # Procesos persistentes: solo se crean la primera vez que se extrae un archivo
+            self.sandbox = get_extraction_sandbox(self.background)
+        if self.executor is not None or (self.workers <= 1 and not self.background):
+            return
+        self.executor = create_sync_executor(self.workers, self.background)
+        print(f"⚙️ Sincronización con {self.workers} procesos")
+
+    def _discover(self, file_paths):
+        """
+        Hace stat() de cada ruta una sola vez, antes de procesar, para conocer el total
+        de archivos y bytes (necesario para estimar el tiempo restante).
+        Retorna ([(ruta, stat)], [rutas que ya no existen]).
+        """
+        files = []
+        missing_paths = []
+        self.progress.set_stage("discovering")
+        for file_path in file_paths:
+            self._check_cancelled()
+            try:
+                stat_result = os.stat(file_path)
+            except FileNotFoundError:
+                missing_paths.append(file_path)
+                continue
+            except OSError as e:
+                print(f"❌ No se pudo leer {file_path}: {e}")
+                self.stats["failed"] += 1
+                continue
+            files.append((file_path, stat_result))
+            if self.owns_progress:
+                self.progress.discovered(stat_result.st_size)
+        return files, missing_paths
+
+    def _plan(self, files, defer_heavy: bool):
+        """
+        Prepara los archivos modificados y los ordena por costo estimado, de menor a mayor.
+        Con 'defer_heavy' los que requieren OCR se apartan en 'deferred'.
+        Retorna la lista de documentos preparados en el orden en que se procesarán.
+        """
+        self.progress.set_stage("planning")
+        planned = []
+        chunk_size = get_hash_workers() * HASH_PREFETCH_PER_WORKER
+        content_hashes = {}
+        for index, (file_path, stat_result) in enumerate(files):
+            self._check_cancelled()
+            if index % chunk_size == 0:
+                # Los archivos modificados del siguiente tramo se leen y hashean en paralelo
+                content_hashes = prefetch_content_hashes(
+                    files[index:index + chunk_size], self.manifest, self.journal
+                )
+            prepared = self._prepare(file_path, stat_result, content_hashes.get(file_path))
+            if prepared is None:
+                continue
 
-            # Para fechas: Si alguna entrada de fecha no tiene evento, se asigna un valor por defecto.
-            if "fechas" in entities:
-                for idx, fecha in enumerate(entities["fechas"]):
-                    if not fecha.get("evento"):
-                        entities["fechas"][idx]["evento"] = f"Evento de {document.title}"
+            if resumable_stage(prepared["version_hash"]):
+                # El texto ya está extraído: retomarlo es barato y no requiere OCR
+                cost = {"cost_seconds": 0.0, "needs_ocr": False}
+            else:
+                cost = estimate_cost_isolated(file_path, stat_result.st_size)
 
-            # 9. Guardar el fulltext y las entidades en analyzed_content
-            analyzed_repo.create_or_update(
-                version_id=version.id,
-                text=full_text,
-                entities=entities
+            if defer_heavy and cost["needs_ocr"]:
+                print(f"⏳ {file_path} requiere OCR, se procesará en segundo plano")
+                self.deferred.append(file_path)
+                self.progress.defer(stat_result.st_size)
+                continue
+            prepared["needs_ocr"] = cost["needs_ocr"]
+            planned.append((cost["cost_seconds"], len(planned), prepared))
+
+        planned.sort(key=lambda item: item[:2])
+        return [prepared for _, _, prepared in planned]
+
+    def _prepare(self, file_path: str, stat_result, content_hash: str = None):
+        """
+        Etapa ligera de un archivo. Retorna el documento preparado, o None si no cambió
+        o no se pudo preparar. 'content_hash' evita releer el archivo si ya se calculó.
+        """
+        if manifest_matches(self.manifest.get(file_path), stat_result):
+            self.stats["unchanged"] += 1
+            self.progress.advance(stat_result.st_size)
+            return None
+
+        if self._previously_failed(file_path, stat_result):
+            return None
+
+        print(f"📂 Procesando: {file_path}")
+
+        try:
+            prepared = prepare_document(
+                FileContext(file_path, stat_result, content_hash), self.main_path, self.repos
             )
+            if not prepared["is_new_version"]:
+                # Si no hay cambios, pasamos al siguiente documento
+                record_in_manifest(prepared, self.repos)
+                self.stats["unchanged"] += 1
+                self.progress.advance(stat_result.st_size)
+                return None
+            return prepared
+        except SandboxError as e:
+            self._record_failure(file_path, stat_result, e)
+            self._fail(size_bytes=stat_result.st_size)
+            return None
+        except Exception as e:
+            print(f"❌ Error procesando {file_path}: {e}")
+            self._fail(size_bytes=stat_result.st_size)
+            return None
+
+    def _previously_failed(self, file_path: str, stat_result) -> bool:
+        """Indica (y cuenta como fallido) un archivo sin cambios que ya superó los límites de extracción."""
+        signature, stage = self.journal.get(file_path, (None, None))
+        if stage != STAGE_FAILED or signature != failure_signature(stat_result):
+            return False
+        print(f"⏭️ Se omite {file_path}: superó los límites de extracción en una sincronización anterior")
+        self._fail(size_bytes=stat_result.st_size)
+        return True
+
+    def _record_failure(self, file_path: str, stat_result, error: Exception):
+        """Registra en el diario un archivo que superó los límites de extracción."""
+        print(f"⛔ {file_path} se omite: {error}")
+        self.repos.journal.mark(file_path, failure_signature(stat_result), STAGE_FAILED, {"error": str(error)})
+
+    def _resume(self, prepared: dict):
+        """Continúa el archivo desde la última etapa guardada para su versión."""
+        file_path = prepared["file_path"]
+        version_hash = prepared["version_hash"]
+        analysis = get_cached_stage_result(version_hash, STAGE_ANALYZED)
+        if analysis is not None:
+            print(f"⏩ Reanudando {file_path} desde la etapa '{STAGE_ANALYZED}'")
+            self._finish(prepared, analysis)
+            return
+        text = get_cached_stage_result(version_hash, STAGE_EXTRACTED)
+        if text is not None:
+            print(f"⏩ Reanudando {file_path} desde la etapa '{STAGE_EXTRACTED}'")
+            self._run_stage(prepared, STAGE_ANALYZED, text)
+            return
+        self._run_stage(prepared, STAGE_EXTRACTED, file_path)
+
+    def _run_stage(self, prepared: dict, stage: str, argument):
+        """Ejecuta la etapa pesada 'stage' en línea o la envía al pool, midiendo su duración."""
+        task = extract_document_text if stage == STAGE_EXTRACTED else analyze_text
+        if stage == STAGE_EXTRACTED and self.sandbox is not None:
+            self.pending[self.sandbox.submit(run_timed, task, argument)] = (prepared, stage)
+        elif self.executor is None:
+            self._stage_done(prepared, stage, run_timed(task, argument))
+        else:
+            self.pending[self.executor.submit(run_timed, task, argument)] = (prepared, stage)
+
+    def _stage_done(self, prepared: dict, stage: str, outcome):
+        """Registra una etapa terminada (y su duración) y lanza la siguiente."""
+        result, seconds = outcome
+        self._record_timing(prepared, stage, seconds)
+        cache_stage_result(prepared["version_hash"], stage, result)
+        if stage == STAGE_EXTRACTED:
+            self._run_stage(prepared, STAGE_ANALYZED, result)
+        else:
+            self._finish(prepared, result)
+
+    def _record_timing(self, prepared: dict, stage: str, seconds: float):
+        """Acumula la duración de una etapa en el historial usado por planSync."""
+        if stage == STAGE_EXTRACTED:
+            kind = file_kind(prepared["file_path"], prepared.get("needs_ocr", False))
+        else:
+            kind = ANY_KIND
+        self.repos.timings.record(stage, kind, seconds, prepared["context"].stat.st_size)
+
+    def _drain(self):
+        """Procesa las tareas del pool que ya terminaron (espera al menos una)."""
+        done, _ = wait(self.pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            prepared, stage = self.pending.pop(future)
+            try:
+                self._stage_done(prepared, stage, future.result())
+            except SandboxError as e:
+                self._record_failure(prepared["file_path"], prepared["context"].stat, e)
+                self._fail(prepared)
+            except Exception as e:
+                if isinstance(e, BrokenProcessPool):
+                    self.pool_broken = True
+                print(f"❌ Error procesando {prepared['file_path']}: {e}")
+                self._fail(prepared)
+
+    def _fail(self, prepared: dict = None, size_bytes: int = None):
+        """Cuenta un archivo como fallido; su avance en el diario se conserva para reintentar."""
+        self.stats["failed"] += 1
+        if size_bytes is None:
+            size_bytes = prepared["context"].stat.st_size
+        self.progress.advance(size_bytes)
+
+    def _finish(self, prepared: dict, analysis: dict):
+        """
+        Agrega el resultado de un archivo al lote actual. El lote se escribe en una
+        transacción corta al completarse, para no mantener bloqueada la BD mientras
+        se preparan otros archivos.
+        """
+        self.batch.append((prepared, analysis))
+        if len(self.batch) >= self.batch_size:
+            self._commit_batch()
+
+    def _commit_batch(self):
+        """
+        Escribe el lote con un solo commit. Si falla, se reintenta documento a documento
+        para que un archivo problemático no descarte el resto del lote.
+        """
+        if not self.batch:
+            return
+        batch, self.batch = self.batch, []
+        try:
+            self._persist(batch)
+            return
+        except Exception as e:
+            if len(batch) == 1:
+                print(f"❌ Error guardando {batch[0][0]['file_path']}: {e}")
+                self._fail(batch[0][0])
+                return
+            print(f"↩️ Error guardando un lote de {len(batch)} documento(s), se reintenta uno a uno: {e}")
+
+        for item in batch:
+            try:
+                self._persist([item])
+            except Exception as e:
+                print(f"❌ Error guardando {item[0]['file_path']}: {e}")
+                self._fail(item[0])
+
+    def _persist(self, batch):
+        """Persiste los documentos de 'batch' en una UnitOfWork y los registra en el manifiesto."""
+        started_at = time.perf_counter()
+        with UnitOfWork() as uow:
+            for prepared, analysis in batch:
+                persist_document(prepared, analysis, uow)
+        seconds_per_document = (time.perf_counter() - started_at) / len(batch)
+
+        for prepared, _ in batch:
+            clear_stage_results(prepared["version_hash"], (STAGE_EXTRACTED, STAGE_ANALYZED))
+            record_in_manifest(prepared, self.repos)
+            self._record_timing(prepared, STAGE_PERSISTED, seconds_per_document)
+            self.stats["processed"] += 1
+            self.progress.advance(prepared["context"].stat.st_size)
+        # Confirmar también el manifiesto: un reinicio omitirá estos archivos con un solo stat()
+        self.repos.manifest.flush()
+        self.repos.timings.flush()
+
+        if get_version_store_delta():
+            for prepared, _ in batch:
+                try:
+                    compact_previous_version(prepared, self.repos)
+                except Exception as e:
+                    # La versión anterior sigue completa; no afecta a la sincronización
+                    print(f"⚠️ No se pudo guardar como delta la versión anterior de {prepared['file_path']}: {e}")
+
+class DeferredSyncQueue:
+    """
+    Cola de documentos pesados (OCR) apartados por una sincronización, que se procesan
+    en un hilo de segundo plano después de haber respondido con syncSuccess.
+
+    Los documentos se procesan en tramos pequeños y el bloqueo de sincronización se
+    toma por tramo, de modo que una sincronización manual o del modo vigilancia no
+    espera a que termine todo el OCR pendiente. El pool de procesos (con prioridad
+    reducida) se mantiene durante todo el trabajo para no recargar los modelos.
+    Las rutas que ya están en la cola no se vuelven a encolar.
+    """
 
-            # 10. Generar eventos en el calendario a partir de entidades de tipo fecha
-            for fecha in entities.get("fechas", []):
-                # Si la fecha no tiene un evento asociado, se asigna un valor por defecto.
-                evento = fecha.get("evento", f"Evento de {document.title}")
-
-                # Se extraen fecha y hora, asegurando que la fecha sea válida
-                fecha_valor = fecha.get("fecha")
-                hora_valor = fecha.get("hora") if "hora" in fecha else None
-
-                if fecha_valor:
-                    calendar_repo.create_event(
-                        document_id=document.id,
-                        event=evento,
-                        date=fecha_valor,
-                        time=hora_valor
-                    )
-
-            print(f"✅ Documento procesado correctamente: {file_path}")
-
-    result = migrate_to_cache()
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._jobs = []
+        self._queued_paths = set()
+        self._worker = None
+
+    def pending_count(self) -> int:
+        """Número de documentos en cola o en proceso."""
+        with self._condition:
+            return len(self._queued_paths)
+
+    def enqueue(self, main_path: str, paths, on_progress=None, on_complete=None):
+        """
+        Encola 'paths' para procesarlos en segundo plano. 'on_progress' recibe el avance
+        (con background=True) y 'on_complete' un resumen al terminar.
+        Retorna el número de rutas encoladas.
+        """
+        with self._condition:
+            paths = [path for path in dict.fromkeys(paths) if path not in self._queued_paths]
+            if not paths:
+                return 0
+            self._queued_paths.update(paths)
+            self._jobs.append((main_path, paths, on_progress, on_complete))
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="deferred-sync", daemon=True)
+                self._worker.start()
+            self._condition.notify_all()
+        print(f"⏳ {len(paths)} documento(s) en cola de segundo plano")
+        return len(paths)
+
+    def _run(self):
+        """Hilo que atiende los trabajos en orden de llegada."""
+        while True:
+            with self._condition:
+                while not self._jobs:
+                    self._condition.wait()
+                job = self._jobs.pop(0)
+            main_path, paths, on_progress, on_complete = job
+            try:
+                result = self._process(main_path, paths, on_progress)
+            except Exception as e:
+                print(f"❌ Error en la sincronización en segundo plano: {e}")
+                result = {"success": False, "message": f"Error en la sincronización en segundo plano: {str(e)}"}
+            finally:
+                with self._condition:
+                    self._queued_paths.difference_update(paths)
+
+            if on_complete:
+                try:
+                    on_complete(result)
+                except Exception as e:
+                    print(f"⚠️ Error notificando fin de segundo plano: {e}")
+
+    def _process(self, main_path: str, paths, on_progress):
+        """Procesa un trabajo por tramos y reconstruye la caché una sola vez al final."""
+        workers = get_sync_background_workers()
+        chunk_size = workers * MAX_PENDING_PER_WORKER
+        progress = SyncProgress(on_progress, background=True)
+        for path in paths:
+            try:
+                progress.discovered(os.stat(path).st_size)
+            except OSError:
+                progress.discovered(0)
+
+        stats = {"processed": 0, "unchanged": 0, "failed": 0}
+        executor = create_sync_executor(workers, background=True)
+        try:
+            for i in range(0, len(paths), chunk_size):
+                with _sync_lock:
+                    run = SyncRun(main_path, workers, background=True, progress=progress, executor=executor)
+                    run.run(paths[i:i + chunk_size], refresh_cache=False)
+                for key in stats:
+                    stats[key] += run.stats[key]
+                if run.pool_broken:
+                    # Un proceso terminó abruptamente (p. ej. sin memoria): se reemplaza el pool
+                    executor.shutdown(cancel_futures=True)
+                    executor = create_sync_executor(workers, background=True)
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+        if stats["processed"]:
+            progress.set_stage("caching")
+            with _sync_lock:
+                result = migrate_to_cache()
+        else:
+            result = {"success": True, "message": "Sincronización en segundo plano completada."}
+        progress.finish()
+        result.update(stats)
+        return result
+
+# Cola compartida por la sincronización manual y el modo vigilancia
+deferred_queue = DeferredSyncQueue()
+
+def _defer(run: SyncRun, main_path: str, on_deferred_progress, on_deferred_done):
+    if run.deferred and not run.cancelled:
+        deferred_queue.enqueue(
+            main_path, run.deferred, on_progress=on_deferred_progress, on_complete=on_deferred_done
+        )
+
+def sync_documents(main_path: str, workers: int = None, on_progress=None,
+                   on_deferred_progress=None, on_deferred_done=None, cancel_event=None):
+    """
+    Sincroniza documentos en el directorio 'main_path' de forma recursiva.
+    'on_progress' recibe periódicamente el estado de avance (ver SyncProgress).
 
+    Si SYNC_DEFER_OCR está activo, los documentos que requieren OCR se procesan después,
+    en segundo plano; 'on_deferred_progress' y 'on_deferred_done' reciben su avance
+    y su resultado. 'cancel_event' permite cancelarla (ver SyncRun).
+    """
+    with _sync_lock:
+        run = SyncRun(main_path, workers, on_progress=on_progress, cancel_event=cancel_event)
+        result = run.run(iter_document_paths(main_path), full_walk=True, defer_heavy=get_sync_defer_ocr())
+    _defer(run, main_path, on_deferred_progress, on_deferred_done)
     return result
 
-    #return {"success": True, "message": "Sincronización completada."}
+def sync_paths(main_path: str, paths, workers: int = None, on_progress=None,
+               on_deferred_progress=None, on_deferred_done=None, cancel_event=None):
+    """
+    Sincroniza solo las rutas indicadas (p. ej. las detectadas por el modo vigilancia),
+    sin recorrer el resto de 'main_path'. Los documentos con OCR se difieren igual que
+    en sync_documents.
+    """
+    file_paths = [
+        path for path in paths
+        if Path(path).suffix.lower() in ALLOWED_EXTENSIONS and is_under_path(path, main_path)
+    ]
+    with _sync_lock:
+        run = SyncRun(main_path, workers, on_progress=on_progress, cancel_event=cancel_event)
+        result = run.run(file_paths, defer_heavy=get_sync_defer_ocr())
+    _defer(run, main_path, on_deferred_progress, on_deferred_done)
+    return result
 
 def migrate_to_cache():
     doc_repo = DocumentRepository()
@@ -2,7 +2,7 @@
 from core.data.repositories.user_repository import UserRepository
 from core.data.services.password_hasher import PasswordHasher
 from core.usecases.login_use_case import LoginUseCase
-from core.usecases.sync_documents_use_case import sync_documents
+from core.usecases.sync_documents_use_case import sync_documents, sync_paths, ALLOWED_EXTENSIONS
 
 user_repository = UserRepository()
 password_hasher = PasswordHasher()
@@ -21,8 +21,31 @@ def get_main_path():
     return settings_repository.get_main_path()
 
 sync_documents_use_case = sync_documents
+sync_paths_use_case = sync_paths
+sync_extensions = ALLOWED_EXTENSIONS
+
+
+from core.usecases.plan_sync_use_case import plan_sync
+
+plan_sync_use_case = plan_sync
+
+
+def ocr_stats_use_case(reset=False):
+    # Import diferido: ocr_service carga PIL y pdf2image, que solo se necesitan al hacer OCR
+    from core.data.services.ocr_service import ocr_dpi_report
+    return ocr_dpi_report(reset=reset)
 
 
 from core.usecases.get_documents_use_case import GetDocumentsUseCase
 
-get_documents_use_case = GetDocumentsUseCase()
\ No newline at end of file
+get_documents_use_case = GetDocumentsUseCase()
+
+from core.data.repositories.version_repository import VersionRepository
+from core.usecases.restore_version_use_case import RestoreVersionUseCase
+
+restore_version_use_case = RestoreVersionUseCase(VersionRepository())
+
+from core.usecases.storage_maintenance_use_case import verify_storage, gc_storage
+
+verify_storage_use_case = verify_storage
+gc_storage_use_case = gc_storage
@@ -1,8 +1,15 @@
+from multiprocessing import freeze_support
 from bridge import python_adapter
+from config.database import initialize_database
 
 def main():
+    # Crea las tablas nuevas (p. ej. sync_manifest) en bases de datos existentes
+    initialize_database()
+
     # Ejecuta el adapter para recibir mensajes desde Electron
     python_adapter.run_adapter()
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    # Necesario para los procesos del pool de sincronización en el ejecutable de PyInstaller
+    freeze_support()
+    main()
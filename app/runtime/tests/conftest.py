@@ -0,0 +1,62 @@
+# /app/runtime/tests/conftest.py
+import os
+import sys
+import shutil
+import tempfile
+from pathlib import Path
+import pytest
+
+# Los datos de la app (BD, cachés, almacén de versiones) van a un directorio temporal.
+# config.database y cache_service fijan sus rutas al importarse, por lo que el entorno se
+# define antes de importar cualquier módulo de la app.
+_home = tempfile.mkdtemp(prefix="paperless_tests_")
+os.environ["APP_ENV"] = "PROD"
+os.environ["HOME"] = _home
+os.environ["USERPROFILE"] = _home
+os.environ["APPDATA"] = _home
+os.environ["EXTRACTION_SANDBOX"] = "false"
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Tablas que se vacían antes de cada prueba
+TABLES = (
+    "legal_calendar",
+    "spell_errors",
+    "analyzed_content",
+    "versions",
+    "documents",
+    "sync_manifest",
+    "sync_journal",
+    "sync_stage_timings"
+)
+
+@pytest.fixture(scope="session")
+def database():
+    from config.database import initialize_database
+    initialize_database()
+
+@pytest.fixture
+def storage(database):
+    """BD sin documentos ni versiones y almacén vacío. Retorna el directorio de documentos."""
+    from sqlalchemy import text
+    from config.database import get_db_session
+    from config.file_store import get_documents_directory, get_restored_directory
+    from core.data.services.cache_service import clear_all_caches
+
+    session = get_db_session()
+    try:
+        for table in TABLES:
+            session.execute(text(f"DELETE FROM {table}"))
+        session.commit()
+    finally:
+        session.close()
+    clear_all_caches()
+    for directory in (get_documents_directory(), get_restored_directory()):
+        shutil.rmtree(directory)
+        directory.mkdir()
+    return get_documents_directory()
+
+@pytest.fixture
+def author(database):
+    """Id de un autor para las versiones de prueba."""
+    from core.data.repositories.author_repository import AuthorRepository
+    return AuthorRepository().get_or_create_author("Autor de prueba").id
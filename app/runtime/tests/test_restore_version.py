@@ -0,0 +1,59 @@
+# /app/runtime/tests/test_restore_version.py
+import os
+import random
+from config.database import get_db_session
+from core.data.models.orm_models import Version
+from core.data.repositories.document_repository import DocumentRepository
+from core.data.repositories.version_repository import VersionRepository
+from core.data.services.blob_store import store_blob, compact_blob, find_full_blob, is_delta
+from core.data.services.hash_service import calculate_content_hash
+from core.usecases.restore_version_use_case import RestoreVersionUseCase
+
+def write_version(path, lines):
+    path.write_text("\n".join(lines))
+    return path
+
+def add_stored_version(document_id: int, author_id: int, path, tag: str):
+    content_hash = calculate_content_hash(str(path))
+    stored = store_blob(str(path), content_hash, os.stat(path))
+    repository = VersionRepository()
+    try:
+        version = repository.add_version(
+            document_id=document_id, version_tag=tag, file_path=str(stored), file_hash=content_hash,
+            author_id=author_id, comment="", size_mb=0, blob_hash=content_hash
+        )
+        return version.id, content_hash, stored
+    finally:
+        repository.session.close()
+
+def test_compacted_older_version_is_restored(storage, author, tmp_path):
+    rng = random.Random(1)
+    lines = [f"Cláusula {index}: {rng.randbytes(24).hex()}" for index in range(4000)]
+    old_path = write_version(tmp_path / "v1.txt", lines)
+    old_content = old_path.read_bytes()
+    new_path = write_version(tmp_path / "v2.txt", lines[:2000] + ["Cláusula añadida"] + lines[2000:])
+
+    document = DocumentRepository().create_document("Contrato", "", "txt", "hash-contrato", str(tmp_path))
+    old_id, old_hash, old_stored = add_stored_version(document.id, author, old_path, "v1")
+    _, new_hash, _ = add_stored_version(document.id, author, new_path, "v2")
+
+    assert compact_blob(old_hash, new_hash)
+    assert is_delta(old_hash) and find_full_blob(old_hash) is None
+    session = get_db_session()
+    try:
+        # La ruta guardada en la versión es la del blob completo, que ya no existe
+        assert session.get(Version, old_id).file_path == str(old_stored)
+    finally:
+        session.close()
+    assert not old_stored.exists()
+
+    use_case = RestoreVersionUseCase(VersionRepository())
+    result = use_case.execute(old_id)
+    assert result["success"], result
+    with open(result["path"], "rb") as f:
+        assert f.read() == old_content
+
+    destination = tmp_path / "restaurado" / "contrato.txt"
+    result = use_case.execute(old_id, str(destination))
+    assert result["success"], result
+    assert destination.read_bytes() == old_content
@@ -0,0 +1,61 @@
+# /app/runtime/tests/test_storage_maintenance.py
+import os
+import pytest
+
+pytest.importorskip("spacy")  # storage_maintenance_use_case importa la sincronización completa
+
+from sqlalchemy import text
+from config.database import get_db_session
+from core.usecases.storage_maintenance_use_case import StorageCollector, verify_storage
+
+# Directorio de documentos de otra máquina: así guarda las rutas la BD que trae el proyecto
+OTHER_BASE = "/home/otro/Paperless/storage/data/documents"
+
+def add_legacy_version(document_id: int, author_id: int, file_path: str):
+    session = get_db_session()
+    try:
+        session.execute(
+            text("INSERT OR IGNORE INTO documents (id, title, unique_hash) VALUES (:id, :title, :hash)"),
+            {"id": document_id, "title": f"doc{document_id}", "hash": f"hash{document_id}"}
+        )
+        session.execute(
+            text("INSERT INTO versions (document_id, version_tag, file_path, file_hash, author_id) "
+                 "VALUES (:document_id, 'v1', :file_path, 'x', :author_id)"),
+            {"document_id": document_id, "file_path": file_path, "author_id": author_id}
+        )
+        session.commit()
+    finally:
+        session.close()
+
+def write_old_file(path, content: str):
+    """Archivo de prueba con fecha antigua, fuera del período de gracia de la limpieza."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    os.utime(path, (1, 1))
+    return path
+
+def test_legacy_versions_from_another_base_directory_are_kept(storage, author):
+    kept = write_old_file(storage / "1" / "v1_carta.docx", "carta")
+    orphan = write_old_file(storage / "1" / "v2_borrado.docx", "sin versión")
+    add_legacy_version(1, author, f"{OTHER_BASE}/1/v1_carta.docx")
+
+    report = verify_storage(resume=False)
+    assert report["counts"]["ok"] == 1
+    assert report["counts"]["missing"] == 0
+
+    result = StorageCollector(grace_minutes=0).run()
+    assert result["deleted"]["legacy"] == 1
+    assert kept.exists()
+    assert not orphan.exists()
+
+def test_legacy_deletion_is_skipped_when_a_version_file_is_missing(storage, author):
+    kept = write_old_file(storage / "1" / "v1_carta.docx", "carta")
+    orphan = write_old_file(storage / "2" / "v1_otro.pdf", "sin versión")
+    add_legacy_version(1, author, f"{OTHER_BASE}/1/v1_carta.docx")
+    add_legacy_version(2, author, f"{OTHER_BASE}/2/v1_movido.pdf")
+
+    result = StorageCollector(grace_minutes=0).run()
+    assert result["deleted"]["legacy"] == 0
+    assert kept.exists()
+    assert orphan.exists()
+    assert any("v1_movido.pdf" in error for error in result["errors"])
@@ -0,0 +1,52 @@
+# /app/runtime/tests/test_sync_persist.py
+import random
+import pytest
+
+pytest.importorskip("spacy")  # sync_documents_use_case importa los servicios de ortografía y NER
+
+from sqlalchemy import text
+from config.database import get_db_session
+from core.data.repositories.unit_of_work import UnitOfWork
+from core.data.services.file_context import FileContext
+from core.usecases.sync_documents_use_case import SyncRepositories, prepare_document, persist_document
+
+# Texto extraído de cada documento: con textos grandes la transacción supera la caché de
+# páginas, SQLite las vuelca al archivo y toma el bloqueo exclusivo, que impide leer
+# desde otra conexión hasta el commit
+TEXT_SIZE = 3 * 1024 * 1024
+
+def large_text(seed: int) -> str:
+    return random.Random(seed).randbytes(TEXT_SIZE // 2).hex()
+
+def test_batch_of_new_documents_is_persisted_in_one_transaction(storage, tmp_path):
+    paths = []
+    for index in range(3):
+        path = tmp_path / f"nota{index}.txt"
+        path.write_text(f"nota {index}")
+        paths.append(path)
+
+    repos = SyncRepositories()
+    try:
+        # Una ruta principal por archivo: unique_hash combina la ruta principal con la fecha
+        # de creación, que aquí es la misma para los tres
+        batch = [(prepare_document(FileContext(path), str(path), repos), large_text(index))
+                 for index, path in enumerate(paths)]
+        with UnitOfWork() as uow:
+            for prepared, extracted in batch:
+                analysis = {
+                    "text": extracted,
+                    "entities": {"fechas": [{"fecha": "2024-01-02"}]},
+                    "spelling_errors": []
+                }
+                persist_document(prepared, analysis, uow)
+    finally:
+        repos.close()
+
+    session = get_db_session()
+    try:
+        versions = session.execute(text("SELECT COUNT(*) FROM versions")).scalar()
+        events = session.execute(text("SELECT event FROM legal_calendar ORDER BY id")).scalars().all()
+    finally:
+        session.close()
+    assert versions == 3
+    assert events == [f"Evento de nota{index}" for index in range(3)]
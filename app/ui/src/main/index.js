@@ -131,6 +131,12 @@ function createWindow() {
     }
   });
 
+  // Diagnósticos del backend (print y logging): stdout queda reservado para los mensajes JSON.
+  // Se leen siempre, para que el pipe no se llene y bloquee al backend.
+  backendProcess.stderr.on('data', (data) => {
+    process.stderr.write(data);
+  });
+
   // Limpiar el buffer cuando el proceso termine
   backendProcess.on('close', () => {
     messageBuffer = '';